@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""
+Demonstrates broadcast_setting_change by broadcasting WM_SETTINGCHANGE for
+"Environment" and then a general (lParam=0) notification.
+
+Run on Windows with: python examples/broadcast_demo.py
+"""
+
+import logging
+
+from winregenv.winapi import broadcast_setting_change, MessageTimeoutError
+
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    logger.info("Attempting to broadcast WM_SETTINGCHANGE for 'Environment'...")
+    try:
+        broadcast_setting_change("Environment")
+        logger.info("WM_SETTINGCHANGE for 'Environment' broadcast successfully.")
+    except MessageTimeoutError as e:
+        logger.warning(f"WM_SETTINGCHANGE timeout: {e}")
+    except OSError as e:
+        logger.error(f"Failed to broadcast WM_SETTINGCHANGE: {e}")
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+
+    logger.info("\nAttempting to broadcast general WM_SETTINGCHANGE (lParam=0)...")
+    try:
+        broadcast_setting_change(None)  # Test with lParam as NULL
+        logger.info("General WM_SETTINGCHANGE broadcast successfully.")
+    except MessageTimeoutError as e:
+        logger.warning(f"WM_SETTINGCHANGE timeout: {e}")
+    except OSError as e:
+        logger.error(f"Failed to broadcast general WM_SETTINGCHANGE: {e}")
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
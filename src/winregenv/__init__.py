@@ -1,5 +1,12 @@
+import importlib
 import sys
 
+# The single platform guard for the package. It runs before any submodule is imported,
+# so the submodules can assume Windows instead of repeating the check.
+_IS_WIN32 = sys.platform == "win32"
+if not _IS_WIN32:
+    raise NotImplementedError("This module requires Windows APIs and only runs on Windows.")
+
 # Import the public interface components
 from .registry_interface import RegistryRoot
 from .registry_errors import (
@@ -10,14 +17,16 @@ from .registry_errors import (
     RegistryPermissionError,
     RegistryExpansionError, # Import the new exception
 )
-from .registry_types import RegistryValue # noqa: F401 # Imported for __all__ and type hints
+from .registry_types import RegistryValue, RegistryKeyInfo, RegistryKeyWalk # noqa: F401 # Imported for __all__ and type hints
 from .registry_interface import normalize_root_key # Import the new public function
 from .registry_translation import normalize_registry_type # Import the new public function
-from .winapi import broadcast_setting_change
+from .winapi import broadcast_setting_change, broadcast_setting_changes, broadcast_setting_change_async, broadcast_after
 
 __all__ = [
     "RegistryRoot", # Add the main interface class
     "RegistryValue",
+    "RegistryKeyInfo",
+    "RegistryKeyWalk",
     "normalize_root_key", # Add normalize_root_key to the public API
     "normalize_registry_type", # Add normalize_registry_type to the public API
     # Add exception classes to the public API
@@ -29,8 +38,14 @@ __all__ = [
     "RegistryExpansionError", # Add the new exception to the public API
     "is_elevated", # Add is_elevated to the public API
     "get_integrity_level", # Add get_integrity_level to the public API
+    "integrity_level_name",
+    "get_integrity_levels",
     "expand_environment_strings",
+    "expand_environment_strings_many",
     "broadcast_setting_change",
+    "broadcast_setting_changes",
+    "broadcast_setting_change_async",
+    "broadcast_after",
 
     # Add common REG_* constants to __all__ so users don't need to import winreg directly
     "REG_SZ",
@@ -41,18 +56,31 @@ __all__ = [
     "REG_MULTI_SZ",
 ]
 
-if sys.platform != "win32":
-    # Raise immediately on import if not on Windows. This prevents importing winreg or ctypes modules below.
-    raise NotImplementedError("This module requires Windows APIs and only runs on Windows.")
+# The elevation and expansion helpers set up their own ctypes bindings, so they are
+# imported on first attribute access (PEP 562) rather than on every `import winregenv`.
+_LAZY_IMPORTS = {
+    "is_elevated": ".elevation_check",
+    "get_integrity_level": ".elevation_check",
+    "integrity_level_name": ".elevation_check",
+    "get_integrity_levels": ".elevation_check",
+    "expand_environment_strings": ".expand_variable",
+    "expand_environment_strings_many": ".expand_variable",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value # Cache so later lookups bypass __getattr__
+    return value
 
-# Import get_integrity_level here after the platform check
-from .elevation_check import is_elevated # noqa: F401 # Imported for __all__
-from .elevation_check import get_integrity_level # noqa: F401 # Imported for __all__ # Add get_integrity_level to the public API
 
-# Import expand_environment_strings here after the platform check
-from .expand_variable import expand_environment_strings # noqa: F401 # Imported for __all__
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
-# Import common REG_* constants here after the platform check
+# Import common REG_* constants
 from .registry_translation import ( # noqa: F401 # Imported for __all__
     REG_SZ, REG_EXPAND_SZ, REG_BINARY, REG_DWORD, REG_QWORD, REG_MULTI_SZ
 )
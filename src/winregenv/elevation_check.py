@@ -5,20 +5,22 @@ is running with elevated (administrator) privileges on Microsoft Windows.
 It uses the ctypes module to interact directly with the Windows API.
 """
 
+import bisect
 import ctypes
 import sys
 import logging # Import logging
+import threading
 from ctypes import wintypes
-from typing import Optional, Type
+from typing import Dict, Iterable, Optional, Type
 from types import TracebackType
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
 # --- Platform Check ---
-# This code is specific to Windows. Raise an error if run on other platforms.
-if sys.platform != "win32":
-    raise NotImplementedError("This module requires Windows APIs and only runs on Windows.")
+# The package __init__ rejects non-Windows platforms before this module can be
+# imported; the assert only documents that (and is stripped under -O).
+assert sys.platform == "win32", "This module requires Windows APIs and only runs on Windows."
 
 
 # --- Define necessary Windows API constants and structures ---
@@ -28,9 +30,16 @@ if sys.platform != "win32":
 # Access rights for OpenProcessToken
 TOKEN_QUERY = 0x0008
 
+# Access right for OpenProcess; enough to open the token of most other processes
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+
 # Information class for GetTokenInformation to get the integrity level
 # (Enum value defined in TOKEN_INFORMATION_CLASS)
 TokenIntegrityLevel = 25 # Correct enum value for Integrity Level
+TokenElevation = 20 # Enum value for the token's elevation status
+
+# GetLastError code returned when the supplied buffer is too small
+ERROR_INSUFFICIENT_BUFFER = 122
 
 # Structure for SID and attributes (used within TOKEN_MANDATORY_LABEL)
 class SID_AND_ATTRIBUTES(ctypes.Structure):
@@ -48,6 +57,30 @@ class TOKEN_MANDATORY_LABEL(ctypes.Structure):
         ('Label', SID_AND_ATTRIBUTES) # Contains the integrity level SID
     ]
 
+# winnt.h declares these structures with default alignment, so no _pack_ is needed:
+# PSID + DWORD is padded to two pointers (8 bytes on x86, 16 bytes on x64).
+assert ctypes.sizeof(TOKEN_MANDATORY_LABEL) == 2 * ctypes.sizeof(ctypes.c_void_p), \
+    "TOKEN_MANDATORY_LABEL layout does not match winnt.h"
+
+# SID layout (winnt.h): Revision (BYTE), SubAuthorityCount (BYTE),
+# IdentifierAuthority (6 BYTEs), followed by SubAuthority[SubAuthorityCount] (DWORDs)
+_SID_SUB_AUTHORITY_COUNT_OFFSET = 1
+_SID_SUB_AUTHORITIES_OFFSET = 8
+_SID_SUB_AUTHORITY_SIZE = 4 # sizeof(DWORD)
+SID_MAX_SUB_AUTHORITIES = 15
+SECURITY_MAX_SID_SIZE = _SID_SUB_AUTHORITIES_OFFSET + SID_MAX_SUB_AUTHORITIES * _SID_SUB_AUTHORITY_SIZE # 68 bytes
+
+# Initial buffer size for TokenIntegrityLevel queries: the label followed by the
+# largest possible SID, so the first GetTokenInformation call always has room.
+_TOKEN_INTEGRITY_BUFFER_SIZE = ctypes.sizeof(TOKEN_MANDATORY_LABEL) + SECURITY_MAX_SID_SIZE
+
+# Structure returned by GetTokenInformation for TokenElevation
+class TOKEN_ELEVATION(ctypes.Structure):
+    """Indicates whether a token has elevated privileges."""
+    _fields_ = [
+        ('TokenIsElevated', wintypes.DWORD) # Nonzero if the token is elevated
+    ]
+
 # Integrity levels (Relative Identifiers - RIDs)
 # These are standard SIDs representing different integrity levels
 SECURITY_MANDATORY_UNTRUSTED_RID  = 0x00000000 # Untrusted (rarely used)
@@ -70,23 +103,51 @@ INTEGRITY_LEVEL_NAMES = {
     # Add other known RIDs if necessary, or handle unknown ones below
 }
 
+# Integrity levels as ascending (lowest RID, name) bands, so any RID maps to the
+# level it falls in (e.g. 0x2001 is still "Medium"). Kept in sync with INTEGRITY_LEVEL_NAMES.
+_INTEGRITY_BANDS = tuple(sorted(INTEGRITY_LEVEL_NAMES.items()))
+_INTEGRITY_BAND_RIDS = tuple(band_rid for band_rid, _ in _INTEGRITY_BANDS)
+
+
+def integrity_level_name(rid: int) -> str:
+    """
+    Returns the descriptive name for an integrity level RID.
+
+    RIDs between the defined levels map to the level band they fall in,
+    e.g. 0x2001 is "Medium" and anything from 0x5000 up is "Protected Process".
+
+    Args:
+        rid (int): An integrity level RID, e.g. as returned by get_integrity_level().
+
+    Returns:
+        str: The level name (e.g., "Medium", "High"), or "Unknown (<rid>)"
+             for negative values, which are not valid RIDs.
+    """
+    if rid < SECURITY_MANDATORY_UNTRUSTED_RID:
+        return f"Unknown ({rid})"
+    return _INTEGRITY_BANDS[bisect.bisect_right(_INTEGRITY_BAND_RIDS, rid) - 1][1]
+
 
 # --- Load necessary Windows API libraries and define function signatures ---
 # Defining argtypes and restype is a crucial ctypes best practice for robustness.
 # It helps ctypes marshal data correctly and catch type errors early.
 
+# Both libraries are loaded with use_last_error=True so ctypes snapshots the
+# thread's last-error value immediately after each call; ctypes.get_last_error()
+# then returns that per-call value without any manual clearing.
+
 # kernel32.dll contains process and handle management functions
 try:
-    kernel32 = ctypes.windll.kernel32
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 except AttributeError:
-    # This should be caught by the sys.platform check, but included for robustness
+    # This should be caught by the package platform check, but included for robustness
     raise OSError("Failed to load kernel32.dll. Ensure you are on Windows.")
 
 # advapi32.dll contains security-related functions (tokens, SIDs)
 try:
-    advapi32 = ctypes.windll.advapi32
+    advapi32 = ctypes.WinDLL("advapi32", use_last_error=True)
 except AttributeError:
-     # This should be caught by the sys.platform check, but included for robustness
+     # This should be caught by the package platform check, but included for robustness
      raise OSError("Failed to load advapi32.dll. Ensure you are on Windows.")
 
 
@@ -98,6 +159,10 @@ kernel32.GetCurrentProcess.restype = wintypes.HANDLE
 kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
 kernel32.CloseHandle.restype = wintypes.BOOL
 
+# HANDLE OpenProcess(DWORD dwDesiredAccess, BOOL bInheritHandle, DWORD dwProcessId);
+kernel32.OpenProcess.argtypes = [wintypes.DWORD, wintypes.BOOL, wintypes.DWORD]
+kernel32.OpenProcess.restype = wintypes.HANDLE
+
 # BOOL OpenProcessToken(HANDLE ProcessHandle, DWORD DesiredAccess, PHANDLE TokenHandle);
 advapi32.OpenProcessToken.argtypes = [
     wintypes.HANDLE, wintypes.DWORD, ctypes.POINTER(wintypes.HANDLE)
@@ -111,15 +176,37 @@ advapi32.GetTokenInformation.argtypes = [
 ]
 advapi32.GetTokenInformation.restype = wintypes.BOOL
 
-# Corrected based on MSDN: GetSidSubAuthorityCount returns a pointer to the *actual*
-# SubAuthorityCount field within the SID structure, which is a UCHAR.
-# PUCHAR GetSidSubAuthorityCount(PSID pSid);
-advapi32.GetSidSubAuthorityCount.argtypes = [ctypes.c_void_p] # Corrected: PSID is ctypes.c_void_p
-advapi32.GetSidSubAuthorityCount.restype = ctypes.POINTER(ctypes.c_ubyte) # PUCHAR
 
-# PDWORD GetSidSubAuthority(PSID pSid, DWORD nSubAuthority);
-advapi32.GetSidSubAuthority.argtypes = [ctypes.c_void_p, wintypes.DWORD] # Corrected: PSID is ctypes.c_void_p
-advapi32.GetSidSubAuthority.restype = ctypes.POINTER(wintypes.DWORD) # PDWORD
+def _bool_errcheck(failure_message: str):
+    """
+    Builds a ctypes errcheck hook for BOOL-returning APIs.
+
+    ctypes calls the hook with the raw result after every call; a zero (FALSE)
+    result is turned into ctypes.WinError(last_error, failure_message), so call
+    sites need no error-handling code of their own. Failures are only logged at
+    debug level here, since some are expected (a too-small probe buffer, or a
+    process that denies access during a batch query); the public functions log
+    errors they propagate.
+    """
+    def errcheck(result, func, args):
+        if not result:
+            error_code = ctypes.get_last_error()
+            logger.debug("%s. Error code: %s", failure_message, error_code)
+            raise ctypes.WinError(error_code, failure_message)
+        return args
+    return errcheck
+
+
+advapi32.OpenProcessToken.errcheck = _bool_errcheck("Failed to open process token")
+advapi32.GetTokenInformation.errcheck = _bool_errcheck("Failed to get token information")
+
+# Bind the configured functions once at import time so each call avoids the
+# attribute lookup on the DLL objects.
+_GetCurrentProcess = kernel32.GetCurrentProcess
+_CloseHandle = kernel32.CloseHandle
+_OpenProcess = kernel32.OpenProcess
+_OpenProcessToken = advapi32.OpenProcessToken
+_GetTokenInformation = advapi32.GetTokenInformation
 
 
 # --- Context Managers for Resource Handling ---
@@ -162,7 +249,7 @@ class WindowsHandle:
         # A handle value of 0 or -1 (INVALID_HANDLE_VALUE) is typically invalid
         # Check the underlying value of the handle object
         if self._handle and self._handle.value not in (0, -1):
-            kernel32.CloseHandle(self._handle)
+            _CloseHandle(self._handle)
         # Return None (implicitly) to propagate exceptions if they occurred.
 
 class ProcessToken(WindowsHandle):
@@ -180,195 +267,158 @@ class ProcessToken(WindowsHandle):
         Raises:
             OSError: If OpenProcessToken fails, containing the Windows error code.
         """
-        process_handle = kernel32.GetCurrentProcess() # Pseudo-handle, doesn't need closing
+        process_handle = _GetCurrentProcess() # Pseudo-handle, doesn't need closing
         token_handle = wintypes.HANDLE(0) # Initialize to invalid handle value
 
-        success = advapi32.OpenProcessToken(
+        # Raises OSError via the errcheck hook on failure
+        _OpenProcessToken(
             process_handle,
             TOKEN_QUERY,
             ctypes.byref(token_handle)
         )
 
-        if not success:
-            error_code = ctypes.get_last_error()
-            # It's good practice to clear the last error after retrieving it
-            ctypes.set_last_error(0)
-            # Raise a ctypes.WinError which automatically formats the error message
-            logger.error(f"Failed to open process token. Error code: {error_code}")
-            raise ctypes.WinError(error_code, "Failed to open process token")
-
         # Initialize the base class with the successfully acquired handle
         super().__init__(token_handle)
 
 
-# --- Core Function to Get Integrity Level ---
+# --- Integrity Level Cache ---
+# A process's integrity level and elevation status are fixed for its lifetime, so
+# the first successful lookup is cached and served to all subsequent callers.
+# Failures are never cached.
+_cached_integrity_level: Optional[int] = None
+_cached_is_elevated: Optional[bool] = None
+_integrity_level_lock = threading.Lock()
 
-def get_integrity_level() -> int:
+
+def _reset_integrity_cache() -> None:
+    """Clears the cached integrity level and elevation status (intended for tests)."""
+    global _cached_integrity_level, _cached_is_elevated
+    with _integrity_level_lock:
+        _cached_integrity_level = None
+        _cached_is_elevated = None
+
+
+def _open_process_token() -> wintypes.HANDLE:
     """
-    Retrieves the integrity level (as a numerical Relative Identifier - RID)
-    of the current process token on Windows.
+    Opens the current process token for querying.
 
-    This is a harmless, read-only check.
+    The caller is responsible for closing the returned handle with CloseHandle.
+
+    Raises:
+        OSError: If OpenProcessToken fails, containing the Windows error code.
+    """
+    token = wintypes.HANDLE(0) # Initialize to invalid handle value
+    # Raises OSError via the errcheck hook on failure
+    _OpenProcessToken(_GetCurrentProcess(), TOKEN_QUERY, ctypes.byref(token))
+    return token
 
-    Returns:
-        The integer RID representing the process's integrity level
-        (e.g., SECURITY_MANDATORY_MEDIUM_RID, SECURITY_MANDATORY_HIGH_RID).
+
+def _close_process_token(token: wintypes.HANDLE) -> None:
+    """Closes a token handle returned by _open_process_token, ignoring invalid handles."""
+    # A NULL handle (value None or 0) or -1 (INVALID_HANDLE_VALUE) is invalid and must not be closed
+    if token.value and token.value != -1:
+        _CloseHandle(token)
+
+
+# --- Core Function to Get Integrity Level ---
+
+def _read_token_integrity_level(token: wintypes.HANDLE) -> int:
+    """
+    Reads the integrity level RID from an open token handle (TOKEN_QUERY access).
 
     Raises:
-        NotImplementedError: If run on a non-Windows operating system.
-        OSError: If any underlying Windows API call fails. The error
-                 message will contain details and the Windows error code.
-        ValueError: If the integrity SID structure is unexpected (e.g., NULL pointer, zero sub-authorities).
+        OSError: If GetTokenInformation fails.
+        ValueError: If the integrity SID structure is unexpected.
     """
-    # The ProcessToken context manager handles acquiring and releasing the token handle.
-    # If acquiring fails (__init__ raises OSError), the 'with' block is never entered,
-    # and the exception propagates.
+    # --- Get the token integrity level information ---
+    # The initial buffer holds TOKEN_MANDATORY_LABEL plus the largest possible SID,
+    # so try that first and skip the separate size query. Only fall back to the
+    # reported size if it is somehow too small.
+    buffer = ctypes.create_string_buffer(_TOKEN_INTEGRITY_BUFFER_SIZE)
+    return_length = wintypes.DWORD(0)
     try:
-        with ProcessToken() as token:
-            # --- Get the required buffer size for the token integrity level ---
-            buffer_size = wintypes.DWORD()
-            # Call GetTokenInformation with null buffer to get required size.
-            # This call is expected to fail with ERROR_INSUFFICIENT_BUFFER (122).
-            # We check the return value *and* the last error code.
-            success = advapi32.GetTokenInformation(
-                token,
-                TokenIntegrityLevel, # Requesting the integrity level info
-                None,                # No buffer provided yet
-                0,                   # Buffer size is zero
-                ctypes.byref(buffer_size) # ReturnLength parameter
-            )
+        _GetTokenInformation(
+            token,
+            TokenIntegrityLevel, # Requesting the integrity level info
+            buffer,
+            _TOKEN_INTEGRITY_BUFFER_SIZE,
+            ctypes.byref(return_length) # ReturnLength parameter
+        )
+    except OSError as e:
+        if e.winerror != ERROR_INSUFFICIENT_BUFFER or return_length.value == 0:
+            raise
+
+        # Rare case: the label did not fit. Retry with the size the API reported.
+        buffer = ctypes.create_string_buffer(return_length.value)
+        _GetTokenInformation(
+            token,
+            TokenIntegrityLevel,
+            buffer,
+            return_length.value,
+            ctypes.byref(return_length) # ReturnLength parameter
+        )
 
-            error_code = ctypes.get_last_error()
-            ctypes.set_last_error(0) # Clear the error after getting it
-
-            # --- Interpret the result of the size query call ---
-            # The call should return False and set GetLastError to 122 (ERROR_INSUFFICIENT_BUFFER).
-            # However, some environments might behave differently.
-            # The most reliable indicator of success in getting the size is buffer_size.value > 0.
-            if success:
-                 # Unexpected success on the size query call. This shouldn't happen.
-                 # Treat this as an error.
-                 # Include the error_code we just retrieved, even if it's 0.
-                 logger.error(f"GetTokenInformation succeeded unexpectedly on size query (error code {error_code}). Expected failure with ERROR_INSUFFICIENT_BUFFER (122).")
-                 raise OSError(f"GetTokenInformation succeeded unexpectedly (error code {error_code}). Expected failure with ERROR_INSUFFICIENT_BUFFER (122).")
-
-            # If we are here, success is False.
-            # Now check if we got a buffer size.
-            if buffer_size.value == 0:
-                # It failed, and didn't return the required size. This is a real error.
-                # Use the error_code we retrieved.
-                # If error_code is 0 here, it's still weird, but we report the failure.
-                logger.error(f"GetTokenInformation failed to get buffer size. Error code: {error_code}")
-                raise ctypes.WinError(error_code, "Failed to get token information buffer size")
-
-            # If we reached here, buffer_size.value is the required size (and > 0)
-
-            # --- Allocate the buffer ---
-            # Use create_string_buffer for raw byte buffer managed by ctypes.
-            buffer = ctypes.create_string_buffer(buffer_size.value)
-
-            # --- Get the token integrity level information into the buffer ---
-            # Call GetTokenInformation again, this time with the allocated buffer.
-            if not advapi32.GetTokenInformation(
-                token,
-                TokenIntegrityLevel,
-                buffer,
-                buffer_size.value,
-                ctypes.byref(buffer_size) # ReturnLength parameter
-            ):
-                error_code = ctypes.get_last_error()
-                ctypes.set_last_error(0)
-                logger.error(f"Failed to get token information into buffer. Error code: {error_code}")
-                raise ctypes.WinError(error_code, "Failed to get token information")
-
-            # --- Interpret the buffer as the structure and extract the SID ---
-            # Cast the raw buffer bytes to a pointer to our structure type.
-            # .contents dereferences the pointer to get the actual structure.
-            # The SID pointer (pSid) within the structure points into `buffer`.
-            token_label = ctypes.cast(buffer, ctypes.POINTER(TOKEN_MANDATORY_LABEL)).contents
-            sid = token_label.Label.Sid
-
-            # --- Validate the SID pointer ---
-            if not sid:
-                 # This indicates the TOKEN_MANDATORY_LABEL structure didn't contain a valid SID pointer
-                 # This is highly unexpected for TokenIntegrityLevel
-                 logger.error("Integrity SID pointer obtained from GetTokenInformation is NULL.")
-                 raise ValueError("Integrity SID pointer obtained from GetTokenInformation is NULL.")
-
-            # --- Get the number of sub-authorities in the SID ---
-            # The integrity level RID is the last sub-authority.
-            # GetSidSubAuthorityCount returns a pointer to the UCHAR count field within the SID.
-            # Clear last error before the call
-            ctypes.set_last_error(0)
-            sub_authority_count_ptr = advapi32.GetSidSubAuthorityCount(sid)
-            error_code_after_count = ctypes.get_last_error()
-            # No need to clear error_code_after_count, we just read it.
-
-            if not sub_authority_count_ptr:
-                 # This typically fails if 'sid' is not a valid SID pointer
-                 # Use the error code captured *after* the call
-                 # Raise ctypes.WinError for API call failures
-                 logger.error(f"GetSidSubAuthorityCount failed (returned NULL pointer). LastError: {error_code_after_count}")
-                 raise ctypes.WinError(error_code_after_count, "GetSidSubAuthorityCount failed (returned NULL pointer)")
-
-            # If we are here, sub_authority_count_ptr is non-NULL.
-            # Check if GetLastError was set, even if the pointer is non-NULL.
-            # This is less common for pointer-returning functions but worth checking.
-            if error_code_after_count != 0:
-                 # This is an unusual state: non-NULL pointer but error code set.
-                 # Treat as a failure.
-                 logger.error(f"GetSidSubAuthorityCount returned non-NULL pointer but set last error: {error_code_after_count}")
-                 raise ctypes.WinError(error_code_after_count, "GetSidSubAuthorityCount returned non-NULL pointer but set last error")
-
-
-            # Dereference the pointer and get the value (which is the count).
-            sub_authority_count = sub_authority_count_ptr.contents.value
-
-            if sub_authority_count == 0:
-                # An integrity SID should always have at least one sub-authority (the RID)
-                # If we reached here, sid was non-NULL, sub_authority_count_ptr was non-NULL,
-                # GetLastError was 0 after the call, but the count byte at that location is 0.
-                # This is still highly unexpected and indicates a problem with the SID data itself.
-                logger.error("Integrity SID reported zero sub-authorities.")
-                raise ValueError("Integrity SID reported zero sub-authorities.")
-
-
-            # --- Get the last sub-authority (the integrity level RID) ---
-            # GetSidSubAuthority returns a pointer to the DWORD value of the sub-authority.
-            # The index is 0-based, so the last one is at index (count - 1).
-            integrity_level_ptr = advapi32.GetSidSubAuthority(sid, sub_authority_count - 1)
-            # Check GetLastError after this call too
-            error_code_after_subauthority = ctypes.get_last_error()
-            ctypes.set_last_error(0) # Clear after reading
-
-            if not integrity_level_ptr:
-                 # This can fail if the index is out of bounds or 'sid' is invalid.
-                 logger.error(f"GetSidSubAuthority failed (returned NULL pointer). LastError: {error_code_after_subauthority}")
-                 raise ctypes.WinError(error_code_after_subauthority, "GetSidSubAuthority failed (returned NULL pointer)")
-
-            # Check GetLastError even if pointer is non-NULL
-            if error_code_after_subauthority != 0:
-                 logger.error(f"GetSidSubAuthority returned non-NULL pointer but set last error: {error_code_after_subauthority}")
-                 raise ctypes.WinError(error_code_after_subauthority, "GetSidSubAuthority returned non-NULL pointer but set last error")
-
-
-            # Dereference the pointer and get the DWORD value.
-            # No need to keep the 'integrity_level_ptr' object itself around.
-            integrity_level = integrity_level_ptr.contents.value
-
-            # Return the numerical integrity level RID
-            return integrity_level
-
-    # Catch potential OSError from ProcessToken.__init__ or API calls within the 'with' block
+    # --- Interpret the buffer as the structure and extract the SID ---
+    # from_buffer creates a zero-copy view of the structure over `buffer`,
+    # which stays alive for the rest of this function.
+    # The SID pointer (pSid) within the structure points into `buffer`.
+    token_label = TOKEN_MANDATORY_LABEL.from_buffer(buffer)
+    sid = token_label.Label.Sid
+
+    # --- Validate the SID pointer ---
+    if not sid:
+         # This indicates the TOKEN_MANDATORY_LABEL structure didn't contain a valid SID pointer
+         # This is highly unexpected for TokenIntegrityLevel
+         raise ValueError("Integrity SID pointer obtained from GetTokenInformation is NULL.")
+
+    # --- Read the integrity level RID directly from the SID ---
+    # A SID has a fixed layout (winnt.h): Revision (BYTE), SubAuthorityCount (BYTE),
+    # IdentifierAuthority (6 BYTEs), then SubAuthorityCount DWORDs. The integrity
+    # level RID is the last sub-authority, so read it at its offset instead of
+    # calling GetSidSubAuthorityCount/GetSidSubAuthority.
+    sub_authority_count = ctypes.c_ubyte.from_address(sid + _SID_SUB_AUTHORITY_COUNT_OFFSET).value
+
+    if sub_authority_count == 0:
+        # An integrity SID should always have at least one sub-authority (the RID)
+        raise ValueError("Integrity SID reported zero sub-authorities.")
+
+    if sub_authority_count > SID_MAX_SUB_AUTHORITIES:
+        # Guard against reading past the end of a corrupt SID
+        raise ValueError(f"Integrity SID reported {sub_authority_count} sub-authorities (maximum is {SID_MAX_SUB_AUTHORITIES}).")
+
+    # The index is 0-based, so the last one is at index (count - 1).
+    return wintypes.DWORD.from_address(
+        sid + _SID_SUB_AUTHORITIES_OFFSET + (sub_authority_count - 1) * _SID_SUB_AUTHORITY_SIZE
+    ).value
+
+
+def _get_integrity_level_uncached() -> int:
+    """
+    Queries the integrity level of the current process token via the Windows API,
+    bypassing the module-level cache.
+
+    See get_integrity_level() for return value and exceptions.
+    """
+    # The token handle is opened and closed inline rather than through the
+    # ProcessToken context manager, avoiding the wrapper objects on every query.
+    # If opening fails, the inner try is never entered and the exception propagates.
+    try:
+        token = _open_process_token()
+        try:
+            return _read_token_integrity_level(token)
+        finally:
+            _close_process_token(token)
+
+    # Catch potential OSError from OpenProcessToken or GetTokenInformation
     # ctypes.WinError is a subclass of OSError
     except OSError as e:
         # Re-raise the caught OSError to provide detailed error info to the caller
-        # Logging already happens within the function for specific API errors
+        logger.error("Failed to get the process integrity level: %s", e)
         raise e
     # Catch potential ValueError from sub-authority count check or NULL SID pointer check
     except ValueError as e:
         # Wrap it in an OSError for consistency, though it indicates data corruption/unexpected state
-        # Logging already happens within the function for specific ValueErrors
+        logger.error("Integrity SID data appears invalid: %s", e)
         raise OSError(f"Integrity SID data appears invalid: {e}") from e
     except Exception as e:
         # Catch any other unexpected errors during processing
@@ -377,26 +427,133 @@ def get_integrity_level() -> int:
         raise OSError(f"An unexpected error occurred during integrity level retrieval: {e}") from e
 
 
+def get_integrity_level() -> int:
+    """
+    Retrieves the integrity level (as a numerical Relative Identifier - RID)
+    of the current process token on Windows.
+
+    This is a harmless, read-only check. The result of the first successful
+    query is cached for the lifetime of the process, since a process's
+    integrity level cannot change once it has started.
+
+    Returns:
+        The integer RID representing the process's integrity level
+        (e.g., SECURITY_MANDATORY_MEDIUM_RID, SECURITY_MANDATORY_HIGH_RID).
+
+    Raises:
+        NotImplementedError: If run on a non-Windows operating system.
+        OSError: If any underlying Windows API call fails. The error
+                 message will contain details and the Windows error code.
+        ValueError: If the integrity SID structure is unexpected (e.g., NULL pointer, zero sub-authorities).
+    """
+    global _cached_integrity_level
+    cached = _cached_integrity_level
+    if cached is not None:
+        return cached
+
+    with _integrity_level_lock:
+        # Double-check: another thread may have populated the cache while we waited
+        if _cached_integrity_level is None:
+            # Exceptions propagate without touching the cache
+            _cached_integrity_level = _get_integrity_level_uncached()
+        return _cached_integrity_level
+
+
+def get_integrity_levels(pids: Iterable[int]) -> Dict[int, int]:
+    """
+    Retrieves the integrity levels (RIDs) of several processes at once.
+
+    Each process is opened with PROCESS_QUERY_LIMITED_INFORMATION and its token
+    queried as in get_integrity_level(), using the module-level bound API
+    functions. Results are not cached, since other processes come and go.
+
+    Args:
+        pids: Process IDs to query.
+
+    Returns:
+        A dict mapping each PID whose integrity level could be read to its RID.
+        PIDs that cannot be opened or queried (e.g., exited processes, or
+        protected processes that deny access) are omitted.
+    """
+    levels: Dict[int, int] = {}
+    for pid in pids:
+        process = _OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not process:
+            logger.debug("Could not open process %s. Error code: %s", pid, ctypes.get_last_error())
+            continue
+        try:
+            token = wintypes.HANDLE(0) # Initialize to invalid handle value
+            try:
+                _OpenProcessToken(process, TOKEN_QUERY, ctypes.byref(token))
+                levels[pid] = _read_token_integrity_level(token)
+            except (OSError, ValueError) as e:
+                logger.debug("Could not read the integrity level of process %s: %s", pid, e)
+            finally:
+                _close_process_token(token)
+        finally:
+            _CloseHandle(process)
+    return levels
+
+
 # --- Convenience Function to Check for Elevation ---
 
+def _is_elevated_uncached() -> bool:
+    """
+    Queries the elevation status of the current process token via the Windows API,
+    bypassing the module-level cache.
+
+    See is_elevated() for return value and exceptions.
+    """
+    try:
+        token = _open_process_token()
+        try:
+            # TOKEN_ELEVATION is a single DWORD, so one GetTokenInformation call suffices.
+            elevation = TOKEN_ELEVATION()
+            return_length = wintypes.DWORD(0)
+            _GetTokenInformation(
+                token,
+                TokenElevation, # Requesting the elevation status
+                ctypes.byref(elevation),
+                ctypes.sizeof(elevation),
+                ctypes.byref(return_length) # ReturnLength parameter
+            )
+
+            return bool(elevation.TokenIsElevated)
+        finally:
+            _close_process_token(token)
+    except OSError as e:
+        logger.error("Failed to get the process elevation status: %s", e)
+        raise
+
+
 def is_elevated() -> bool:
     """
     Checks if the current process is running with elevated (administrator)
-    privileges on Windows by comparing its integrity level to HIGH.
+    privileges on Windows.
+
+    Uses GetTokenInformation(TokenElevation), which reports the elevation
+    status directly; use get_integrity_level() if the numeric integrity level
+    is needed. The result of the first successful check is cached for the
+    lifetime of the process.
 
     Returns:
-        True if the process integrity level is HIGH or greater, False otherwise.
+        True if the process token is elevated, False otherwise.
 
     Raises:
         NotImplementedError: If run on a non-Windows operating system.
-        OSError: If any underlying Windows API call fails (propagated from
-                 get_integrity_level).
-        ValueError: If the integrity SID structure is unexpected (propagated
-                    from get_integrity_level).
+        OSError: If any underlying Windows API call fails.
     """
-    # A process is considered elevated if its integrity level is HIGH or higher.
-    # (e.g., HIGH, SYSTEM, Protected Process)
-    return get_integrity_level() >= SECURITY_MANDATORY_HIGH_RID
+    global _cached_is_elevated
+    cached = _cached_is_elevated
+    if cached is not None:
+        return cached
+
+    with _integrity_level_lock:
+        # Double-check: another thread may have populated the cache while we waited
+        if _cached_is_elevated is None:
+            # Exceptions propagate without touching the cache
+            _cached_is_elevated = _is_elevated_uncached()
+        return _cached_is_elevated
 
 
 # --- Example Usage ---
@@ -413,15 +570,15 @@ if __name__ == "__main__":
         level_rid = get_integrity_level()
 
         # Map the numerical level to a name
-        level_name = INTEGRITY_LEVEL_NAMES.get(level_rid, f"Unknown ({level_rid})")
+        level_name = integrity_level_name(level_rid)
 
         print(f"The script is running with integrity level: {level_name}")
 
         # Use the convenience function
         if is_elevated():
-            print("This level is considered elevated (>= High).")
+            print("The process token is elevated.")
         else:
-            print("This level is considered standard user or lower (< High).")
+            print("The process token is not elevated.")
 
     except NotImplementedError as e:
         print(f"Error: {e}", file=sys.stderr)
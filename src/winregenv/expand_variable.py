@@ -8,7 +8,8 @@ This is particularly useful for processing REG_EXPAND_SZ registry values.
 import ctypes
 from ctypes import wintypes
 import sys
-from typing import Optional
+import threading
+from typing import Iterable, List, Optional
 
 # --- Platform Check ---
 # This code is specific to Windows. Raise an error if run on other platforms.
@@ -20,9 +21,12 @@ if sys.platform != "win32":
 # Defining argtypes and restype is a crucial ctypes best practice for robustness.
 # It helps ctypes marshal data correctly and catch type errors early.
 
-# kernel32.dll contains process and environment functions
+# kernel32.dll contains process and environment functions.
+# It is loaded with use_last_error=True so ctypes snapshots the thread's last-error
+# value immediately after each call; ctypes.get_last_error() then returns the value
+# set by ExpandEnvironmentStringsW itself rather than whatever ran in between.
 try:
-    kernel32 = ctypes.windll.kernel32
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
 except AttributeError:
     # This should be caught by the sys.platform check, but included for robustness
     raise OSError("Failed to load kernel32.dll. Ensure you are on Windows.")
@@ -41,9 +45,37 @@ kernel32.ExpandEnvironmentStringsW.argtypes = [
 # Return value is the required buffer size (including null terminator) or 0 on error
 kernel32.ExpandEnvironmentStringsW.restype = wintypes.DWORD
 
-# Define a reasonable initial buffer size for the first attempt
-# MAX_PATH is 260, but expanded strings can be longer. 1024 is a safer start.
-_INITIAL_BUFFER_SIZE = 1024
+# Bind the configured function once at import time so each call avoids the
+# attribute lookup on the DLL object.
+_ExpandEnvironmentStringsW = kernel32.ExpandEnvironmentStringsW
+
+# Smallest first-attempt buffer size, in characters (MAX_PATH)
+_MIN_BUFFER_SIZE = 260
+# First-attempt headroom per source character; expansions rarely grow a string more than this
+_BUFFER_SIZE_PER_SOURCE_CHAR = 4
+
+# Per-thread output buffer, reused across calls and grown to the largest size
+# needed so far. Once warmed up, expansions allocate and zero-fill nothing.
+_thread_local = threading.local()
+
+
+def _get_buffer(min_size: int) -> ctypes.Array:
+    """Returns this thread's reusable wchar buffer, enlarged to at least min_size characters."""
+    buffer = getattr(_thread_local, "buffer", None)
+    if buffer is None or len(buffer) < min_size:
+        buffer = (ctypes.c_wchar * min_size)()
+        _thread_local.buffer = buffer
+    return buffer
+
+
+def _raise_expansion_error(source_string: str) -> None:
+    """Raises the WinError for a failed ExpandEnvironmentStringsW call on source_string."""
+    # The per-call snapshot is read directly; nothing needs clearing
+    error_code = ctypes.get_last_error()
+    # Raise a ctypes.WinError which automatically formats the message
+    # Include the original string in the error message for context.
+    raise ctypes.WinError(error_code, f"Failed to expand environment strings for '{source_string}'")
+
 
 def expand_environment_strings(source_string: str) -> str:
     """
@@ -74,22 +106,20 @@ def expand_environment_strings(source_string: str) -> str:
     if not isinstance(source_string, str):
         raise TypeError("source_string must be a string")
 
-    # Use the two-pass approach to handle buffer sizing:
-    # 1. Call with a small buffer to get the required size.
-    # 2. Allocate a buffer of the required size.
-    # 3. Call again with the correctly sized buffer.
-
-    buffer_size = _INITIAL_BUFFER_SIZE
+    # Size the first buffer from the input so that almost every expansion
+    # completes in a single call. If it is still too small, the API reports
+    # the required size and the loop retries once with exactly that size.
+    buffer_size = max(_MIN_BUFFER_SIZE, len(source_string) * _BUFFER_SIZE_PER_SOURCE_CHAR + 1)
     while True:
-        # Create a buffer of the current size.
-        # ctypes.create_unicode_buffer allocates memory and manages it.
-        buffer = ctypes.create_unicode_buffer(buffer_size)
+        # Reuse this thread's buffer, offering the API all of its capacity.
+        buffer = _get_buffer(buffer_size)
+        buffer_size = len(buffer)
 
         # Call the API function.
         # lpSrc and lpDst must be different buffers.
         # The return value is the required size (including null) on success
         # or if the buffer is too small, or 0 on other errors.
-        required_size = kernel32.ExpandEnvironmentStringsW(
+        required_size = _ExpandEnvironmentStringsW(
             source_string,
             buffer,
             buffer_size
@@ -98,22 +128,41 @@ def expand_environment_strings(source_string: str) -> str:
         # Check the return value.
         if required_size == 0:
             # An error occurred (other than insufficient buffer).
-            error_code = ctypes.get_last_error()
-            # Clear the last error after retrieving it (good practice)
-            ctypes.set_last_error(0)
-            # Raise a ctypes.WinError which automatically formats the message
-            # Include the original string in the error message for context.
-            raise ctypes.WinError(error_code, f"Failed to expand environment strings for '{source_string}'")
+            _raise_expansion_error(source_string)
         elif required_size <= buffer_size:
             # Success! The required size fits within or equals the buffer size.
-            # required_size includes the null terminator.
-            # buffer.value gives the string up to the null terminator.
-            return buffer.value
+            # required_size includes the null terminator, so read exactly the
+            # characters written rather than scanning the (reused) buffer for one.
+            return ctypes.wstring_at(buffer, required_size - 1)
         else:
             # Buffer was too small. required_size is the correct size needed.
             buffer_size = required_size
             # Loop will continue with the new, larger buffer_size.
 
+
+def expand_environment_strings_many(source_strings: Iterable[str]) -> List[str]:
+    """
+    Expands environment-variable strings in each of several source strings.
+
+    A convenience wrapper equivalent to
+    [expand_environment_strings(s) for s in source_strings], for expanding
+    many REG_EXPAND_SZ values at once, e.g. after enumerating a key. It makes
+    one API call per string, like the single-string function.
+
+    Args:
+        source_strings: The strings containing environment variables to expand.
+
+    Returns:
+        list[str]: The expanded strings, in input order.
+
+    Raises:
+        TypeError: If any item is not a string.
+        OSError: If the underlying Windows API call fails for reasons
+                 other than insufficient buffer size.
+    """
+    return [expand_environment_strings(source_string) for source_string in source_strings]
+
+
 # Example Usage (optional, for testing the module directly)
 if __name__ == "__main__":
     try:
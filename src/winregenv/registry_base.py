@@ -6,24 +6,41 @@ with centralized error translation into custom exceptions.
 """
 
 import winreg
-from typing import Optional, Any, Type, List, Tuple, Dict
+from typing import Optional, Any, Type, List, Tuple, Dict, Iterable
 from ctypes.wintypes import HANDLE # Import HANDLE for type hinting
-import os # Needed for os.path.split
-from datetime import datetime, timezone # Needed for head_registry_key timestamp conversion and UTC
+from functools import lru_cache
+from contextlib import contextmanager
+from itertools import count as _count
+from datetime import datetime, timedelta, timezone # Needed for head_registry_key timestamp conversion and UTC
 
 import logging
 
-from .registry_errors import RegistryValueNotFoundError, \
-    RegistryKeyNotEmptyError, _handle_winreg_error
-from .registry_types import RegistryValue # Import RegistryValue
+from .registry_errors import RegistryError, RegistryValueNotFoundError, \
+    RegistryKeyNotEmptyError, RegistryPermissionError, _handle_winreg_error
+from .registry_types import RegistryValue, RegistryKeyInfo, RegistryKeyWalk # Import RegistryValue
 from .registry_context_managers import RegistryKey as _BaseRegistryKey
 
 logger = logging.getLogger(__name__)
 
-# Constants for FILETIME conversion (100-nanosecond intervals since January 1, 1601 UTC)
-_EPOCH_AS_FILETIME = 116444736000000000  # January 1, 1970 as FILETIME
-_HUNDREDS_OF_NS_ = 10000000 # Number of 100-nanosecond intervals in one second
-
+# Bind the winreg functions once at import time so the enumeration loops and
+# other per-operation calls skip the module attribute lookup each time.
+_CreateKeyEx = winreg.CreateKeyEx
+_CloseKey = winreg.CloseKey
+_SetValueEx = winreg.SetValueEx
+_QueryValueEx = winreg.QueryValueEx
+_OpenKey = winreg.OpenKey
+_EnumValue = winreg.EnumValue
+_EnumKey = winreg.EnumKey
+_QueryInfoKey = winreg.QueryInfoKey
+_DeleteValue = winreg.DeleteValue
+_DeleteKey = winreg.DeleteKey
+
+# FILETIME values count 100-nanosecond intervals since January 1, 1601 UTC
+_FILETIME_EPOCH = datetime(1601, 1, 1, tzinfo=timezone.utc)
+
+# Callers tend to reuse a small set of (prefix, path) pairs, and the join is pure,
+# so repeated joins become a cache lookup instead of building a new string.
+@lru_cache(maxsize=1024)
 def _join_registry_paths(
         prefix: str,
         path: str,
@@ -36,14 +53,71 @@ def _join_registry_paths(
 
     Returns:
         str: The combined registry path, using backslashes.
+
+    Callers skip this function entirely when there is no prefix (the common
+    case for RegistryRoot instances created without root_prefix), since the
+    result would just be path.
     """
     if not prefix:
         return path
     if not path:
         return prefix
-    # Use os.path.join which handles separators correctly, but replace / with \ for registry
-    return os.path.join(prefix, path).replace('/', '\\')
+    # Registry paths have no drives or roots, so a plain concatenation is enough;
+    # os.path.join's extra work is not needed on this per-operation path.
+    # Forward slashes are still accepted as separators and converted to backslashes.
+    if prefix[-1] in '\\/':
+        return (prefix + path).replace('/', '\\')
+    return (prefix + '\\' + path).replace('/', '\\')
+
+
+def _enumerate_registry_key(enum_func, key, count: Optional[int]) -> list:
+    """Call enum_func(key, i) for i in range(count), as reported by QueryInfoKey.
+
+    Sizing the enumeration up front avoids probing for ERROR_NO_MORE_ITEMS (259)
+    after the last entry. If the key loses entries between QueryInfoKey and the
+    enumeration, 259 arrives early and the entries read so far are returned.
+    A count of None (the key could not be queried) enumerates until 259.
+    Any other OSError propagates to the caller for translation.
+    """
+    items = []
+    try:
+        for i in (range(count) if count is not None else _count()):
+            items.append(enum_func(key, i))
+    except OSError as e:
+        if getattr(e, 'winerror', None) != 259:
+            raise
+    return items
+
+
+@contextmanager
+def _create_registry_key(root_key: int, full_path: str, access: int):
+    """Create (or open) a key with CreateKeyEx and close its handle on exit.
+
+    CreateKeyEx errors propagate as OSError for the caller to translate,
+    in which case there is no handle to close.
+    """
+    handle = _CreateKeyEx(root_key, full_path, 0, access)
+    try:
+        yield handle
+    finally:
+        _CloseKey(handle)
+
+def _open_registry_key(root_key: int, full_path: str, access: int, access_32bit_view: bool = False):
+    """Open a key with OpenKey, translating failures the same way RegistryKey does.
 
+    The registry_base operations call this directly and close the handle with
+    _CloseKey in a try/finally, rather than going through the RegistryKey
+    context manager's __enter__/__exit__ calls on every operation.
+
+    Raises:
+        RegistryError or subclass: If the key cannot be opened.
+    """
+    if access_32bit_view:
+        access |= winreg.KEY_WOW64_32KEY
+    try:
+        return _OpenKey(root_key, full_path, 0, access)
+    except OSError as e:
+        _handle_winreg_error(e, full_path)
 
 # Define a new RegistryKey class in this module that inherits from the base one.
 # Ensures backwards compatibility across test suite.
@@ -51,8 +125,10 @@ class RegistryKey(_BaseRegistryKey):
     """
     Context manager for Windows registry key handles (re-exported for backward compatibility).
     The actual implementation is in registry_context_managers.py.
+    The registry_base operations themselves open keys with _open_registry_key
+    and a try/finally instead.
     """
-    pass # No changes needed, it inherits everything
+    __slots__ = () # Keep the base class's slot layout (no per-instance __dict__)
 
 def ensure_registry_key_exists(
         root_key: int,
@@ -72,7 +148,7 @@ def ensure_registry_key_exists(
         RegistryPermissionError: If creation is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
 
     if not full_path:
         # Root key always exists
@@ -90,12 +166,9 @@ def ensure_registry_key_exists(
         # We open with KEY_ALL_ACCESS or KEY_WRITE for simplicity, as CreateKeyEx
         # often requires more than just KEY_CREATE_SUB_KEY to open existing keys.
         # Let's use KEY_WRITE which includes KEY_CREATE_SUB_KEY and KEY_SET_VALUE.
-        # The handle returned by CreateKeyEx needs to be closed.
-        handle = None # Initialize handle to None
-        try:
-            handle = winreg.CreateKeyEx(root_key, full_path, 0, effective_access) # Use effective_access
-        finally:
-            if handle: winreg.CloseKey(handle)
+        # The handle returned by CreateKeyEx is closed by _create_registry_key.
+        with _create_registry_key(root_key, full_path, effective_access):
+            pass
     except OSError as e: # Changed from WindowsError
         _handle_winreg_error(e, full_path)
 
@@ -125,18 +198,65 @@ def put_registry_value(
         RegistryPermissionError: If setting the value is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
-
-    # Ensure the parent key exists before attempting to set the value
-    ensure_registry_key_exists(root_key, full_path, access_32bit_view=access_32bit_view)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
 
     # Type inference and data validation/conversion are handled by the caller (RegistryRoot).
     # This function expects a valid integer value_type and compatible value_data
     # as required by winreg.SetValueEx.
     try:
-        # Open the key with write access, passing the flag
-        with RegistryKey(root_key, full_path, winreg.KEY_SET_VALUE, access_32bit_view=access_32bit_view) as key:
-            winreg.SetValueEx(key, value_name, 0, value_type, value_data)
+        # Combine base access with WOW64 flag if requested
+        effective_access = winreg.KEY_WRITE
+        if access_32bit_view:
+            effective_access |= winreg.KEY_WOW64_32KEY
+
+        # CreateKeyEx creates the key (and any missing parents) or opens it if it
+        # already exists, returning a writable handle; a single open serves both
+        # ensuring the key exists and setting the value.
+        with _create_registry_key(root_key, full_path, effective_access) as handle:
+            _SetValueEx(handle, value_name, 0, value_type, value_data)
+
+    except OSError as e:
+        _handle_winreg_error(e, full_path, value_name)
+
+
+def put_registry_values(
+        root_key: int,
+        key_path: str,
+        values: Dict[str, Tuple[Any, int]],
+        root_prefix: str = "",
+        access_32bit_view: bool = False,
+    ) -> None:
+    """Create or update several values under one key, creating the key if necessary.
+
+    The key is opened once and every value is written through the same handle,
+    instead of one CreateKeyEx/CloseKey pair per value as with put_registry_value.
+    Values are written in mapping order; if one fails, the values before it
+    have already been written.
+
+    Args:
+        root_key (int): Handle of the root registry hive.
+        key_path (str): Subkey path relative to root_prefix.
+        values (Dict[str, Tuple[Any, int]]): Maps each value name ("" for default)
+            to a (value_data, value_type) pair, as passed to put_registry_value.
+        root_prefix (str): Base sub‐path under root_key (may be empty).
+        access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+
+    Raises:
+        RegistryPermissionError: If creating the key or setting a value is denied.
+        RegistryError: For other registry errors.
+    """
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
+    value_name = None # Name of the value being written, for error messages
+
+    try:
+        # Combine base access with WOW64 flag if requested
+        effective_access = winreg.KEY_WRITE
+        if access_32bit_view:
+            effective_access |= winreg.KEY_WOW64_32KEY
+
+        with _create_registry_key(root_key, full_path, effective_access) as handle:
+            for value_name, (value_data, value_type) in values.items():
+                _SetValueEx(handle, value_name, 0, value_type, value_data)
 
     except OSError as e:
         _handle_winreg_error(e, full_path, value_name)
@@ -162,12 +282,9 @@ def put_registry_subkey(
         RegistryPermissionError: If creation is denied.
         RegistryError: For other registry errors.
     """
-    full_parent_path = _join_registry_paths(root_prefix, key_path)
+    full_parent_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
     full_subkey_path = _join_registry_paths(full_parent_path, subkey_name)
 
-    # Ensure the parent key exists, passing the flag
-    ensure_registry_key_exists(root_key, full_parent_path, access_32bit_view=access_32bit_view)
-
     try:
         # Combine base access with WOW64 flag if requested
         effective_access = winreg.KEY_WRITE
@@ -175,13 +292,11 @@ def put_registry_subkey(
             effective_access |= winreg.KEY_WOW64_32KEY
 
         # winreg.CreateKeyEx is used here as it will create the key if it doesn't exist
-        # and return a handle. We need to close this handle.
+        # and return a handle. It also creates any missing parent keys, so the parent
+        # does not need to be ensured separately. _create_registry_key closes the handle.
         # We need KEY_WRITE access on the new key path.
-        handle = None # Initialize handle to None
-        try:
-            handle = winreg.CreateKeyEx(root_key, full_subkey_path, 0, effective_access) # Use effective_access
-        finally:
-            if handle: winreg.CloseKey(handle)
+        with _create_registry_key(root_key, full_subkey_path, effective_access):
+            pass
     except OSError as e: # Changed from WindowsError
         _handle_winreg_error(e, full_subkey_path)
 
@@ -192,6 +307,7 @@ def get_registry_value(
         value_name: str,
         root_prefix: str = "",
         access_32bit_view: bool = False, # Add parameter
+        key_handle: Optional[HANDLE] = None,
     ) -> RegistryValue:
     """Retrieve the data and type of a registry value.
 
@@ -201,6 +317,8 @@ def get_registry_value(
         value_name (str): Name of the value ("" for default).
         root_prefix (str): Base sub‐path under root_key (may be empty).
         access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
 
     Returns:
         RegistryValue: An object representing the registry value.
@@ -211,31 +329,84 @@ def get_registry_value(
         RegistryPermissionError: If read access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
 
     try:
-        # Open the key with read access, passing the flag
-        # Errors from RegistryKey.__enter__ (OpenKey) are caught by the outer except block.
-        with RegistryKey(root_key, full_path, winreg.KEY_READ, access_32bit_view=access_32bit_view) as key:
-            try:
-                # Attempt to query the specific value
-                # Errors from QueryValueEx are caught by this inner except block.
-                value_data, value_type = winreg.QueryValueEx(key, value_name) # type: ignore # winreg returns tuple
-                return RegistryValue(value_name, value_data, value_type)
-            except OSError as e:
-                # Handle errors specifically from QueryValueEx
-                err_code = getattr(e, 'winerror', None)
-                if err_code == 2: # ERROR_FILE_NOT_FOUND
-                    # If QueryValueEx fails with ERROR_FILE_NOT_FOUND, it means the value doesn't exist.
-                    raise RegistryValueNotFoundError(f"Registry value '{value_name}' not found in key '{full_path}'.") from e
-                else:
-                    # Handle other QueryValueEx errors (e.g., permission denied on the value itself)
-                    _handle_winreg_error(e, full_path, value_name)
+        # Open the key with read access, passing the flag.
+        # _open_registry_key already translates OpenKey failures into RegistryError
+        # subclasses; RegistryPermissionError is also an OSError, so those are
+        # re-raised as-is below rather than being reported against the value.
+        key = key_handle if key_handle is not None else _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
+            value_data, value_type = _QueryValueEx(key, value_name) # type: ignore # winreg returns tuple
+            return RegistryValue(value_name, value_data, value_type)
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
+    except RegistryError:
+        # Already translated while opening the key
+        raise
     except OSError as e:
-        # Handle errors specifically from RegistryKey.__enter__ (OpenKey)
-        # This will catch RegistryKeyNotFoundError, RegistryPermissionError, etc.,
-        # when trying to open the key itself.
-        _handle_winreg_error(e, full_path) # No value_name here, as the key itself failed to open
+        if getattr(e, 'winerror', None) == 2: # ERROR_FILE_NOT_FOUND
+            # The key opened, so ERROR_FILE_NOT_FOUND here means the value doesn't exist.
+            raise RegistryValueNotFoundError(f"Registry value '{value_name}' not found in key '{full_path}'.") from e
+        # Handle other QueryValueEx errors (e.g., permission denied on the value itself)
+        _handle_winreg_error(e, full_path, value_name)
+
+
+def get_registry_values(
+        root_key: int,
+        key_path: str,
+        value_names: Iterable[str],
+        root_prefix: str = "",
+        access_32bit_view: bool = False,
+        key_handle: Optional[HANDLE] = None,
+    ) -> Dict[str, RegistryValue]:
+    """Retrieve several values from one registry key, opening the key only once.
+
+    Equivalent to calling get_registry_value for each name, but with a single
+    OpenKey/CloseKey pair instead of one per value. Names of values that do not
+    exist are left out of the result rather than raising RegistryValueNotFoundError.
+
+    Args:
+        root_key (int): Handle of the root registry hive.
+        key_path (str): Key path relative to root_prefix.
+        value_names (Iterable[str]): Names of the values to read ("" for default).
+        root_prefix (str): Base sub‐path under root_key (may be empty).
+        access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
+
+    Returns:
+        Dict[str, RegistryValue]: The values found, keyed by value name.
+
+    Raises:
+        RegistryKeyNotFoundError: If the key does not exist.
+        RegistryPermissionError: If read access is denied.
+        RegistryError: For other registry errors.
+    """
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
+    values = {}
+    value_name = None # Name of the value being read, for error messages
+
+    try:
+        key = key_handle if key_handle is not None else _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
+            for value_name in value_names:
+                try:
+                    value_data, value_type = _QueryValueEx(key, value_name) # type: ignore # winreg returns tuple
+                except OSError as e:
+                    if getattr(e, 'winerror', None) != 2: # ERROR_FILE_NOT_FOUND: value missing, skip it
+                        raise
+                    continue
+                values[value_name] = RegistryValue(value_name, value_data, value_type)
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
+    except OSError as e:
+        _handle_winreg_error(e, full_path, value_name)
+
+    return values
 
 
 def list_registry_values(
@@ -243,6 +414,7 @@ def list_registry_values(
         key_path: str,
         root_prefix: str = "",
         access_32bit_view: bool = False, # Add parameter
+        key_handle: Optional[HANDLE] = None,
     ) -> List[RegistryValue]:
     """List all values (including default) under a registry key.
 
@@ -251,6 +423,8 @@ def list_registry_values(
         key_path (str): Key path relative to root_prefix.
         root_prefix (str): Base sub‐path under root_key (may be empty).
         access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
 
     Returns:
         List[RegistryValue]: A list of RegistryValue objects.
@@ -260,27 +434,23 @@ def list_registry_values(
         RegistryPermissionError: If read access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
     values = []
     try:
-        # Pass the flag to RegistryKey
-        with RegistryKey(root_key, full_path, winreg.KEY_READ, access_32bit_view=access_32bit_view) as key:
+        key = key_handle if key_handle is not None else _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
             # Enumerate named values (this includes the default value if it exists)
-            i = 0
-            while True:
-                try:
-                    name, data, vtype = winreg.EnumValue(key, i)
-                    values.append(RegistryValue(name, data, vtype))
-                    i += 1
-                except OSError as e: # Changed from WindowsError
-                    # ERROR_NO_MORE_ITEMS (259) indicates the end of enumeration
-                    if getattr(e, 'winerror', None) == 259:
-                        break
-                    # Handle other OSErrors during enumeration
-                    _handle_winreg_error(e, full_path)
+            _, num_values, _ = _QueryInfoKey(key)
+            values = [
+                RegistryValue(name, data, vtype)
+                for name, data, vtype in _enumerate_registry_key(_EnumValue, key, num_values)
+            ]
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
 
     except OSError as e: # Changed from (OSError, WindowsError)
-        # OSError from RegistryKey if key cannot be opened
+        # OSError from the key query, or from the enumeration
         _handle_winreg_error(e, full_path)
 
     return values
@@ -291,6 +461,7 @@ def list_registry_subkeys(
         key_path: str,
         root_prefix: str = "",
         access_32bit_view: bool = False, # Add parameter
+        key_handle: Optional[HANDLE] = None,
     ) -> List[str]:
     """List the immediate subkey names under a registry key.
 
@@ -299,6 +470,8 @@ def list_registry_subkeys(
         key_path (str): Key path relative to root_prefix.
         root_prefix (str): Base sub‐path under root_key (may be empty).
         access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
 
     Returns:
         List[str]: The names of each subkey.
@@ -308,27 +481,30 @@ def list_registry_subkeys(
         RegistryPermissionError: If read access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
     subkeys = []
     try:
-        # Need KEY_ENUMERATE_SUB_KEYS access
-        # Pass the flag to RegistryKey
-        with RegistryKey(root_key, full_path, winreg.KEY_ENUMERATE_SUB_KEYS, access_32bit_view=access_32bit_view) as key:
-            i = 0
-            while True:
-                try:
-                    name = winreg.EnumKey(key, i)
-                    subkeys.append(name)
-                    i += 1
-                except OSError as e: # Changed from WindowsError
-                    # ERROR_NO_MORE_ITEMS (259) indicates the end of enumeration
-                    if getattr(e, 'winerror', None) == 259:
-                        break
-                    # Handle other OSErrors during enumeration
-                    _handle_winreg_error(e, full_path)
+        can_query = True
+        if key_handle is not None:
+            key = key_handle
+        else:
+            try:
+                # Need KEY_ENUMERATE_SUB_KEYS access, plus KEY_QUERY_VALUE for QueryInfoKey
+                key = _open_registry_key(root_key, full_path, winreg.KEY_ENUMERATE_SUB_KEYS | winreg.KEY_QUERY_VALUE, access_32bit_view)
+            except RegistryPermissionError:
+                # The key's ACL may allow enumeration but not query; enumerate without
+                # QueryInfoKey's count rather than refusing to list the key
+                key = _open_registry_key(root_key, full_path, winreg.KEY_ENUMERATE_SUB_KEYS, access_32bit_view)
+                can_query = False
+        try:
+            num_subkeys = _QueryInfoKey(key)[0] if can_query else None
+            subkeys = _enumerate_registry_key(_EnumKey, key, num_subkeys)
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
 
     except OSError as e: # Changed from (OSError, WindowsError)
-        # OSError from RegistryKey if key cannot be opened
+        # OSError from the key query, or from the enumeration
         _handle_winreg_error(e, full_path)
 
     return subkeys
@@ -339,7 +515,8 @@ def head_registry_key(
         key_path: str,
         root_prefix: str = "",
         access_32bit_view: bool = False, # Add parameter
-    ) -> Dict[str, Any]:
+        key_handle: Optional[HANDLE] = None,
+    ) -> RegistryKeyInfo:
     """Retrieve metadata (counts and last write time) for a registry key.
 
     Args:
@@ -347,9 +524,11 @@ def head_registry_key(
         key_path (str): Key path relative to root_prefix.
         root_prefix (str): Base sub‐path under root_key (may be empty).
         access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
 
     Returns:
-        Dict[str, Any]:
+        RegistryKeyInfo:
             num_subkeys (int): Number of immediate subkeys.
             num_values (int): Number of values.
             last_write_time (datetime): Last write time as UTC datetime.
@@ -359,30 +538,91 @@ def head_registry_key(
         RegistryPermissionError: If read access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
     try:
         # Need KEY_QUERY_VALUE and KEY_ENUMERATE_SUB_KEYS access for QueryInfoKey
         # KEY_READ includes these.
-        # Pass the flag to RegistryKey
-        with RegistryKey(root_key, full_path, winreg.KEY_READ, access_32bit_view=access_32bit_view) as key:
+        key = key_handle if key_handle is not None else _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
             # QueryInfoKey returns: num_subkeys, num_values, last_write_time (as an integer FILETIME)
-            num_subkeys, num_values, last_write_time_ft = winreg.QueryInfoKey(key)
+            num_subkeys, num_values, last_write_time_ft = _QueryInfoKey(key)
 
             # Convert FILETIME (100-nanosecond intervals since 1601-01-01 UTC) to datetime
             # winreg documentation states it returns an integer.
-            # Calculate seconds since Unix epoch (1970-01-01 UTC)
-            unix_timestamp = (last_write_time_ft - _EPOCH_AS_FILETIME) / _HUNDREDS_OF_NS_
-            # Create a timezone-aware UTC datetime object
-            last_write_time = datetime.fromtimestamp(unix_timestamp, tz=timezone.utc)
+            # Integer arithmetic keeps full microsecond precision (no float rounding),
+            # and adding to a UTC epoch avoids fromtimestamp's platform time conversion.
+            last_write_time = _FILETIME_EPOCH + timedelta(microseconds=last_write_time_ft // 10)
 
-            return {
-                "num_subkeys": num_subkeys,
-                "num_values": num_values,
-                "last_write_time": last_write_time, # Now correctly converted
-            }
+            return RegistryKeyInfo(num_subkeys, num_values, last_write_time)
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
 
     except OSError as e: # Changed from (OSError, WindowsError)
-        # OSError from RegistryKey if key cannot be opened
+        # OSError from the key query
+        _handle_winreg_error(e, full_path)
+
+
+def walk_registry_key(
+        root_key: int,
+        key_path: str,
+        root_prefix: str = "",
+        access_32bit_view: bool = False,
+        key_handle: Optional[HANDLE] = None,
+    ) -> RegistryKeyWalk:
+    """Read a registry key's subkeys, values and metadata through a single open handle.
+
+    Equivalent to calling list_registry_subkeys, list_registry_values and
+    head_registry_key for the same key, but opens the key and calls
+    QueryInfoKey once instead of three times, which matters when walking
+    large trees key by key.
+
+    Args:
+        root_key (int): Handle of the root registry hive.
+        key_path (str): Key path relative to root_prefix.
+        root_prefix (str): Base sub‐path under root_key (may be empty).
+        access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows. Defaults to False.
+        key_handle (Optional[HANDLE]): An already-open handle to the key (opened with KEY_READ) to
+            use instead of opening it. The caller keeps ownership; it is not closed here.
+
+    Returns:
+        RegistryKeyWalk:
+            subkeys (List[str]): The names of each immediate subkey.
+            values (List[RegistryValue]): All values (including default).
+            num_subkeys (int): Number of immediate subkeys.
+            num_values (int): Number of values.
+            last_write_time (datetime): Last write time as UTC datetime.
+
+    Raises:
+        RegistryKeyNotFoundError: If the key does not exist.
+        RegistryPermissionError: If read access is denied.
+        RegistryError: For other registry errors.
+    """
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
+    try:
+        # KEY_READ covers QueryInfoKey, EnumKey and EnumValue on the same handle
+        key = key_handle if key_handle is not None else _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
+            num_subkeys, num_values, last_write_time_ft = _QueryInfoKey(key)
+            subkeys = _enumerate_registry_key(_EnumKey, key, num_subkeys)
+            values = [
+                RegistryValue(name, data, vtype)
+                for name, data, vtype in _enumerate_registry_key(_EnumValue, key, num_values)
+            ]
+
+            return RegistryKeyWalk(
+                subkeys,
+                values,
+                num_subkeys,
+                num_values,
+                _FILETIME_EPOCH + timedelta(microseconds=last_write_time_ft // 10),
+            )
+        finally:
+            if key_handle is None:
+                _CloseKey(key)
+
+    except OSError as e:
+        # OSError from the key query, or from the enumeration
         _handle_winreg_error(e, full_path)
 
 
@@ -407,13 +647,13 @@ def delete_registry_value(
         RegistryPermissionError: If delete access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
     try:
         # Open the key with KEY_SET_VALUE access (needed for DeleteValue)
-        # Pass the flag to RegistryKey
-        with RegistryKey(root_key, full_path, winreg.KEY_SET_VALUE, access_32bit_view=access_32bit_view) as key:
+        key = _open_registry_key(root_key, full_path, winreg.KEY_SET_VALUE, access_32bit_view)
+        try:
             try:
-                winreg.DeleteValue(key, value_name)
+                _DeleteValue(key, value_name)
             except OSError as e: # Changed from WindowsError, catch OSError
                 # ERROR_FILE_NOT_FOUND (2) means the value doesn't exist. This is allowed (idempotent).
                 # Use getattr for safe access to winerror
@@ -422,10 +662,12 @@ def delete_registry_value(
                 else:
                     # Handle other OSErrors during deletion
                     _handle_winreg_error(e, full_path, value_name)
+        finally:
+            _CloseKey(key)
 
     except OSError as e: # Changed from (OSError, WindowsError)
-        # OSError from RegistryKey if key cannot be opened (e.g., key_path not found)
-        # This will correctly raise RegistryKeyNotFoundError via _handle_winreg_error
+        # Any remaining OSError (e.g., from closing the handle) is translated here;
+        # a missing key_path was already raised as RegistryKeyNotFoundError on open
         _handle_winreg_error(e, full_path)
 
 
@@ -450,7 +692,7 @@ def delete_registry_key(
         RegistryPermissionError: If delete access is denied.
         RegistryError: For other registry errors.
     """
-    full_path = _join_registry_paths(root_prefix, key_path)
+    full_path = _join_registry_paths(root_prefix, key_path) if root_prefix else key_path
 
     if not full_path:
         raise ValueError("Cannot delete the root registry key.")
@@ -458,21 +700,23 @@ def delete_registry_key(
     # 1. Check if the key exists and is empty (no subkeys, no values)
     try:
         # Open the key to be deleted with read access to query info
-        # Use the context manager for safe handle handling
-        # Pass the flag to RegistryKey
-        with RegistryKey(root_key, full_path, winreg.KEY_READ, access_32bit_view=access_32bit_view) as key_to_delete_handle:
+        # The handle is closed in the finally block
+        key_to_delete_handle = _open_registry_key(root_key, full_path, winreg.KEY_READ, access_32bit_view)
+        try:
             # QueryInfoKey returns: num_subkeys, num_values, last_modified_time
-            num_subkeys, num_values, _ = winreg.QueryInfoKey(key_to_delete_handle)
+            num_subkeys, num_values, _ = _QueryInfoKey(key_to_delete_handle)
 
 
             if num_subkeys > 0 or num_values > 0:
                 # Raise the specific error if not empty
                 raise RegistryKeyNotEmptyError(f"Registry key '{full_path}' is not empty (contains {num_subkeys} subkeys and {num_values} values). Cannot delete non-empty keys.")
+        finally:
+            _CloseKey(key_to_delete_handle)
 
         # If we reach here, the key exists and is empty. Proceed to delete.
 
     except OSError as e:
-        # Catch errors from the RegistryKey context manager (OpenKey failures)
+        # Catch errors from the key query (OpenKey failures are already translated)
         # _handle_winreg_error will raise the appropriate custom exception
         _handle_winreg_error(e, full_path)
         # The function exits here if an error occurred during the check.
@@ -480,23 +724,27 @@ def delete_registry_key(
 
 
     # 2. If the key is empty, delete it using DeleteKey on the parent
-    # Split the full path to get the parent path and the name of the key to delete
-    parent_full_path, subkey_name = os.path.split(full_path)
+    # Split the full path to get the parent path and the name of the key to delete.
+    # Registry paths always use backslashes, so a single rpartition is enough
+    # (the parent is "" for a key directly under the root).
+    parent_full_path, _sep, subkey_name = full_path.rpartition('\\')
 
     try:
         # Open the parent key with KEY_CREATE_SUB_KEY access (needed for DeleteKey)
-        # Use the context manager for safe handle handling
-        # Pass the flag to RegistryKey when opening the PARENT
-        with RegistryKey(root_key, parent_full_path, winreg.KEY_CREATE_SUB_KEY, access_32bit_view=access_32bit_view) as parent_key_handle:
+        # The handle is closed in the finally block
+        parent_key_handle = _open_registry_key(root_key, parent_full_path, winreg.KEY_CREATE_SUB_KEY, access_32bit_view)
+        try:
             try:
                 # DeleteKey itself doesn't take the WOW64 flag directly; it's the parent handle's view that matters.
-                winreg.DeleteKey(parent_key_handle, subkey_name)
+                _DeleteKey(parent_key_handle, subkey_name)
             except OSError as e: # Changed from WindowsError
                 # Handle potential OSErrors during the actual deletion
                 # ERROR_FILE_NOT_FOUND (2) might occur if the key was deleted between check and delete (race condition)
                 # ERROR_ACCESS_DENIED (5) if permission is denied for deletion (different from read permission check)
                 # ERROR_DIR_NOT_EMPTY (247) should not happen due to the check, but handle defensively
                 _handle_winreg_error(e, full_path) # Pass the full path for the error message
+        finally:
+            _CloseKey(parent_key_handle)
 
     except OSError as e:
         # Catch errors opening the parent key (less likely if child existed, but possible)
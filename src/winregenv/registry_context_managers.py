@@ -11,6 +11,12 @@ from .registry_errors import RegistryValueNotFoundError, \
 
 logger = logging.getLogger(__name__)
 
+# Bind the winreg functions and flag once at import time so each key open/close
+# skips the module attribute lookup.
+_OpenKey = winreg.OpenKey
+_CloseKey = winreg.CloseKey
+_KEY_WOW64_32KEY = winreg.KEY_WOW64_32KEY
+
 class RegistryKey:
     """Context manager for Windows registry key handles.
 
@@ -24,11 +30,15 @@ class RegistryKey:
         _access_32bit_view (bool): Whether to access the 32-bit registry view on 64-bit Windows.
         _key_handle (Optional[HANDLE]): The open key handle.
     """
+    __slots__ = ('_root_key', '_subkey', '_access', '_access_32bit_view', '_effective_access', '_key_handle')
+
     def __init__(self, root_key: int, subkey: str, access: int, access_32bit_view: bool = False):
         self._root_key = root_key
         self._subkey = subkey
         self._access = access
         self._access_32bit_view = access_32bit_view # Store the flag
+        # Combine base access with WOW64 flag once, rather than on every __enter__
+        self._effective_access = access | _KEY_WOW64_32KEY if access_32bit_view else access
         self._key_handle: Optional[HANDLE] = None # Use HANDLE for the handle type
 
     def __enter__(self) -> HANDLE: # Use HANDLE for the return type hint
@@ -41,19 +51,14 @@ class RegistryKey:
             RegistryError or subclass: If the key cannot be opened.
         """
         try:
-            # Combine base access with WOW64 flag if requested
-            effective_access = self._access
-            if self._access_32bit_view:
-                effective_access |= winreg.KEY_WOW64_32KEY
-
             # winreg.OpenKey requires the root key handle, subkey string,
             # reserved (must be 0), and access rights.
             # winreg.OpenKey returns an HKEY object, which is compatible with HANDLE
-            self._key_handle = winreg.OpenKey(
+            self._key_handle = _OpenKey(
                 self._root_key,
                 self._subkey,
                 0, # Reserved, must be zero
-                effective_access # Use the potentially modified access mask
+                self._effective_access # Access mask including the WOW64 flag if requested
             )
             return self._key_handle
         except OSError as e: # Changed from WindowsError
@@ -69,7 +74,7 @@ class RegistryKey:
         """Close the registry key handle on context exit."""
         if self._key_handle:
             try:
-                winreg.CloseKey(self._key_handle)
+                _CloseKey(self._key_handle)
             except OSError as e:  # Changed from WindowsError
                 # DEBUG: report any problem closing the handle
                 logger.debug(
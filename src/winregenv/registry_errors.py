@@ -48,6 +48,20 @@ _ERROR_MAP = {
 }
 
 
+def _map_err(err_code: Optional[int]) -> type:
+    """Return the exception type for a winerror code.
+
+    The two codes seen in practice (not found, access denied) are checked
+    directly; everything else falls through to _ERROR_MAP, which stays the
+    single source of truth for the mapping.
+    """
+    if err_code == 2:
+        return RegistryKeyNotFoundError
+    if err_code == 5:
+        return RegistryPermissionError
+    return _ERROR_MAP.get(err_code, RegistryError)
+
+
 def _handle_winreg_error(e: OSError, path: str, name: Optional[str] = None):
     """Translate a Windows OSError into a custom RegistryError.
 
@@ -62,43 +76,47 @@ def _handle_winreg_error(e: OSError, path: str, name: Optional[str] = None):
     # On Windows, OSErrors originating from winreg calls are WindowsErrors,
     # which have the winerror attribute.
     err_code = getattr(e, 'winerror', None) # Safely get winerror, default to None
+
+    # If the caught exception is already a specific RegistryError subclass,
+    # re-raise it directly instead of wrapping it in a potentially less specific one.
+    # RegistryPermissionError is also a PermissionError (an OSError), so an
+    # exception already translated upstream (e.g. by _open_registry_key) can be
+    # caught by a caller's `except OSError` and passed back in here.
+    if isinstance(e, RegistryError):
+         # Preserve winerror if it wasn't set yet
+         if e.winerror is None and err_code is not None:
+             e.winerror = err_code
+         # Re-raise the existing RegistryError without wrapping it again
+         raise e
     # Use the mapped exception type, default to RegistryError
-    custom_exception_type = _ERROR_MAP.get(err_code, RegistryError)
+    custom_exception_type = _map_err(err_code)
 
-    message = f"Registry operation failed on key '{path}'"
-    if name is not None:
-        message += f", value '{name}'"
+    value_part = f", value '{name}'" if name is not None else ""
     # Include winerror and strerror in the message for quick debugging
     if err_code is not None:
-         message += f" (WinError {err_code}: {e.strerror})"
+         detail = f" (WinError {err_code}: {e.strerror})"
     elif e.strerror:
-         message += f" ({e.strerror})"
+         detail = f" ({e.strerror})"
+    else:
+         detail = ""
+    # Build the message in one formatting step rather than by repeated concatenation
+    message = f"Registry operation failed on key '{path}'{value_part}{detail}"
 
     if custom_exception_type is RegistryKeyNotEmptyError:
          # Check if the path is already in the message to avoid duplication
          if path not in message:
              message = f"Registry key '{path}' is not empty. " + message
 
-    # If the caught exception is already a specific RegistryError subclass,
-    # re-raise it directly instead of wrapping it in a potentially less specific one.
-    # This handles cases where _handle_winreg_error is called with an exception
-    # that was already translated upstream (e.g., from RegistryKey.__enter__).
-    if isinstance(e, RegistryError):
-         # Preserve winerror if it wasn’t set yet
-         if e.winerror is None and err_code is not None:
-             e.winerror = err_code
-         # Re‑raise the existing RegistryError without wrapping it again
-         raise
-
     # DEBUG: log how we're mapping the WinError to a custom exception
-    logger.debug(
-        "Mapping WinError %s (%r) for key '%s'%s → %s",
-        err_code,
-        e.strerror,
-        path,
-        (f", value '{name}'" if name else ""),
-        custom_exception_type.__name__
-    )
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Mapping WinError %s (%r) for key '%s'%s → %s",
+            err_code,
+            e.strerror,
+            path,
+            value_part,
+            custom_exception_type.__name__
+        )
     raise custom_exception_type(message, winerror=err_code, strerror=e.strerror) from e
 
 class RegistryExpansionError(RegistryError):
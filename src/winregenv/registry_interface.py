@@ -11,23 +11,28 @@ its methods (e.g., `get_value`, `put_subkey`, `delete_key`) to interact with
 keys and values relative to the configured root, prefix, and view.
 """ # noqa: E501
 import winreg
-import inspect
-from typing import Any, List, Tuple, Dict, Optional, Union
+import threading
+from collections import OrderedDict, deque
+from typing import Any, List, Tuple, Dict, Iterable, Iterator, Optional, Union
 import logging
 from .registry_base import (
     put_registry_value,
+    put_registry_values,
     put_registry_subkey,
     get_registry_value,
+    get_registry_values,
     list_registry_values,
     list_registry_subkeys,
     head_registry_key,
+    walk_registry_key,
     delete_registry_value,
     delete_registry_key,
+    _join_registry_paths,
+    _open_registry_key,
 )
 from .registry_errors import RegistryError, RegistryKeyNotFoundError, RegistryValueNotFoundError, \
     RegistryKeyNotEmptyError, RegistryPermissionError
-from .elevation_check import is_elevated
-from .registry_types import RegistryValue # Import RegistryValue
+from .registry_types import RegistryValue, RegistryKeyInfo, RegistryKeyWalk # Import RegistryValue
 
 # --- Import functions and constants from registry_translation ---
 from .registry_translation import (
@@ -41,6 +46,12 @@ from .registry_translation import (
 logger = logging.getLogger(__name__)
 
 
+def is_elevated() -> bool:
+    """Checks process elevation, importing elevation_check (and its ctypes bindings) on first use."""
+    from .elevation_check import is_elevated as _is_elevated
+    return _is_elevated()
+
+
 # Define the root key names corresponding to the integer values for error messages
 # This is a partial map used for specific error messages related to elevation
 _ELEVATION_REQUIRED_ROOT_KEY_NAMES = {
@@ -51,45 +62,42 @@ _ELEVATION_REQUIRED_ROOT_KEY_NAMES = {
     # winreg.HKEY_CLASSES_ROOT: "HKCR",
     winreg.HKEY_CURRENT_CONFIG: "HKEY_CURRENT_CONFIG",
 }
-def _create_root_key_mapping():
-    """
-    Dynamically create a mapping of root key names to their values. Used so users can specify the base key by name in
-    addition to int
-    """
-    mapping = {}
-
-    # Get all constants from winreg
-    for name, value in inspect.getmembers(winreg):
-        # Looking for HKEY constants
-        if name.startswith('HKEY_') and isinstance(value, int):
-            mapping[name] = value
-
-            # Add abbreviation if it's one of the common ones
-            if name == 'HKEY_CLASSES_ROOT':
-                mapping['HKCR'] = value
-            elif name == 'HKEY_CURRENT_USER':
-                mapping['HKCU'] = value
-            elif name == 'HKEY_LOCAL_MACHINE':
-                mapping['HKLM'] = value
-            elif name == 'HKEY_USERS':
-                mapping['HKU'] = value
-
-    return mapping
-
+# Mapping of root key names to their values, so users can specify the base key by name
+# in addition to int. The HKEY_* handles are fixed Windows values, so a static table is
+# used instead of scanning the winreg module at import time.
+ROOT_KEY_MAPPING = {
+    'HKEY_CLASSES_ROOT': winreg.HKEY_CLASSES_ROOT,
+    'HKCR': winreg.HKEY_CLASSES_ROOT,
+    'HKEY_CURRENT_CONFIG': winreg.HKEY_CURRENT_CONFIG,
+    'HKEY_CURRENT_USER': winreg.HKEY_CURRENT_USER,
+    'HKCU': winreg.HKEY_CURRENT_USER,
+    'HKEY_DYN_DATA': winreg.HKEY_DYN_DATA,
+    'HKEY_LOCAL_MACHINE': winreg.HKEY_LOCAL_MACHINE,
+    'HKLM': winreg.HKEY_LOCAL_MACHINE,
+    'HKEY_PERFORMANCE_DATA': winreg.HKEY_PERFORMANCE_DATA,
+    'HKEY_USERS': winreg.HKEY_USERS,
+    'HKU': winreg.HKEY_USERS,
+}
 
-# Then use this in the get_root_key function
-ROOT_KEY_MAPPING = _create_root_key_mapping()
+# Lookup table for normalize_root_key: the canonical upper-case names plus their
+# lower-case spellings, so the usual inputs ("HKLM", "hklm") resolve without .upper()
+_ROOT_KEY_LOOKUP = {
+    spelling: value
+    for name, value in ROOT_KEY_MAPPING.items()
+    for spelling in (name, name.lower())
+}
 
-# Create a reverse mapping from integer value to string name for the root_key_name property
-# Prioritize abbreviations for common keys where available
+# Reverse mapping from integer value to string name for the root_key_name property
+# Abbreviations are used for the common keys where available
 _ROOT_KEY_INT_TO_NAME = {
-    value: name for name, value in ROOT_KEY_MAPPING.items()
+    winreg.HKEY_CLASSES_ROOT: "HKCR",
+    winreg.HKEY_CURRENT_CONFIG: "HKEY_CURRENT_CONFIG",
+    winreg.HKEY_CURRENT_USER: "HKCU",
+    winreg.HKEY_DYN_DATA: "HKEY_DYN_DATA",
+    winreg.HKEY_LOCAL_MACHINE: "HKLM",
+    winreg.HKEY_PERFORMANCE_DATA: "HKEY_PERFORMANCE_DATA",
+    winreg.HKEY_USERS: "HKU",
 }
-# Overwrite with abbreviations for common keys for the property display
-_ROOT_KEY_INT_TO_NAME[winreg.HKEY_CLASSES_ROOT] = "HKCR"
-_ROOT_KEY_INT_TO_NAME[winreg.HKEY_CURRENT_USER] = "HKCU"
-_ROOT_KEY_INT_TO_NAME[winreg.HKEY_LOCAL_MACHINE] = "HKLM"
-_ROOT_KEY_INT_TO_NAME[winreg.HKEY_USERS] = "HKU"
 
 
 def normalize_root_key(key_identifier : Union[int, str]) -> int:
@@ -97,16 +105,22 @@ def normalize_root_key(key_identifier : Union[int, str]) -> int:
     Helper function to get the root key value from a string or int.
     Allows users to specify the base key by name in addition to int.
     """
-    if isinstance(key_identifier, int):
+    # Exact type checks first: plain ints (the winreg.HKEY_* constants) are the common case
+    key_type = type(key_identifier)
+    if key_type is int:
         return key_identifier
-    elif isinstance(key_identifier, str):
-        key_upper = key_identifier.upper()
-        if key_upper in ROOT_KEY_MAPPING:
-            return ROOT_KEY_MAPPING[key_upper]
-        else:
-            raise ValueError(f"Unknown root key: {key_identifier}. Valid keys are: {', '.join(ROOT_KEY_MAPPING.keys())}")
-    else:
-        raise TypeError("Root key must be an integer or string")
+    if key_type is str or isinstance(key_identifier, str):
+        root_key = _ROOT_KEY_LOOKUP.get(key_identifier)
+        if root_key is None:
+            # Mixed-case spellings still work, at the cost of an upper-cased copy
+            root_key = ROOT_KEY_MAPPING.get(key_identifier.upper())
+        if root_key is not None:
+            return root_key
+        raise ValueError(f"Unknown root key: {key_identifier}. Valid keys are: {', '.join(ROOT_KEY_MAPPING.keys())}")
+    # int subclasses (e.g. IntEnum) are still accepted, but bool is not a root key
+    if isinstance(key_identifier, int) and key_type is not bool:
+        return int(key_identifier)
+    raise TypeError("Root key must be an integer or string")
 # Add HKEY_CLASSES_ROOT and HKEY_CURRENT_CONFIG to the set of keys that typically require elevation
 _ELEVATION_REQUIRED_ROOT_KEYS = {
     winreg.HKEY_LOCAL_MACHINE,
@@ -115,6 +129,29 @@ _ELEVATION_REQUIRED_ROOT_KEYS = {
     winreg.HKEY_CURRENT_CONFIG,
 }
 
+# Maximum number of open key handles a RegistryRoot keeps when cache_handles=True
+_HANDLE_CACHE_SIZE = 64
+
+
+def _allow_write() -> None:
+    """Write check for RegistryRoot instances on which writes are known to be permitted."""
+
+
+class _CachedHandle:
+    """An open KEY_READ handle in a RegistryRoot handle cache.
+
+    refs counts the reads currently using the handle. Once the entry leaves the
+    cache (evicted, discarded or flushed by close()), the handle is closed by
+    whoever drops the last reference, so eviction never closes a handle that
+    another thread is still reading through.
+    """
+    __slots__ = ("handle", "refs", "cached")
+
+    def __init__(self, handle: Any):
+        self.handle = handle
+        self.refs = 0
+        self.cached = True
+
 
 class RegistryRoot:
     def __init__(
@@ -124,6 +161,7 @@ class RegistryRoot:
         access_32bit_view: bool = False,
         read_only: bool = False,
         ignore_elevation_check: bool = False,
+        cache_handles: bool = False,
     ):
         """Initializes a RegistryRoot instance.
 
@@ -134,6 +172,10 @@ class RegistryRoot:
                                          will be relative to this prefix. Defaults to None (no prefix).
             access_32bit_view (bool): If True, access the 32-bit registry view on 64-bit Windows.
                                       Defaults to False (accesses the native view).
+            cache_handles (bool): If True, keep read handles open for up to _HANDLE_CACHE_SIZE recently
+                                  read keys and reuse them for get/list/head/walk calls, instead of
+                                  opening and closing the key each time. Call close() (or use the
+                                  instance as a context manager) to release them. Defaults to False.
         """
         self.root_key: int = normalize_root_key(root_key)
 
@@ -144,10 +186,163 @@ class RegistryRoot:
 
         # Cache for elevation status:
         # None: Not yet checked for this instance.
-        # True: Checked and process is elevated OR ignore_elevation_check is True.
+        # True: Checked and process is elevated, ignore_elevation_check is True, or the
+        #       instance is read-only (writes are refused before elevation matters).
         # False: Checked and process is NOT elevated.
-        # Initialize to True if ignoring the check, otherwise None.
-        self._is_elevated_cached: Optional[bool] = True if ignore_elevation_check else None
+        # Initialize to True if the check can never be needed, otherwise None.
+        self._is_elevated_cached: Optional[bool] = True if (ignore_elevation_check or read_only) else None
+
+        # Whether writes need the elevation check at all, decided once here instead of
+        # testing root-key membership on every write/delete.
+        self._requires_elevation: bool = (
+            not ignore_elevation_check and self.root_key in _ELEVATION_REQUIRED_ROOT_KEYS
+        )
+
+        # Writable instances that don't need the elevation check (e.g. HKCU) always pass
+        # the write check, so bind the no-op directly; otherwise the full check runs
+        # until it has passed once (see _check_write_permission).
+        if not read_only and not self._requires_elevation:
+            self._check_write_permission = _allow_write
+
+        # Open KEY_READ handles keyed by full key path (root key and view are fixed per
+        # instance), least recently used first. None when handle caching is disabled.
+        # The lock only guards the cache bookkeeping, not the reads themselves.
+        self._handle_cache: Optional["OrderedDict[str, _CachedHandle]"] = OrderedDict() if cache_handles else None
+        self._handle_cache_lock = threading.Lock()
+
+    def __enter__(self) -> "RegistryRoot":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close any registry key handles cached by this instance (see cache_handles).
+
+        Handles still in use by a concurrent read are closed when that read finishes.
+        """
+        if self._handle_cache is None:
+            return
+        with self._handle_cache_lock:
+            unused = [self._uncache_entry(entry) for entry in self._handle_cache.values()]
+            self._handle_cache.clear()
+        for handle in unused:
+            if handle is not None:
+                self._close_cached_handle(handle)
+
+    @staticmethod
+    def _close_cached_handle(handle: Any) -> None:
+        try:
+            winreg.CloseKey(handle)
+        except OSError as e:
+            logger.debug("Failed to close cached registry key handle: %s", e)
+
+    @staticmethod
+    def _uncache_entry(entry: _CachedHandle) -> Any:
+        """Mark an entry removed from the cache; return its handle if nothing is using it.
+
+        Must be called with the cache lock held. The caller closes the returned handle.
+        """
+        entry.cached = False
+        return entry.handle if entry.refs == 0 else None
+
+    def _acquire_cached_handle(self, full_path: str) -> Tuple[_CachedHandle, bool]:
+        """Take a reference to the cached handle for full_path, opening the key if needed.
+
+        Returns:
+            Tuple[_CachedHandle, bool]: The entry, and whether this call opened the key.
+        """
+        cache = self._handle_cache
+        with self._handle_cache_lock:
+            entry = cache.get(full_path)
+            if entry is not None:
+                cache.move_to_end(full_path)
+                entry.refs += 1
+                return entry, False
+
+        # Open outside the lock so reads of other keys are not held up
+        handle = _open_registry_key(self.root_key, full_path, winreg.KEY_READ, self._access_32bit_view)
+        to_close = None
+        with self._handle_cache_lock:
+            entry = cache.get(full_path)
+            opened = entry is None
+            if opened:
+                entry = cache[full_path] = _CachedHandle(handle)
+                if len(cache) > _HANDLE_CACHE_SIZE:
+                    _, evicted = cache.popitem(last=False)
+                    to_close = self._uncache_entry(evicted)
+            else:
+                # Another thread opened the key meanwhile; use its handle instead
+                cache.move_to_end(full_path)
+                to_close = handle
+            entry.refs += 1
+        if to_close is not None:
+            self._close_cached_handle(to_close)
+        return entry, opened
+
+    def _release_cached_handle(self, full_path: str, entry: _CachedHandle, discard: bool = False) -> None:
+        """Drop a reference taken by _acquire_cached_handle, removing the entry from the cache if discard."""
+        with self._handle_cache_lock:
+            entry.refs -= 1
+            if discard and entry.cached:
+                del self._handle_cache[full_path]
+                entry.cached = False
+            to_close = entry.handle if not entry.cached and entry.refs == 0 else None
+        if to_close is not None:
+            self._close_cached_handle(to_close)
+
+    def _cached_read(self, read_func, key_path: str, **kwargs):
+        """Run a registry_base read function on a cached KEY_READ handle for key_path.
+
+        If a read through a handle taken from the cache fails, the handle may have
+        gone stale (e.g. the key was deleted and recreated by another process), so
+        the key is reopened and the read retried once.
+        """
+        full_path = _join_registry_paths(self.root_prefix, key_path) if self.root_prefix else key_path
+        entry, opened = self._acquire_cached_handle(full_path)
+        try:
+            return self._read_with_cached_handle(read_func, full_path, entry, key_path, kwargs)
+        except RegistryValueNotFoundError:
+            raise
+        except RegistryError as e:
+            if opened:
+                raise
+            logger.debug("Read on cached handle for '%s' failed (%s); reopening the key.", full_path, e)
+        entry, _ = self._acquire_cached_handle(full_path)
+        return self._read_with_cached_handle(read_func, full_path, entry, key_path, kwargs)
+
+    def _read_with_cached_handle(self, read_func, full_path: str, entry: _CachedHandle, key_path: str, kwargs: Dict[str, Any]):
+        """Call read_func on an acquired entry's handle and release it, discarding the entry if the read fails."""
+        discard = False
+        try:
+            return read_func(
+                root_key=self.root_key,
+                key_path=key_path,
+                root_prefix=self.root_prefix,
+                access_32bit_view=self._access_32bit_view,
+                key_handle=entry.handle,
+                **kwargs,
+            )
+        except RegistryValueNotFoundError:
+            # A missing value says nothing about the handle itself
+            raise
+        except RegistryError:
+            # The handle may have gone stale; drop it so the key is reopened
+            discard = True
+            raise
+        finally:
+            self._release_cached_handle(full_path, entry, discard)
+
+    def _discard_cached_handle(self, key_path: str) -> None:
+        """Close and forget the cached handle for key_path, if any."""
+        if self._handle_cache is None:
+            return
+        full_path = _join_registry_paths(self.root_prefix, key_path) if self.root_prefix else key_path
+        with self._handle_cache_lock:
+            entry = self._handle_cache.pop(full_path, None)
+            handle = self._uncache_entry(entry) if entry is not None else None
+        if handle is not None:
+            self._close_cached_handle(handle)
 
     @property
     def root_key_name(self) -> str:
@@ -166,24 +361,28 @@ class RegistryRoot:
             raise RegistryPermissionError("Cannot perform write/delete operation in read-only mode.")
 
         # Check if the root key typically requires elevation for write operations
-        if self.root_key in _ELEVATION_REQUIRED_ROOT_KEYS:
+        # (always False when ignore_elevation_check was True)
+        if self._requires_elevation:
+            # Name used in either error message below
+            root_key_name = _ELEVATION_REQUIRED_ROOT_KEY_NAMES.get(self.root_key, str(self.root_key))
             # Check if elevation status for this instance is already determined
-            # This check is skipped if ignore_elevation_check was True (handled by _is_elevated_cached initial value).
             if self._is_elevated_cached is None:
                 # Determine and cache the elevation status the first time it's needed
                 try:
                     self._is_elevated_cached = is_elevated()
                 except OSError as e:
                     # Handle potential failure of is_elevated() itself.
-                    root_key_name = _ELEVATION_REQUIRED_ROOT_KEY_NAMES.get(self.root_key, str(self.root_key))
                     # Wrap the OSError in a RegistryPermissionError for consistency
                     raise RegistryPermissionError(f"Failed to determine process elevation status required for write/delete operations on root key '{root_key_name}' ({self.root_key}). Underlying check failed: {e}") from e # Chain the exception
 
             # If the process is not elevated (and we are not ignoring the check)
             if not self._is_elevated_cached:
-                root_key_name = _ELEVATION_REQUIRED_ROOT_KEY_NAMES.get(self.root_key, str(self.root_key))
                 raise RegistryPermissionError(f"Write/delete operation on root key '{root_key_name}' ({self.root_key}) typically requires elevated (administrator) privileges, but the current process is not elevated.")
 
+        # Every check passed and none of them can change for this instance any more,
+        # so later writes skip straight past the check.
+        self._check_write_permission = _allow_write
+
     def put_registry_value(
         self,
         key_path:str,
@@ -229,6 +428,53 @@ class RegistryRoot:
             access_32bit_view = self._access_32bit_view,
             )
 
+    def put_registry_values(
+        self,
+        key_path: str,
+        values: Dict[str, Any],
+        *,
+        value_types: Optional[Dict[str, Union[int, str]]] = None,
+    ) -> None:
+        """
+        Create or update several values under one key below the root key and prefix,
+        opening the key once and creating its key path if necessary.
+
+        Args:
+            key_path (str): Subkey path relative to the root prefix.
+            values (Dict[str, Any]): Maps each value name ("" for default) to the data to store.
+            value_types (Optional[Dict[str, int | str]]): Registry data types for some or all of the
+                                                          values (e.g., {"Path": "REG_EXPAND_SZ"}).
+                                                          Types of values not listed are inferred
+                                                          from their data.
+
+        Raises:
+            TypeError: If a value's data is incompatible with the specified or inferred type.
+            RegistryPermissionError: If setting a value is denied.
+            RegistryError: For other registry errors.
+        """
+        self._check_write_permission()
+
+        if value_types is None:
+            value_types = {}
+
+        # Validate/convert everything up front so a bad value fails before anything is written
+        typed_values = {}
+        for value_name, value_data in values.items():
+            value_type = value_types.get(value_name)
+            if value_type is None:
+                typed_values[value_name] = _infer_registry_type_for_new_value(value_data)
+            else:
+                value_type_int = _normalize_registry_type_input(value_type)
+                typed_values[value_name] = (_validate_and_convert_data_for_type(value_data, value_type_int), value_type_int)
+
+        return put_registry_values(
+            root_key = self.root_key,
+            key_path = key_path,
+            values = typed_values,
+            root_prefix = self.root_prefix,
+            access_32bit_view = self._access_32bit_view,
+            )
+
     def put_registry_subkey(
         self,
         key_path: str,
@@ -275,6 +521,8 @@ class RegistryRoot:
             RegistryPermissionError: If read access is denied.
             RegistryError: For other registry errors.
         """
+        if self._handle_cache is not None:
+            return self._cached_read(get_registry_value, key_path, value_name=value_name)
         return get_registry_value(
             root_key=self.root_key,
             key_path=key_path,
@@ -283,6 +531,35 @@ class RegistryRoot:
             access_32bit_view=self._access_32bit_view,
         )
 
+    def get_registry_values(
+        self, key_path: str,
+        value_names: Iterable[str],
+    ) -> Dict[str, RegistryValue]:
+        """
+        Retrieve several values from one registry key under the root key and prefix, opening the key once.
+
+        Args:
+            key_path (str): Key path relative to the root prefix.
+            value_names (Iterable[str]): Names of the values to read ("" for default).
+
+        Returns:
+            Dict[str, RegistryValue]: The values found, keyed by value name. Missing values are left out.
+
+        Raises:
+            RegistryKeyNotFoundError: If the key does not exist.
+            RegistryPermissionError: If read access is denied.
+            RegistryError: For other registry errors.
+        """
+        if self._handle_cache is not None:
+            return self._cached_read(get_registry_values, key_path, value_names=value_names)
+        return get_registry_values(
+            root_key=self.root_key,
+            key_path=key_path,
+            value_names=value_names,
+            root_prefix=self.root_prefix,
+            access_32bit_view=self._access_32bit_view,
+        )
+
     def list_registry_values(
         self, key_path: str,
     ) -> List[RegistryValue]:
@@ -300,6 +577,8 @@ class RegistryRoot:
             RegistryPermissionError: If read access is denied.
             RegistryError: For other registry errors.
         """
+        if self._handle_cache is not None:
+            return self._cached_read(list_registry_values, key_path)
         return list_registry_values(
             root_key=self.root_key,
             key_path=key_path,
@@ -324,6 +603,8 @@ class RegistryRoot:
             RegistryPermissionError: If read access is denied.
             RegistryError: For other registry errors.
         """
+        if self._handle_cache is not None:
+            return self._cached_read(list_registry_subkeys, key_path)
         return list_registry_subkeys(
             root_key=self.root_key,
             key_path=key_path,
@@ -333,7 +614,7 @@ class RegistryRoot:
 
     def head_registry_key(
         self, key_path: str,
-    ) -> Dict[str, Any]:
+    ) -> RegistryKeyInfo:
         """
         Retrieve metadata (counts and last write time) for a registry key relative to the root key and prefix.
 
@@ -341,7 +622,7 @@ class RegistryRoot:
             key_path (str): Key path relative to the root prefix.
 
         Returns:
-            Dict[str, Any]:
+            RegistryKeyInfo:
                 num_subkeys (int): Number of immediate subkeys.
                 num_values (int): Number of values.
                 last_write_time (datetime): Last write time as UTC datetime.
@@ -351,6 +632,8 @@ class RegistryRoot:
             RegistryPermissionError: If read access is denied.
             RegistryError: For other registry errors.
         """
+        if self._handle_cache is not None:
+            return self._cached_read(head_registry_key, key_path)
         return head_registry_key(
             root_key=self.root_key,
             key_path=key_path,
@@ -358,6 +641,93 @@ class RegistryRoot:
             access_32bit_view=self._access_32bit_view,
         )
 
+    def walk_registry_key(
+        self, key_path: str,
+    ) -> RegistryKeyWalk:
+        """
+        Retrieve the subkeys, values and metadata of a registry key relative to the root key and prefix in one pass.
+
+        Args:
+            key_path (str): Key path relative to the root prefix.
+
+        Returns:
+            RegistryKeyWalk:
+                subkeys (List[str]): The names of each immediate subkey.
+                values (List[RegistryValue]): All values (including default).
+                num_subkeys (int): Number of immediate subkeys.
+                num_values (int): Number of values.
+                last_write_time (datetime): Last write time as UTC datetime.
+
+        Raises:
+            RegistryKeyNotFoundError: If the key does not exist.
+            RegistryPermissionError: If read access is denied.
+            RegistryError: For other registry errors.
+        """
+        if self._handle_cache is not None:
+            return self._cached_read(walk_registry_key, key_path)
+        return walk_registry_key(
+            root_key=self.root_key,
+            key_path=key_path,
+            root_prefix=self.root_prefix,
+            access_32bit_view=self._access_32bit_view,
+        )
+
+    def walk(
+        self, key_path: str,
+        max_workers: int = 8,
+    ) -> Iterator[Tuple[str, List[str], List[RegistryValue]]]:
+        """
+        Recursively walk a registry subtree relative to the root key and prefix.
+
+        Each key is read with walk_registry_key on a thread pool; winreg releases
+        the GIL around its system calls, so sibling subtrees are read in parallel.
+        Keys are yielded breadth-first in the order they were discovered. Every key
+        is read once, so the walk does not go through the cache_handles cache.
+
+        Args:
+            key_path (str): Key path of the subtree root, relative to the root prefix.
+            max_workers (int): Maximum number of worker threads. Defaults to 8.
+
+        Yields:
+            Tuple[str, List[str], List[RegistryValue]]: The key path (relative to
+            the root prefix), the names of its immediate subkeys, and its values.
+
+        Raises:
+            RegistryKeyNotFoundError: If a key does not exist (e.g. deleted mid-walk).
+            RegistryPermissionError: If read access to a key is denied.
+            RegistryError: For other registry errors.
+        """
+        # Imported here so that importing winregenv does not pull in concurrent.futures
+        from concurrent.futures import ThreadPoolExecutor
+
+        def read(full_path: str) -> RegistryKeyWalk:
+            # Full paths with no prefix, so registry_base does not re-join them
+            return walk_registry_key(
+                root_key=self.root_key,
+                key_path=full_path,
+                root_prefix="",
+                access_32bit_view=self._access_32bit_view,
+            )
+
+        full_root = _join_registry_paths(self.root_prefix, key_path) if self.root_prefix else key_path
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque([(key_path, full_root, executor.submit(read, full_root))])
+            try:
+                while pending:
+                    path, full_path, future = pending.popleft()
+                    info = future.result()
+                    for subkey in info.subkeys:
+                        # Key names may contain '/', so join with a plain backslash rather than
+                        # _join_registry_paths, which treats '/' as a separator
+                        child_path = path + "\\" + subkey if path else subkey
+                        child_full_path = full_path + "\\" + subkey if full_path else subkey
+                        pending.append((child_path, child_full_path, executor.submit(read, child_full_path)))
+                    yield path, info.subkeys, info.values
+            finally:
+                # Don't leave queued reads running if the caller stops early or a read fails
+                for _path, _full_path, future in pending:
+                    future.cancel()
+
     def delete_registry_value(
         self, key_path: str,
         value_name: str,
@@ -400,6 +770,8 @@ class RegistryRoot:
             RegistryError: For other registry errors.
         """
         self._check_write_permission()
+        # Deleting the key invalidates any handle cached for it
+        self._discard_cached_handle(key_path)
         return delete_registry_key(
             root_key=self.root_key,
             key_path=key_path,
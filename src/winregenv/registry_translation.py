@@ -7,6 +7,8 @@ and does not expose any public API.
 """
 
 import winreg
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Any, Tuple, Optional, List, Union
 import logging
 
@@ -32,11 +34,16 @@ REG_RESOURCE_REQUIREMENTS_LIST = winreg.REG_RESOURCE_REQUIREMENTS_LIST # Hardwar
 REG_QWORD = winreg.REG_QWORD
 REG_QWORD_LITTLE_ENDIAN = winreg.REG_QWORD_LITTLE_ENDIAN # Note: Same value as REG_QWORD
 
+# Accepted integer ranges for the 32-bit and 64-bit types (signed minimum to unsigned maximum)
+_DWORD_MIN, _DWORD_MAX = -(1 << 31), (1 << 32) - 1
+_QWORD_MIN, _QWORD_MAX = -(1 << 63), (1 << 64) - 1
+
 
 # Optional: Create a reverse mapping for display/logging purposes
 # IMPORTANT: Since REG_DWORD == REG_DWORD_LITTLE_ENDIAN and REG_QWORD == REG_QWORD_LITTLE_ENDIAN,
 # we only include the base names here to ensure consistent name lookup and reverse lookup.
-_REG_TYPE_NAMES = {
+# Read-only, so no caller can accidentally change how types are named or resolved.
+_REG_TYPE_NAMES = MappingProxyType({
     REG_NONE: "REG_NONE",
     REG_SZ: "REG_SZ",
     REG_EXPAND_SZ: "REG_EXPAND_SZ",
@@ -51,15 +58,40 @@ _REG_TYPE_NAMES = {
     REG_RESOURCE_REQUIREMENTS_LIST: "REG_RESOURCE_REQUIREMENTS_LIST",
     REG_QWORD: "REG_QWORD", # Use base name for value 11
     # REG_QWORD_LITTLE_ENDIAN: "REG_QWORD_LITTLE_ENDIAN", # Excluded due to same value as REG_QWORD
-}
+})
 
+@lru_cache(maxsize=64)
 def get_reg_type_name(reg_type: int) -> str:
-    """Helper to get the string name for a registry type integer."""
+    """Helper to get the string name for a registry type integer.
+
+    Results are cached: the inputs are a handful of REG_* constants, and unknown
+    types would otherwise format a fresh "UnknownType(...)" string on every call.
+    """
     return _REG_TYPE_NAMES.get(reg_type, f"UnknownType({reg_type})")
 
 # Create a reverse mapping for string name to integer type lookup
 # This will now correctly map "REG_DWORD" -> 4 and "REG_QWORD" -> 11
-_REG_NAME_TO_TYPE = {name: value for value, name in _REG_TYPE_NAMES.items()}
+_REG_NAME_TO_TYPE = MappingProxyType({name: value for value, name in _REG_TYPE_NAMES.items()})
+
+# Case-insensitive name lookup used by _normalize_registry_type_input, built once at
+# import time: every name (including the LITTLE_ENDIAN aliases, which resolve to
+# their base types) in upper case and lower case, so the usual spellings need no .upper()
+_REG_NAME_TO_TYPE_CI = {
+    spelling: value
+    for name, value in {
+        **_REG_NAME_TO_TYPE,
+        "REG_DWORD_LITTLE_ENDIAN": REG_DWORD,
+        "REG_QWORD_LITTLE_ENDIAN": REG_QWORD,
+    }.items()
+    for spelling in (name, name.lower())
+}
+
+# Every integer REG_* constant winreg defines, for accepting integers that are valid
+# but not in _REG_TYPE_NAMES without scanning winreg's namespace on each call
+_ALL_WINREG_REG_VALUES = frozenset(
+    value for name, value in vars(winreg).items()
+    if name.startswith("REG_") and isinstance(value, int)
+)
 
 def _normalize_registry_type_input(type_input: Union[int,str]) -> int:
     """
@@ -78,59 +110,96 @@ def _normalize_registry_type_input(type_input: Union[int,str]) -> int:
         ValueError: If the input integer is not a known REG_* type or the
                     string name is not recognized.
     """
-    logger.debug("Normalizing registry value type input: %r (type: %s)", type_input, type(type_input))
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Normalizing registry value type input: %r (type: %s)", type_input, type(type_input))
 
     if isinstance(type_input, int):
-        # Check if the integer corresponds to a known type in our map
+        # REG_DWORD_LITTLE_ENDIAN and REG_QWORD_LITTLE_ENDIAN share their base types'
+        # values, so they are covered by this check as well
         if type_input in _REG_TYPE_NAMES:
-            logger.debug("Input is a known integer type: %s", get_reg_type_name(type_input))
             return type_input
-        # Handle known types that might have been excluded from _REG_TYPE_NAMES (like LITTLE_ENDIAN)
-        elif type_input == REG_DWORD_LITTLE_ENDIAN:
-             logger.debug("Input integer %d matches REG_DWORD_LITTLE_ENDIAN, normalizing to REG_DWORD (%d)", type_input, REG_DWORD)
-             return REG_DWORD # Normalize to the base type value
-        elif type_input == REG_QWORD_LITTLE_ENDIAN:
-             logger.debug("Input integer %d matches REG_QWORD_LITTLE_ENDIAN, normalizing to REG_QWORD (%d)", type_input, REG_QWORD)
-             return REG_QWORD # Normalize to the base type value
-        else:
-            # Check against all known winreg constants just in case
-            all_known_types = {v for k, v in winreg.__dict__.items() if k.startswith("REG_")}
-            if type_input in all_known_types:
-                 logger.warning("Input integer %d is a known winreg type but not explicitly handled in _REG_TYPE_NAMES. Returning as is.", type_input)
-                 return type_input # Return it if it's valid, though name lookup might fail later
-            else:
-                 raise ValueError(
-                     f"Input integer {type_input} does not correspond to a known "
-                     f"Windows registry type (REG_*)."
-                 )
+        if type_input in _ALL_WINREG_REG_VALUES:
+            logger.warning("Input integer %d is a known winreg type but not explicitly handled in _REG_TYPE_NAMES. Returning as is.", type_input)
+            return type_input # Return it if it's valid, though name lookup might fail later
+        raise ValueError(
+            f"Input integer {type_input} does not correspond to a known "
+            f"Windows registry type (REG_*)."
+        )
     elif isinstance(type_input, str):
-        # Look up the string name (case-insensitive lookup, but store uppercase)
-        upper_name = type_input.upper()
-        if upper_name in _REG_NAME_TO_TYPE:
-            reg_type = _REG_NAME_TO_TYPE[upper_name]
-            logger.debug("Input string '%s' normalized to integer type: %s", type_input, get_reg_type_name(reg_type))
-            return reg_type # Return the integer value
-        # Handle LITTLE_ENDIAN string names explicitly if needed, mapping them to base types
-        elif upper_name == "REG_DWORD_LITTLE_ENDIAN":
-             logger.debug("Input string 'REG_DWORD_LITTLE_ENDIAN' normalized to integer type REG_DWORD (%d)", REG_DWORD)
-             return REG_DWORD
-        elif upper_name == "REG_QWORD_LITTLE_ENDIAN":
-             logger.debug("Input string 'REG_QWORD_LITTLE_ENDIAN' normalized to integer type REG_QWORD (%d)", REG_QWORD)
-             return REG_QWORD
-        else:
-            raise ValueError(
-                f"Input string '{type_input}' is not a recognized Windows "
-                f"registry type name (e.g., 'REG_SZ', 'REG_DWORD')."
-            )
+        reg_type = _REG_NAME_TO_TYPE_CI.get(type_input)
+        if reg_type is None:
+            # Mixed-case spelling; fall back to an upper-cased lookup
+            reg_type = _REG_NAME_TO_TYPE_CI.get(type_input.upper())
+            if reg_type is None:
+                raise ValueError(
+                    f"Input string '{type_input}' is not a recognized Windows "
+                    f"registry type name (e.g., 'REG_SZ', 'REG_DWORD')."
+                )
+        return reg_type # Return the integer value
     else:
         raise TypeError(
             f"Registry type input must be an integer or a string name, "
             f"but got type {type(type_input)}."
         )
 
+def _is_list_of_str(data: list) -> bool:
+    """Return True if every item of the list is a str (or str subclass)."""
+    # map(type, ...) and set() loop in C; only lists holding str subclasses (or
+    # non-strings) fall through to the per-item isinstance check
+    return set(map(type, data)) <= {str} or all(isinstance(item, str) for item in data)
+
 # Rename the function to the public name
 normalize_registry_type = _normalize_registry_type_input
 
+# --- Per-type inference handlers used by _infer_registry_type_for_new_value ---
+# Each returns the data and its default registry type for new values.
+
+def _infer_str(data: str) -> Tuple[Any, int]:
+    """Infer the type for string data."""
+    # Default string type for new values is REG_SZ.
+    # The decision to use REG_EXPAND_SZ is domain-specific (e.g., environment vars)
+    # and should be handled by higher-level logic if needed.
+    return data, REG_SZ
+
+def _infer_int(data: int) -> Tuple[Any, int]:
+    """Infer the type for integer data."""
+    # Default integer type for new values is REG_DWORD.
+    # Check if it fits in 32 bits. If not, raise an error suggesting QWORD.
+    # winreg handles the conversion from Python int to the correct byte representation.
+    if not (_DWORD_MIN <= data <= _DWORD_MAX):
+        # Integer is too large for REG_DWORD. User must explicitly specify REG_QWORD.
+        raise ValueError(
+            f"Integer data {data} is outside the range for default REG_DWORD "
+            f"(-2^31 to 2^32-1). Specify value_type={get_reg_type_name(REG_QWORD)} if a 64-bit "
+            f"integer is intended."
+        )
+    return data, REG_DWORD
+
+def _infer_bytes(data: bytes) -> Tuple[Any, int]:
+    """Infer the type for bytes data."""
+    return data, REG_BINARY
+
+def _infer_list(data: list) -> Tuple[Any, int]:
+    """Infer the type for list data; only lists of strings are supported."""
+    # Check if it's a list of strings for REG_MULTI_SZ
+    if not _is_list_of_str(data):
+        # List contains non-string elements
+        raise TypeError(
+            f"Cannot infer registry type for list data containing non-string elements: {data}. "
+            f"Only List[str] is automatically inferred (as REG_MULTI_SZ). Please specify value_type."
+        )
+    # winreg.SetValueEx expects a list of strings for REG_MULTI_SZ
+    return data, REG_MULTI_SZ
+
+# Inference handler for each supported Python type, checked in this order for subclasses
+# (e.g. bool, which is inferred as an int). Exact types are a single dict lookup.
+_INFER_HANDLERS = {
+    str: _infer_str,
+    int: _infer_int,
+    bytes: _infer_bytes,
+    list: _infer_list,
+}
+
 # _infer_registry_type_for_new_value remains internal
 
 def _infer_registry_type_for_new_value(data: Any) -> Tuple[Any, int]:
@@ -154,58 +223,120 @@ def _infer_registry_type_for_new_value(data: Any) -> Tuple[Any, int]:
         ValueError: If the data is out of range for the inferred type
                     (e.g., int too large for DWORD).
     """
-    logger.debug("Attempting to infer registry type for data: %r (type: %s)", data, type(data))
-
-    if isinstance(data, str):
-        # Default string type for new values is REG_SZ.
-        # The decision to use REG_EXPAND_SZ is domain-specific (e.g., environment vars)
-        # and should be handled by higher-level logic if needed.
-        inferred_type = REG_SZ
-        logger.debug("Inferred type REG_SZ for string data.")
-        return data, inferred_type
-
-    elif isinstance(data, int):
-        # Default integer type for new values is REG_DWORD.
-        # Check if it fits in 32 bits. If not, raise an error suggesting QWORD.
-        # winreg handles the conversion from Python int to the correct byte representation.
-        if not (-2**31 <= data <= 2**32 - 1):
-             # Integer is too large for REG_DWORD. User must explicitly specify REG_QWORD.
-             raise ValueError(
-                 f"Integer data {data} is outside the range for default REG_DWORD "
-                 f"(-2^31 to 2^32-1). Specify value_type={get_reg_type_name(REG_QWORD)} if a 64-bit "
-                 f"integer is intended."
-             )
-        inferred_type = REG_DWORD
-        logger.debug("Inferred type REG_DWORD for integer data.")
-        return data, inferred_type
-
-    elif isinstance(data, bytes):
-        inferred_type = REG_BINARY
-        logger.debug("Inferred type REG_BINARY for bytes data.")
-        return data, inferred_type
-
-    elif isinstance(data, list):
-         # Check if it's a list of strings for REG_MULTI_SZ
-         if all(isinstance(item, str) for item in data):
-              inferred_type = REG_MULTI_SZ
-              logger.debug("Inferred type REG_MULTI_SZ for list of strings.")
-              # winreg.SetValueEx expects a list of strings for REG_MULTI_SZ
-              return data, inferred_type
-         else:
-              # List contains non-string elements
-              raise TypeError(
-                  f"Cannot infer registry type for list data containing non-string elements: {data}. "
-                  f"Only List[str] is automatically inferred (as REG_MULTI_SZ). Please specify value_type."
-              )
-
-    # Add inference for other common types if needed (e.g., float -> REG_BINARY?)
-    # For unknown or unhandled Python types, raise an error
-    else:
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Attempting to infer registry type for data: %r (type: %s)", data, type(data))
+
+    handler = _INFER_HANDLERS.get(type(data))
+    if handler is None:
+        # Not an exact match; fall back to isinstance so subclasses are still inferred
+        for base_type, base_handler in _INFER_HANDLERS.items():
+            if isinstance(data, base_type):
+                handler = base_handler
+                break
+        else:
+            # Add inference for other common types if needed (e.g., float -> REG_BINARY?)
+            # For unknown or unhandled Python types, raise an error
+            raise TypeError(
+                f"Cannot infer registry type for Python data type: {type(data)}. "
+                f"Please specify value_type using a winregenv.REG_* constant."
+            )
+    return handler(data)
+
+
+# --- Per-type validators used by _validate_and_convert_data_for_type ---
+# Each takes the data and the target type (for error messages) and returns the
+# data in the form winreg.SetValueEx expects for that type.
+# winreg.SetValueEx expects specific Python types for specific REG_* types.
+# We validate the Python type here. winreg handles the final binary conversion.
+
+def _validate_str(data: Any, target_type: int) -> Any:
+    """Validate data for REG_SZ, REG_EXPAND_SZ and REG_LINK."""
+    if not isinstance(data, str):
+        raise TypeError(
+            f"Data must be a string for registry type {get_reg_type_name(target_type)}, "
+            f"but got {type(data)}."
+        )
+    return data # Data is already the correct Python type
+
+def _validate_dword(data: Any, target_type: int) -> Any:
+    """Validate data for REG_DWORD and its aliases (REG_DWORD_LITTLE_ENDIAN, REG_DWORD_BIG_ENDIAN)."""
+    if not isinstance(data, int):
+        raise TypeError(
+            f"Data must be an integer for registry type {get_reg_type_name(target_type)}, "
+            f"but got {type(data)}."
+        )
+    # Check range for 32-bit int
+    if not (_DWORD_MIN <= data <= _DWORD_MAX):
+        raise ValueError(
+            f"Integer data {data} is out of range for a 32-bit registry type "
+            f"({get_reg_type_name(target_type)})."
+        )
+    return data # Data is already the correct Python type
+
+def _validate_qword(data: Any, target_type: int) -> Any:
+    """Validate data for REG_QWORD and its alias (REG_QWORD_LITTLE_ENDIAN)."""
+    if not isinstance(data, int):
         raise TypeError(
-            f"Cannot infer registry type for Python data type: {type(data)}. "
-            f"Please specify value_type using a winregenv.REG_* constant."
+            f"Data must be an integer for registry type {get_reg_type_name(target_type)}, "
+            f"but got {type(data)}."
+        )
+    # Check range for 64-bit int
+    if not (_QWORD_MIN <= data <= _QWORD_MAX):
+        raise ValueError(
+            f"Integer data {data} is out of range for a 64-bit registry type "
+            f"({get_reg_type_name(target_type)})."
         )
+    return data # Data is already the correct Python type
 
+def _validate_bytes(data: Any, target_type: int) -> Any:
+    """Validate data for REG_BINARY and the resource types, which all expect bytes."""
+    if not isinstance(data, bytes):
+        raise TypeError(
+            f"Data must be bytes for registry type {get_reg_type_name(target_type)}, "
+            f"but got {type(data)}."
+        )
+    return data # Data is already the correct Python type
+
+def _validate_multi_sz(data: Any, target_type: int) -> Any:
+    """Validate data for REG_MULTI_SZ."""
+    if not isinstance(data, list) or not _is_list_of_str(data):
+        raise TypeError(
+            f"Data must be a list of strings for registry type {get_reg_type_name(target_type)}, "
+            f"but got {type(data)}."
+        )
+    # winreg.SetValueEx expects a list of strings for REG_MULTI_SZ
+    return data
+
+def _validate_none(data: Any, target_type: int) -> Any:
+    """Validate data for REG_NONE, whose data is ignored."""
+    # REG_NONE data is ignored, but SetValueEx expects None or b''
+    # Return None as expected by SetValueEx for REG_NONE: winreg.SetValueEx(..., REG_NONE, None)
+    # is typical. None, the usual input, is settled by a single identity test.
+    if data is None or data == b'':
+        return None
+    logger.warning(
+        "Data %r provided for REG_NONE type. Data will be ignored by the registry.",
+        data
+    )
+    return None
+
+# Validator for each supported target type, so dispatch is a single dict lookup.
+# The LITTLE_ENDIAN aliases share their base types' values and need no entries of their own.
+_VALIDATORS = {
+    REG_SZ: _validate_str,
+    REG_EXPAND_SZ: _validate_str,
+    REG_LINK: _validate_str,
+    REG_DWORD: _validate_dword,
+    REG_DWORD_BIG_ENDIAN: _validate_dword,
+    REG_QWORD: _validate_qword,
+    REG_BINARY: _validate_bytes,
+    REG_MULTI_SZ: _validate_multi_sz,
+    REG_NONE: _validate_none,
+    # Add validation for other types if necessary (e.g., resource types expect bytes)
+    REG_RESOURCE_LIST: _validate_bytes,
+    REG_FULL_RESOURCE_DESCRIPTOR: _validate_bytes,
+    REG_RESOURCE_REQUIREMENTS_LIST: _validate_bytes,
+}
 
 # _validate_and_convert_data_for_type remains internal
 
@@ -229,90 +360,16 @@ def _validate_and_convert_data_for_type(data: Any, target_type: int) -> Any:
         TypeError: If data is incompatible with the target_type.
         ValueError: If data is out of range for integer types.
     """
-    logger.debug("Validating data %r (type: %s) against target registry type: %s",
-                 data, type(data), get_reg_type_name(target_type))
-
-    # winreg.SetValueEx expects specific Python types for specific REG_* types.
-    # We validate the Python type here. winreg handles the final binary conversion.
-
-    if target_type in (REG_SZ, REG_EXPAND_SZ, REG_LINK):
-        if not isinstance(data, str):
-            raise TypeError(
-                f"Data must be a string for registry type {get_reg_type_name(target_type)}, "
-                f"but got {type(data)}."
-            )
-        return data # Data is already the correct Python type
-
-    # Handle REG_DWORD and its aliases (REG_DWORD_LITTLE_ENDIAN)
-    elif target_type in (REG_DWORD, REG_DWORD_LITTLE_ENDIAN, REG_DWORD_BIG_ENDIAN):
-         if not isinstance(data, int):
-             raise TypeError(
-                 f"Data must be an integer for registry type {get_reg_type_name(target_type)}, "
-                 f"but got {type(data)}."
-             )
-         # Check range for 32-bit int
-         if not (-2**31 <= data <= 2**32 - 1):
-              raise ValueError(
-                  f"Integer data {data} is out of range for a 32-bit registry type "
-                  f"({get_reg_type_name(target_type)})."
-              )
-         return data # Data is already the correct Python type
-
-    # Handle REG_QWORD and its aliases (REG_QWORD_LITTLE_ENDIAN)
-    elif target_type in (REG_QWORD, REG_QWORD_LITTLE_ENDIAN):
-         if not isinstance(data, int):
-             raise TypeError(
-                 f"Data must be an integer for registry type {get_reg_type_name(target_type)}, "
-                 f"but got {type(data)}."
-             )
-         # Check range for 64-bit int
-         if not (-2**63 <= data <= 2**64 - 1):
-              raise ValueError(
-                  f"Integer data {data} is out of range for a 64-bit registry type "
-                  f"({get_reg_type_name(target_type)})."
-              )
-         return data # Data is already the correct Python type
-
-    elif target_type == REG_BINARY:
-         if not isinstance(data, bytes):
-             raise TypeError(
-                 f"Data must be bytes for registry type {get_reg_type_name(target_type)}, "
-                 f"but got {type(data)}."
-             )
-         return data # Data is already the correct Python type
-
-    elif target_type == REG_MULTI_SZ:
-         if not isinstance(data, list) or not all(isinstance(item, str) for item in data):
-              raise TypeError(
-                  f"Data must be a list of strings for registry type {get_reg_type_name(target_type)}, "
-                  f"but got {type(data)}."
-              )
-         # winreg.SetValueEx expects a list of strings for REG_MULTI_SZ
-         return data
-
-    elif target_type == REG_NONE:
-        # REG_NONE data is ignored, but SetValueEx expects None or b''
-        if data is not None and data != b'':
-             logger.warning(
-                 "Data %r provided for REG_NONE type. Data will be ignored by the registry.",
-                 data
-             )
-        # Return None or b'' as expected by SetValueEx for REG_NONE
-        return None # winreg.SetValueEx(..., REG_NONE, None) is typical
-
-    # Add validation for other types if necessary (e.g., resource types expect bytes)
-    elif target_type in (REG_RESOURCE_LIST, REG_FULL_RESOURCE_DESCRIPTOR, REG_RESOURCE_REQUIREMENTS_LIST):
-         if not isinstance(data, bytes):
-             raise TypeError(
-                 f"Data must be bytes for registry type {get_reg_type_name(target_type)}, "
-                 f"but got {type(data)}."
-             )
-         return data # Data is already the correct Python type
-
-    # For unknown or unhandled target types, raise an error
-    else:
-         # Use get_reg_type_name which handles unknown integer types gracefully
-         type_name = get_reg_type_name(target_type)
-         raise TypeError(f"Unsupported or unhandled target registry type: {type_name} ({target_type}).")
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Validating data %r (type: %s) against target registry type: %s",
+                     data, type(data), get_reg_type_name(target_type))
+
+    validator = _VALIDATORS.get(target_type)
+    if validator is None:
+        # For unknown or unhandled target types, raise an error
+        # Use get_reg_type_name which handles unknown integer types gracefully
+        type_name = get_reg_type_name(target_type)
+        raise TypeError(f"Unsupported or unhandled target registry type: {type_name} ({target_type}).")
+    return validator(data, target_type)
 
 # No __all__ list here, as this module is internal.
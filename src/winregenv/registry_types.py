@@ -6,15 +6,23 @@ registry, providing a more structured and type-hintable alternative
 to raw tuples or dictionaries.
 """
 
-from typing import Any, Tuple, Optional
+from typing import Any, List, Tuple, Optional, NamedTuple
+from datetime import datetime
 import winreg # Needed for type hints like winreg.REG_SZ
 
-from .expand_variable import expand_environment_strings # Import the expansion function # noqa: F401 # Imported for use in expanded_data property
 from .registry_translation import REG_EXPAND_SZ, REG_MULTI_SZ, get_reg_type_name # Import constants and helper
+from .registry_errors import RegistryExpansionError
 import logging
 
 logger = logging.getLogger(__name__)
 
+
+def expand_environment_strings(source_string: str) -> str:
+    """Expands %VAR% references, importing expand_variable (and its ctypes bindings) on first use."""
+    from .expand_variable import expand_environment_strings as _expand_environment_strings
+    return _expand_environment_strings(source_string)
+
+
 class RegistryValue:
     """
     Represents a registry value with its name, data, and type.
@@ -25,6 +33,9 @@ class RegistryValue:
     compatibility with code that previously expected a tuple.
     It also provides an `expanded_data` property for REG_EXPAND_SZ values.
     """
+    # No per-instance __dict__: list_registry_values can return many of these
+    __slots__ = ('_name', '_data', '_value_type', '_tuple', '_hash', '_repr', '_type_name')
+
     def __init__(self, name: str, data: Any, value_type: int):
         """
         Initializes a RegistryValue instance.
@@ -41,13 +52,23 @@ class RegistryValue:
         self._name = name
         self._value_type = value_type
 
+        self._data = data
         # Store REG_MULTI_SZ data as a tuple internally for hashability
         # This ensures the RegistryValue object is hashable, as tuples are immutable.
+        # The type check comes first, so other types never reach the isinstance call.
         if value_type == REG_MULTI_SZ and isinstance(data, list):
             # Ensure all elements are strings, though validation should handle this earlier
-            self._data = tuple(data)
-        else:
-            self._data = data # Assign original data for other types
+            self._data = data = tuple(data)
+
+        # Tuple view backing unpacking, index access and hashing
+        self._tuple = (name, data, value_type)
+        # Computed on first hash() (instances are immutable); stays None until then so
+        # unhashable data still only raises when hashing is actually attempted
+        self._hash: Optional[int] = None
+        # Likewise built on first repr() / type_name access and reused, e.g. when the
+        # same value is logged repeatedly
+        self._repr: Optional[str] = None
+        self._type_name: Optional[str] = None
 
     @property
     def name(self) -> str:
@@ -74,7 +95,10 @@ class RegistryValue:
     @property
     def type_name(self) -> str:
         """The string name of the registry data type (e.g., "REG_SZ")."""
-        return get_reg_type_name(self._value_type)
+        n = self._type_name
+        if n is None:
+            n = self._type_name = get_reg_type_name(self._value_type)
+        return n
 
     @property
     def expanded_data(self) -> Optional[str]:
@@ -94,8 +118,10 @@ class RegistryValue:
         """
         # Expansion is only applicable and meaningful for REG_EXPAND_SZ type
         if self._value_type == REG_EXPAND_SZ and isinstance(self._data, str):
+            # Without a '%' there is nothing to expand; skip the Windows API call
+            if '%' not in self._data:
+                return self._data
             # Call the utility function to perform the actual expansion
-            from .registry_errors import RegistryExpansionError # Import locally to avoid circular dependency
             try:
                 # expand_environment_strings raises OSError (ctypes.WinError) on failure
                 return expand_environment_strings(self._data)
@@ -119,9 +145,7 @@ class RegistryValue:
         Supports tuple unpacking (name, data, value_type = value).
         Yields name, then data, then value_type.
         """
-        yield self._name
-        yield self._data
-        yield self._value_type
+        return iter(self._tuple)
 
     def __getitem__(self, key: int):
         """
@@ -136,18 +160,20 @@ class RegistryValue:
         Raises:
             IndexError: If the index is out of range.
         """
-        if key == 0:
-            return self._name
-        elif key == 1:
-            return self._data
-        elif key == 2:
-            return self._value_type
-        else:
-            raise IndexError("RegistryValue index out of range (expected 0, 1, or 2)")
+        try:
+            # Negative indices and slices are not supported, unlike a plain tuple
+            if key >= 0:
+                return self._tuple[key]
+        except (IndexError, TypeError):
+            pass
+        raise IndexError("RegistryValue index out of range (expected 0, 1, or 2)")
 
     def __repr__(self):
         """Provides a developer-friendly string representation."""
-        return f"RegistryValue(name={self._name!r}, data={self._data!r}, value_type={self._value_type!r})"
+        r = self._repr
+        if r is None:
+            r = self._repr = f"RegistryValue(name={self._name!r}, data={self._data!r}, value_type={self._value_type!r})"
+        return r
 
     def __str__(self):
         """Provides a user-friendly string representation."""
@@ -162,18 +188,16 @@ class RegistryValue:
         """
         if isinstance(other, RegistryValue):
             # Compare internal data representation
-            return (self._name == other.name and
-                    self._data == other.data and
-                    self._value_type == other.type)
+            return self._tuple == other._tuple
         # Allow comparison with a tuple (name, data, type) for backward compatibility
         # Need to handle the case where self._data is a tuple (for MULTI_SZ)
         # but the tuple being compared against has a list for data.
         # Note: self._data is already a tuple if it was REG_MULTI_SZ list input
         if isinstance(other, tuple) and len(other) == 3:
             if self._value_type == REG_MULTI_SZ and isinstance(other[1], list):
-             # Compare the tuple data with the list data by converting the list to a tuple
-             return (self._name == other[0] and self._data == tuple(other[1]) and self._value_type == other[2])
-            return (self._name == other[0] and self._data == other[1] and self._value_type == other[2])
+                # Compare the tuple data with the list data by converting the list to a tuple
+                other = (other[0], tuple(other[1]), other[2])
+            return self._tuple == other
         return NotImplemented
 
     def __hash__(self):
@@ -189,4 +213,56 @@ class RegistryValue:
         # but the input data was a list), hashing will fail as expected.
         # The validation/inference logic should prevent this for types other than MULTI_SZ.
 
-        return hash((self._name, self._data, self._value_type))
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self._tuple)
+        return h
+
+
+class RegistryKeyInfo(NamedTuple):
+    """
+    Metadata for a registry key, as returned by head_registry_key.
+
+    A named tuple, so fields are available as attributes (info.num_subkeys),
+    by position (info[0]) and through tuple unpacking. For backward
+    compatibility with code that previously received a dict, string indexing
+    (info["num_subkeys"]) also works and instances compare equal to a dict
+    with the same keys and values.
+    """
+    num_subkeys: int
+    num_values: int
+    last_write_time: datetime
+
+    def __getitem__(self, key):
+        """Supports positional/slice access and dict-style access by field name."""
+        if isinstance(key, str):
+            if key not in self._fields:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def __eq__(self, other):
+        """Compares equal to another RegistryKeyInfo/tuple, or to a dict with the same fields."""
+        if isinstance(other, dict):
+            return self._asdict() == other
+        return tuple.__eq__(self, other)
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = tuple.__hash__
+
+
+class RegistryKeyWalk(NamedTuple):
+    """
+    A registry key's subkeys, values and metadata, as returned by walk_registry_key.
+
+    A named tuple, so fields are available as attributes (walk.subkeys),
+    by position (walk[0]) and through tuple unpacking.
+    """
+    subkeys: List[str]
+    values: List[RegistryValue]
+    num_subkeys: int
+    num_values: int
+    last_write_time: datetime
@@ -2,25 +2,28 @@
 """
 This module provides Windows API utilities, specifically for broadcasting
 system-wide messages like WM_SETTINGCHANGE.
+
+See examples/broadcast_demo.py for a runnable demonstration.
 """
 
 import ctypes
+import functools
 import sys
 import logging
 from ctypes import wintypes
-from typing import Optional, Literal, TYPE_CHECKING
+from typing import Callable, Iterable, Optional, Literal, TypeVar, TYPE_CHECKING
 from .registry_errors import RegistryError
 
 # Configure logging for this module
 logger = logging.getLogger(__name__)
 
-__all__ = ["broadcast_setting_change"]
+__all__ = ["broadcast_setting_change", "broadcast_setting_changes", "broadcast_setting_change_async", "broadcast_after"]
 
 # --- Platform Check ---
-# This code is specific to Windows. Allow import on non-Windows platforms for tooling,
-# but raise NotImplementedError only when trying to use the functionality.
+# This code is specific to Windows. This is the module's only platform check: off Windows,
+# loading user32.dll below raises OSError, so the functions never need to check per call.
 if sys.platform != "win32":
-    logger.warning("This module is only functional on Windows (win32). Some functionality will raise NotImplementedError.")
+    logger.warning("This module is only functional on Windows (win32). Loading user32.dll will fail.")
 
 # For type checking (without importing), use Literal for setting_name
 if TYPE_CHECKING:
@@ -28,6 +31,8 @@ if TYPE_CHECKING:
 else:
     SettingName = str
 
+_T = TypeVar("_T")
+
 # --- Define necessary Windows API constants and function signatures ---
 
 # For SendMessageTimeout:
@@ -42,7 +47,7 @@ ERROR_TIMEOUT = 1460  # From WinError.h
 try:
     user32 = ctypes.WinDLL("user32", use_last_error=True)
 except AttributeError:
-    # This should be caught by the sys.platform check, but included for robustness
+    # ctypes.WinDLL only exists on Windows
     raise OSError("Failed to load user32.dll. Ensure you are on Windows.")
 
 
@@ -65,10 +70,36 @@ user32.SendMessageTimeoutW.argtypes = [
     wintypes.LPWSTR,     # lParam (can be a string for WM_SETTINGCHANGE)
     wintypes.UINT,       # fuFlags
     wintypes.UINT,       # uTimeout
-    ctypes.POINTER(wintypes.DWORD) # lpdwResult (using DWORD for simplicity)
+    ctypes.POINTER(wintypes.DWORD) # lpdwResult (using DWORD for simplicity; None passes NULL)
 ]
 user32.SendMessageTimeoutW.restype = wintypes.LPARAM  # LRESULT, but often treated as BOOL for success/fail
 
+# Bind the configured function pointers and the ctypes helpers once, so each broadcast
+# skips the WinDLL attribute lookup and the ctypes module attribute loads
+_SendMessageTimeoutW = user32.SendMessageTimeoutW
+_byref = ctypes.byref
+_get_last_error = ctypes.get_last_error
+_create_unicode_buffer = ctypes.create_unicode_buffer
+
+# The constant arguments, already converted to their argtypes: ctypes passes instances of
+# the declared type through as is, instead of building a new one from the int on every call
+_HWND_BROADCAST_ARG = wintypes.HWND(HWND_BROADCAST)
+_WM_SETTINGCHANGE_ARG = wintypes.UINT(WM_SETTINGCHANGE)
+_WPARAM_ZERO_ARG = wintypes.WPARAM(0)
+_SMTO_FLAGS_ARG = wintypes.UINT(SMTO_ABORTIFHUNG)
+
+# Per-window timeout for broadcasts that don't wait. The async send functions reject
+# pointer lParams such as the WM_SETTINGCHANGE string, so wait=False still uses
+# SendMessageTimeoutW, only with a short timeout whose expiry is not treated as an error.
+_NO_WAIT_TIMEOUT_MS = 100
+
+# lParam buffers for the common setting areas, built once: the API only reads them, so
+# broadcasts (including concurrent ones) can share a buffer instead of allocating per call
+_LPARAM_CACHE = {
+    name: _create_unicode_buffer(name)
+    for name in ("Environment", "intl", "Policy", "Windows")
+}
+
 
 class MessageTimeoutError(RegistryError):
     """Raised when SendMessageTimeoutW fails due to timeout."""
@@ -79,7 +110,8 @@ class MessageTimeoutError(RegistryError):
 
 def broadcast_setting_change(
     setting_name: Optional[SettingName] = "Environment",
-    timeout_ms: int = 5000
+    timeout_ms: int = 5000,
+    wait: bool = True,
 ) -> None:
     """
     Broadcasts a WM_SETTINGCHANGE message to all top-level windows.
@@ -93,88 +125,177 @@ def broadcast_setting_change(
             If None, a general notification is sent (lParam=0).
             Common values include "Environment", "intl", "Policy", "Windows".
         timeout_ms (int): The duration, in milliseconds, to wait for the message
-            to be processed. Defaults to 5000ms (5 seconds).
+            to be processed. Defaults to 5000ms (5 seconds). Ignored if wait is False.
+        wait (bool): If True (the default), block until every top-level window has
+            processed the message or timeout_ms has elapsed. If False, give each
+            window only a short timeout and return without raising when it expires,
+            so slow windows delay the caller as little as possible.
 
     Raises:
-        MessageTimeoutError: If the message broadcast times out.
+        MessageTimeoutError: If the message broadcast times out (only when wait is True).
         OSError: If the SendMessageTimeoutW API call fails for reasons other than timeout.
-        NotImplementedError: If run on a non-Windows operating system.
     """
-    if sys.platform != "win32":
-        raise NotImplementedError("This function requires Windows (win32).")
-
     # Prepare lParam
-    lparam = ctypes.create_unicode_buffer(setting_name) if setting_name is not None else None
+    lparam = _LPARAM_CACHE.get(setting_name)
+    if lparam is None and setting_name is not None:
+        lparam = _create_unicode_buffer(setting_name)
 
-    # Variable to store the result of the broadcast (not typically used for WM_SETTINGCHANGE)
-    broadcast_result = wintypes.DWORD()
+    # Area name as shown in log and error messages
+    area = setting_name if setting_name else 'general'
 
-    logger.debug(
-        f"Broadcasting WM_SETTINGCHANGE for '{setting_name if setting_name else 'general'}' "
-        f"with timeout {timeout_ms}ms."
-    )
+    if not wait:
+        timeout_ms = _NO_WAIT_TIMEOUT_MS
+
+    # Variable to store the result of the broadcast (not typically used for WM_SETTINGCHANGE).
+    # lpdwResult is optional, so it is only allocated when the success message will log it;
+    # otherwise None passes NULL.
+    broadcast_result = wintypes.DWORD() if logger.isEnabledFor(logging.INFO) else None
+
+    logger.debug("Broadcasting WM_SETTINGCHANGE for '%s' with timeout %sms.", area, timeout_ms)
 
     # Call SendMessageTimeoutW
-    api_result = user32.SendMessageTimeoutW(
-        HWND_BROADCAST,
-        WM_SETTINGCHANGE,
-        0,  # wParam (not used when lParam is a string for "Environment")
+    api_result = _SendMessageTimeoutW(
+        _HWND_BROADCAST_ARG,
+        _WM_SETTINGCHANGE_ARG,
+        _WPARAM_ZERO_ARG,  # wParam (not used when lParam is a string for "Environment")
         lparam,
-        SMTO_ABORTIFHUNG,  # Flags: abort if hung
+        _SMTO_FLAGS_ARG,  # Flags: abort if hung
         timeout_ms,
-        ctypes.byref(broadcast_result)
+        _byref(broadcast_result) if broadcast_result is not None else None
     )
 
     if api_result == 0:
-        error_code = ctypes.get_last_error()
-        ctypes.set_last_error(0)  # Clear the error after getting it
+        error_code = _get_last_error()
+        # No need to clear the value: ctypes overwrites it on the next use_last_error call
 
-        error_message = f"Failed to broadcast WM_SETTINGCHANGE for '{setting_name if setting_name else 'general'}'."
+        error_message = f"Failed to broadcast WM_SETTINGCHANGE for '{area}'."
 
+        if error_code == ERROR_TIMEOUT and not wait:
+            # The caller asked not to wait, so windows still processing the message are expected
+            logger.debug("WM_SETTINGCHANGE broadcast for '%s' returned without waiting for all windows.", area)
+            return
         if error_code == ERROR_TIMEOUT:
             logger.warning(
-                f"WM_SETTINGCHANGE broadcast timed out after {timeout_ms}ms (Error {error_code}). "
-                f"Setting name: '{setting_name if setting_name else 'general'}'."
+                "WM_SETTINGCHANGE broadcast timed out after %sms (Error %s). Setting name: '%s'.",
+                timeout_ms, error_code, area
             )
             raise MessageTimeoutError(error_code, error_message)
         else:
             logger.error(
-                f"SendMessageTimeoutW failed for WM_SETTINGCHANGE. Error code: {error_code}. "
-                f"Setting name: '{setting_name if setting_name else 'general'}'."
+                "SendMessageTimeoutW failed for WM_SETTINGCHANGE. Error code: %s. Setting name: '%s'.",
+                error_code, area
             )
             raise ctypes.WinError(error_code, error_message)
-    else:
+    elif broadcast_result is not None:
         logger.info(
-            f"Successfully broadcast WM_SETTINGCHANGE for '{setting_name if setting_name else 'general'}'. "
-            f"API result: {api_result}, Broadcast processing result: {broadcast_result.value}"
+            "Successfully broadcast WM_SETTINGCHANGE for '%s'. API result: %s, Broadcast processing result: %s",
+            area, api_result, broadcast_result.value
         )
 
 
-# --- Example Usage (for direct execution of this file) ---
-if __name__ == "__main__":
-    logging.basicConfig(
-        level=logging.DEBUG,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+async def broadcast_setting_change_async(
+    setting_name: Optional[SettingName] = "Environment",
+    timeout_ms: int = 5000,
+    wait: bool = True,
+) -> None:
+    """
+    Awaitable version of broadcast_setting_change for use inside an event loop.
+
+    The blocking broadcast runs on the loop's default executor (ctypes releases
+    the GIL during the API call), so the event loop keeps running while windows
+    process the message. Concurrent awaits are safe; each runs on its own worker
+    thread.
+
+    Args:
+        setting_name (Optional[str]): See broadcast_setting_change.
+        timeout_ms (int): See broadcast_setting_change.
+        wait (bool): See broadcast_setting_change.
+
+    Raises:
+        The same exceptions as broadcast_setting_change.
+    """
+    # Imported here so that importing winregenv does not pull in asyncio
+    import asyncio
+
+    # run_in_executor rather than asyncio.to_thread, which needs Python 3.9
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(
+        None, functools.partial(broadcast_setting_change, setting_name, timeout_ms, wait)
     )
 
-    logger.info("Attempting to broadcast WM_SETTINGCHANGE for 'Environment'...")
-    try:
-        broadcast_setting_change("Environment")
-        logger.info("WM_SETTINGCHANGE for 'Environment' broadcast successfully.")
-    except MessageTimeoutError as e:
-        logger.warning(f"WM_SETTINGCHANGE timeout: {e}")
-    except OSError as e:
-        logger.error(f"Failed to broadcast WM_SETTINGCHANGE: {e}")
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred: {e}")
-
-    logger.info("\nAttempting to broadcast general WM_SETTINGCHANGE (lParam=0)...")
-    try:
-        broadcast_setting_change(None)  # Test with lParam as NULL
-        logger.info("General WM_SETTINGCHANGE broadcast successfully.")
-    except MessageTimeoutError as e:
-        logger.warning(f"WM_SETTINGCHANGE timeout: {e}")
-    except OSError as e:
-        logger.error(f"Failed to broadcast general WM_SETTINGCHANGE: {e}")
-    except Exception as e:
-        logger.exception(f"An unexpected error occurred: {e}")
+
+def broadcast_setting_changes(
+    setting_names: Iterable[Optional[SettingName]],
+    timeout_ms: int = 5000
+) -> None:
+    """
+    Broadcasts one WM_SETTINGCHANGE message per setting area, concurrently.
+
+    Each broadcast runs on its own worker thread (ctypes releases the GIL around
+    SendMessageTimeoutW), so the total wait is bounded by the slowest broadcast
+    rather than the sum of all of them. Duplicate names are broadcast once.
+
+    Args:
+        setting_names (Iterable[Optional[str]]): The areas that changed, e.g.
+            ["Environment", "intl"]. None sends a general notification.
+        timeout_ms (int): The per-broadcast timeout in milliseconds.
+            Defaults to 5000ms (5 seconds).
+
+    Raises:
+        MessageTimeoutError: If the only failed broadcast timed out.
+        OSError: If the only failed broadcast failed for another reason.
+        RegistryError: If several broadcasts failed; the first failure is chained.
+    """
+    names = list(dict.fromkeys(setting_names))
+    if not names:
+        return
+
+    # Imported here so that importing winregenv does not pull in concurrent.futures
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=len(names)) as executor:
+        futures = [executor.submit(broadcast_setting_change, name, timeout_ms) for name in names]
+    # Leaving the with block waited for every broadcast to finish
+    failures = [(name, future.exception()) for name, future in zip(names, futures) if future.exception() is not None]
+
+    if len(failures) == 1:
+        raise failures[0][1]
+    if failures:
+        failed = ", ".join(f"'{name if name else 'general'}'" for name, _exc in failures)
+        raise RegistryError(
+            f"Failed to broadcast WM_SETTINGCHANGE for {failed}."
+        ) from failures[0][1]
+
+
+def broadcast_after(
+    action: Callable[[], _T],
+    setting_name: Optional[SettingName] = "Environment",
+    timeout_ms: int = 5000,
+    wait: bool = True,
+) -> _T:
+    """
+    Runs a batch of registry changes, then broadcasts WM_SETTINGCHANGE exactly once.
+
+    Pair it with a batched write such as RegistryRoot.put_registry_values, which writes
+    all values through one open key handle, so N changes cost one key open and one
+    broadcast instead of N of each:
+
+        env = RegistryRoot("HKCU", root_prefix="Environment")
+        broadcast_after(lambda: env.put_registry_values("", {"FOO": "1", "BAR": "2"}))
+
+    Args:
+        action (Callable[[], T]): Performs the registry changes. If it raises, nothing
+            is broadcast and the exception propagates.
+        setting_name (Optional[str]): See broadcast_setting_change.
+        timeout_ms (int): See broadcast_setting_change.
+        wait (bool): See broadcast_setting_change.
+
+    Returns:
+        T: Whatever action returned.
+
+    Raises:
+        Any exception raised by action, or the exceptions of broadcast_setting_change.
+    """
+    result = action()
+    broadcast_setting_change(setting_name, timeout_ms, wait)
+    return result
@@ -5,7 +5,7 @@ import sys
 import os
 
 # Import the function under test
-from winregenv.expand_variable import expand_environment_strings
+from winregenv.expand_variable import expand_environment_strings, expand_environment_strings_many
 
 # Skip tests if not on Windows
 pytestmark = pytest.mark.skipif(sys.platform != "win32", reason="Requires Windows API")
@@ -66,3 +66,29 @@ def test_expand_environment_strings_invalid_input(invalid_input):
     with pytest.raises(TypeError, match="source_string must be a string"):
         expand_environment_strings(invalid_input)
 
+
+
+def test_expand_environment_strings_many_matches_single():
+    """Tests the batch variant matches per-string expansion, including buffer growth."""
+    inputs = [
+        "%TEMP%",
+        "%SystemRoot%\\" + "a"*1500 + "\\%TEMP%", # Forces the shared buffer to grow
+        "User: %USERNAME%",
+        "",
+    ]
+    assert expand_environment_strings_many(inputs) == [expand_environment_strings(s) for s in inputs]
+    assert expand_environment_strings_many([]) == []
+
+
+def test_expand_environment_strings_many_invalid_input():
+    """Tests that a non-string item raises TypeError."""
+    with pytest.raises(TypeError, match="source_string must be a string"):
+        expand_environment_strings_many(["%TEMP%", 123])
+
+
+def test_expand_environment_strings_reused_buffer_has_no_stale_data():
+    """Tests a short expansion after a long one returns only its own characters."""
+    long_input = "%SystemRoot%\\" + "b"*1500
+    assert expand_environment_strings(long_input) == _get_expected_expansion(long_input)
+    assert expand_environment_strings("abc") == "abc"
+    assert expand_environment_strings("") == ""
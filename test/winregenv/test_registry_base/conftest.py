@@ -21,6 +21,11 @@ def mock_winreg(mocker): # Use the mocker fixture provided by pytest-mock
     # use this mock object when called from within the test scope.
     mocker.patch('winregenv.registry_base.winreg', new=mock)
     mocker.patch('winregenv.registry_context_managers.winreg', new=mock)
+    # registry_base binds its winreg functions at import time; point those
+    # aliases at the same child mocks so tests can configure mock.<Function>.
+    for func_name in ('OpenKey', 'CreateKeyEx', 'CloseKey', 'SetValueEx', 'QueryValueEx', 'EnumValue',
+                      'EnumKey', 'QueryInfoKey', 'DeleteValue', 'DeleteKey'):
+        mocker.patch(f'winregenv.registry_base._{func_name}', new=getattr(mock, func_name))
 
 
     # Configure the single mock object with constants and method behaviors
@@ -31,6 +36,7 @@ def mock_winreg(mocker): # Use the mocker fixture provided by pytest-mock
     mock.KEY_SET_VALUE = winreg.KEY_SET_VALUE
     mock.KEY_CREATE_SUB_KEY = winreg.KEY_CREATE_SUB_KEY
     mock.KEY_ENUMERATE_SUB_KEYS = winreg.KEY_ENUMERATE_SUB_KEYS
+    mock.KEY_QUERY_VALUE = winreg.KEY_QUERY_VALUE
     mock.KEY_WOW64_32KEY = winreg.KEY_WOW64_32KEY
     mock.REG_SZ = winreg.REG_SZ # Use real constants
     mock.REG_EXPAND_SZ = winreg.REG_EXPAND_SZ
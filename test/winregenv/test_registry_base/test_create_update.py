@@ -106,33 +106,25 @@ def test_put_registry_value_creates_key_and_sets_value(mock_winreg):
     value_type = mock_winreg.REG_SZ
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Mock CreateKeyEx for ensure_registry_key_exists
+    # Mock CreateKeyEx, which creates (or opens) the key and returns a writable handle
     mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
-    # Mock OpenKey for the RegistryKey context manager
-    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
 
     registry_base.put_registry_value(root, key_path, value_name, value_data, value_type, root_prefix=root_prefix)
 
-    # Verify ensure_registry_key_exists was called with the full path
+    # Verify the key was created/opened once with the full path
     mock_winreg.CreateKeyEx.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_WRITE)
-    # Removed: mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
-
-    # Verify RegistryKey context manager was used with the full path
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_SET_VALUE)
-    # Verify SetValueEx was called on the handle from the context manager
+    # No separate open is needed to set the value
+    mock_winreg.OpenKey.assert_not_called()
+    # Verify SetValueEx was called on the handle from CreateKeyEx
     mock_winreg.SetValueEx.assert_called_once_with(
-        mock_winreg.mock_handle_1,
+        mock_winreg.mock_handle_2,
         value_name,
         0,
         value_type,
         value_data
     )
-    # Verify the handle from OpenKey was closed by the context manager
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_2), # From ensure_registry_key_exists
-        call(mock_winreg.mock_handle_1),     # From RegistryKey context manager
-    ])
-    assert mock_winreg.CloseKey.call_count == 2
+    # Verify the handle from CreateKeyEx was closed
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
 
 
 def test_put_registry_value_sets_value_existing_key(mock_winreg):
@@ -143,32 +135,99 @@ def test_put_registry_value_sets_value_existing_key(mock_winreg):
     value_data = "Some Data"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Mock CreateKeyEx for ensure_registry_key_exists (simulates opening existing)
+    # Mock CreateKeyEx (simulates opening existing)
     mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
-    # Mock OpenKey for the RegistryKey context manager
-    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
 
     registry_base.put_registry_value(root, key_path, value_name, value_data, value_type=mock_winreg.REG_SZ, root_prefix=root_prefix) # Pass explicit type
 
-    # Verify ensure_registry_key_exists was called
     mock_winreg.CreateKeyEx.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_WRITE)
-    # Removed: mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
-
-    # Verify RegistryKey context manager was used
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_SET_VALUE)
+    mock_winreg.OpenKey.assert_not_called()
     # Verify SetValueEx was called with default type (REG_SZ for string)
     mock_winreg.SetValueEx.assert_called_once_with(
-        mock_winreg.mock_handle_1,
+        mock_winreg.mock_handle_2,
         value_name,
         0,
         mock_winreg.REG_SZ,
         value_data
     )
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_2),
-        call(mock_winreg.mock_handle_1),
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
+
+
+def test_put_registry_value_32bit_view(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\MyApp"
+
+    mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
+
+    registry_base.put_registry_value(root, key_path, "MyValue", "Data", mock_winreg.REG_SZ, access_32bit_view=True)
+
+    mock_winreg.CreateKeyEx.assert_called_once_with(root, key_path, 0, mock_winreg.KEY_WRITE | mock_winreg.KEY_WOW64_32KEY)
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
+
+
+def test_put_registry_values_uses_one_handle(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software"
+    key_path = r"MyApp"
+    full_path = r"Software\MyApp"
+
+    mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
+
+    registry_base.put_registry_values(
+        root, key_path,
+        {"Value1": ("Data1", mock_winreg.REG_SZ), "Value2": (2, mock_winreg.REG_DWORD)},
+        root_prefix=root_prefix,
+    )
+
+    # One CreateKeyEx/CloseKey pair for all values
+    mock_winreg.CreateKeyEx.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_WRITE)
+    mock_winreg.SetValueEx.assert_has_calls([
+        call(mock_winreg.mock_handle_2, "Value1", 0, mock_winreg.REG_SZ, "Data1"),
+        call(mock_winreg.mock_handle_2, "Value2", 0, mock_winreg.REG_DWORD, 2),
     ])
-    assert mock_winreg.CloseKey.call_count == 2
+    assert mock_winreg.SetValueEx.call_count == 2
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
+
+
+def test_put_registry_values_set_value_fails(mock_winreg):
+    """A failing SetValueEx is reported with its value name and the handle is still closed."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\MyApp"
+
+    mock_error = OSError(5, "Access is denied.")
+    mock_error.winerror = 5
+    mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
+    mock_winreg.SetValueEx.side_effect = [None, mock_error]
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError, match=re.escape(f"key '{key_path}', value 'Value2'")):
+        registry_base.put_registry_values(
+            root, key_path,
+            {"Value1": ("Data1", mock_winreg.REG_SZ), "Value2": ("Data2", mock_winreg.REG_SZ)},
+        )
+
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
+
+def test_put_registry_value_permission_denied_create_key(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software"
+    key_path = r"Restricted"
+    value_name = "MyValue"
+    full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
+
+    # Configure CreateKeyEx to fail with ERROR_ACCESS_DENIED (5)
+    error_code = 5
+    error_message_str = "Access is denied."
+    mock_error = OSError(error_code, error_message_str)
+    mock_error.winerror = error_code
+    mock_winreg.CreateKeyEx.side_effect = mock_error
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo:
+        registry_base.put_registry_value(root, key_path, value_name, "Data", mock_winreg.REG_SZ, root_prefix=root_prefix)
+
+    assert excinfo.value.args[0] == f"Registry operation failed on key '{full_path}', value '{value_name}' (WinError {error_code}: {error_message_str})"
+    mock_winreg.SetValueEx.assert_not_called()
+    # CreateKeyEx failed before returning a handle, so nothing is closed
+    mock_winreg.CloseKey.assert_not_called()
 
 
 def test_put_registry_value_permission_denied_set_value(mock_winreg):
@@ -179,10 +238,8 @@ def test_put_registry_value_permission_denied_set_value(mock_winreg):
     value_data = "Some Data"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Mock CreateKeyEx for ensure_registry_key_exists (simulates opening existing)
+    # Mock CreateKeyEx (simulates opening existing)
     mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_2
-    # Mock OpenKey for the RegistryKey context manager
-    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
     # Configure SetValueEx to fail with ERROR_ACCESS_DENIED (5)
     error_code = 5
     error_message_str = "Access is denied."
@@ -195,27 +252,19 @@ def test_put_registry_value_permission_denied_set_value(mock_winreg):
     expected_full_message = f"Registry operation failed on key '{full_path}', value '{value_name}' (WinError {error_code}: {error_message_str})"
     with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo: # Pass explicit type
         registry_base.put_registry_value(root, key_path, value_name, value_data, value_type=mock_winreg.REG_SZ, root_prefix=root_prefix)
+    assert excinfo.value.args[0] == expected_full_message
 
-    # Verify ensure_registry_key_exists was called and succeeded
     mock_winreg.CreateKeyEx.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_WRITE)
-    # Removed: mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
-
-    # Verify RegistryKey context manager was used
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_SET_VALUE)
     # Verify SetValueEx was called and failed
     mock_winreg.SetValueEx.assert_called_once_with(
-        mock_winreg.mock_handle_1,
+        mock_winreg.mock_handle_2,
         value_name,
         0,
         mock_winreg.REG_SZ,
         value_data
     )
-    # Verify the handle from OpenKey was closed by the context manager despite the error
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_2),
-        call(mock_winreg.mock_handle_1),
-    ])
-    assert mock_winreg.CloseKey.call_count == 2
+    # Verify the handle from CreateKeyEx was closed despite the error
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_2)
 
 
 def test_put_registry_subkey_creates_key(mock_winreg):
@@ -226,32 +275,13 @@ def test_put_registry_subkey_creates_key(mock_winreg):
     full_parent_path = os.path.join(root_prefix, key_path).replace('/', '\\')
     full_subkey_path = os.path.join(full_parent_path, subkey_name).replace('/', '\\')
 
-    # Mock CreateKeyEx for ensure_registry_key_exists (simulates opening parent)
-    # Mock CreateKeyEx again for the actual subkey creation
-    mock_winreg.CreateKeyEx.side_effect = [
-        mock_winreg.mock_handle_2, # For ensure_registry_key_exists
-        mock_winreg.mock_handle_1  # For the actual put_registry_subkey call
-    ]
+    # A single CreateKeyEx on the subkey path also creates any missing parents
+    mock_winreg.CreateKeyEx.return_value = mock_winreg.mock_handle_1
 
     registry_base.put_registry_subkey(root, key_path, subkey_name, root_prefix=root_prefix)
 
-    # Verify ensure_registry_key_exists was called for the parent
-    mock_winreg.CreateKeyEx.assert_has_calls([
-        call(root, full_parent_path, 0, mock_winreg.KEY_WRITE),
-    ])
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_2), # Close handle from ensure_registry_key_exists
-    ])
-
-    # Verify CreateKeyEx was called for the new subkey
-    mock_winreg.CreateKeyEx.assert_has_calls([
-        call(root, full_subkey_path, 0, mock_winreg.KEY_WRITE),
-    ])
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_1), # Close handle from put_registry_subkey
-    ])
-    assert mock_winreg.CreateKeyEx.call_count == 2
-    assert mock_winreg.CloseKey.call_count == 2
+    mock_winreg.CreateKeyEx.assert_called_once_with(root, full_subkey_path, 0, mock_winreg.KEY_WRITE)
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
 def test_put_registry_subkey_permission_denied_create(mock_winreg):
@@ -262,36 +292,21 @@ def test_put_registry_subkey_permission_denied_create(mock_winreg):
     full_parent_path = os.path.join(root_prefix, key_path).replace('/', '\\')
     full_subkey_path = os.path.join(full_parent_path, subkey_name).replace('/', '\\')
 
-    # Configure the second CreateKeyEx call (for the subkey) to fail
+    # Configure the CreateKeyEx call for the subkey to fail
     error_code = 5
     error_message_str = "Access is denied."
     mock_error = OSError(error_code, error_message_str)
     mock_error.winerror = error_code
-
-    # Mock CreateKeyEx side_effect list
-    mock_winreg.CreateKeyEx.side_effect = [
-        mock_winreg.mock_handle_2, # For ensure_registry_key_exists (success)
-        mock_error # For the actual put_registry_subkey call (fail)
-    ]
+    mock_winreg.CreateKeyEx.side_effect = mock_error
 
     # The expected message includes the WinError details added by _handle_winreg_error.
     # Use direct string comparison instead of regex match for clarity on failure.
     expected_full_message = f"Registry operation failed on key '{full_subkey_path}' (WinError {error_code}: {error_message_str})"
     with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo:
         registry_base.put_registry_subkey(root, key_path, subkey_name, root_prefix=root_prefix)
-
-    # Verify ensure_registry_key_exists was called and succeeded
-    mock_winreg.CreateKeyEx.assert_has_calls([
-        call(root, full_parent_path, 0, mock_winreg.KEY_WRITE),
-    ])
-    mock_winreg.CloseKey.assert_has_calls([
-        call(mock_winreg.mock_handle_2),
-    ])
+    assert excinfo.value.args[0] == expected_full_message
 
     # Verify CreateKeyEx was called for the new subkey and failed
-    mock_winreg.CreateKeyEx.assert_has_calls([
-        call(root, full_subkey_path, 0, mock_winreg.KEY_WRITE),
-    ])
-    assert mock_winreg.CreateKeyEx.call_count == 2
-    # Only the first handle should have been closed
-    assert mock_winreg.CloseKey.call_count == 1
+    mock_winreg.CreateKeyEx.assert_called_once_with(root, full_subkey_path, 0, mock_winreg.KEY_WRITE)
+    # No handle was returned, so nothing is closed
+    mock_winreg.CloseKey.assert_not_called()
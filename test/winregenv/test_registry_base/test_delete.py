@@ -150,6 +150,26 @@ def test_delete_registry_key_success_empty(mock_winreg):
     assert mock_winreg.DeleteKey.call_count == 1
 
 
+def test_delete_registry_key_directly_under_root(mock_winreg):
+    """A key with no backslash in its path is deleted through the root key itself (empty parent path)."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = "TopLevelKey"
+
+    mock_winreg.OpenKey.side_effect = [
+        mock_winreg.mock_handle_3, # For the key being deleted (check)
+        mock_winreg.mock_handle_1  # For the parent (root) key (delete)
+    ]
+    mock_winreg.QueryInfoKey.return_value = (0, 0, 12345678901234567)
+
+    registry_base.delete_registry_key(root, key_path)
+
+    mock_winreg.OpenKey.assert_has_calls([
+        call(root, key_path, 0, mock_winreg.KEY_READ),
+        call(root, "", 0, mock_winreg.KEY_CREATE_SUB_KEY),
+    ])
+    mock_winreg.DeleteKey.assert_called_once_with(mock_winreg.mock_handle_1, key_path)
+
+
 def test_delete_registry_key_fails_if_has_subkeys(mock_winreg):
     root = mock_winreg.HKEY_CURRENT_USER
     root_prefix = r"Software\MyApp"
@@ -350,6 +370,54 @@ def test_delete_registry_key_permission_denied_delete(mock_winreg):
     assert mock_winreg.CloseKey.call_count == 1 # Only the first handle was closed
 
 
+
+def test_delete_registry_key_permission_denied_delete_reports_child_path(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software\App"
+    key_path = "Child"
+    full_path = r"Software\App\Child"
+
+    # Both opens succeed; DeleteKey itself is denied.
+    mock_winreg.OpenKey.side_effect = [mock_winreg.mock_handle_3, mock_winreg.mock_handle_1]
+    mock_winreg.QueryInfoKey.return_value = (0, 0, 12345678901234567)
+    error_code = 5
+    error_message_str = "Access is denied."
+    mock_winreg.DeleteKey.side_effect = lambda *args, **kwargs: _raise_os_error(error_code, error_message_str)
+
+    # The already-translated error must be re-raised unchanged, not re-wrapped
+    # against the parent key by the outer handler.
+    expected_full_message = f"Registry operation failed on key '{full_path}' (WinError {error_code}: {error_message_str})"
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo:
+        registry_base.delete_registry_key(root, key_path, root_prefix=root_prefix)
+
+    assert str(excinfo.value) == expected_full_message
+    assert excinfo.value.winerror == error_code
+    mock_winreg.DeleteKey.assert_called_once_with(mock_winreg.mock_handle_1, key_path)
+    assert mock_winreg.CloseKey.call_count == 2
+
+
+def test_delete_registry_value_permission_denied_reports_value_name(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software"
+    key_path = r"MyApp\Settings"
+    value_name = "ProtectedValue"
+    full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
+
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    error_code = 5
+    error_message_str = "Access is denied."
+    mock_winreg.DeleteValue.side_effect = lambda *args, **kwargs: _raise_os_error(error_code, error_message_str)
+
+    expected_full_message = f"Registry operation failed on key '{full_path}', value '{value_name}' (WinError {error_code}: {error_message_str})"
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo:
+        registry_base.delete_registry_value(root, key_path, value_name, root_prefix=root_prefix)
+
+    assert str(excinfo.value) == expected_full_message
+    mock_winreg.DeleteValue.assert_called_once_with(mock_winreg.mock_handle_1, value_name)
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
 def test_delete_registry_key_value_error_on_root(mock_winreg):
     root = mock_winreg.HKEY_CURRENT_USER
     root_prefix = ""
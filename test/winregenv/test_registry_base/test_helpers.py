@@ -1,5 +1,4 @@
 import pytest
-import os # Needed for os.path.join in tests
 
 # Import the module containing the helper function
 from winregenv import registry_base
@@ -11,6 +10,8 @@ def test__join_registry_paths():
     assert registry_base._join_registry_paths("", "") == ""
     assert registry_base._join_registry_paths("Prefix", "") == "Prefix"
     assert registry_base._join_registry_paths("", "Path") == "Path"
-    assert registry_base._join_registry_paths("Prefix", "Path") == os.path.join("Prefix", "Path").replace('/', '\\')
-    assert registry_base._join_registry_paths("Prefix\\Sub", "Path\\To\\Key") == os.path.join("Prefix\\Sub", "Path\\To\\Key").replace('/', '\\')
-    assert registry_base._join_registry_paths("Prefix/Sub", "Path/To/Key") == os.path.join("Prefix/Sub", "Path/To/Key").replace('/', '\\') # Handles forward slashes
+    assert registry_base._join_registry_paths("Prefix", "Path") == "Prefix\\Path"
+    assert registry_base._join_registry_paths("Prefix\\Sub", "Path\\To\\Key") == "Prefix\\Sub\\Path\\To\\Key"
+    assert registry_base._join_registry_paths("Prefix/Sub", "Path/To/Key") == "Prefix\\Sub\\Path\\To\\Key" # Handles forward slashes
+    assert registry_base._join_registry_paths("Prefix\\", "Path") == "Prefix\\Path" # No doubled separator
+    assert registry_base._join_registry_paths("Prefix/", "Path") == "Prefix\\Path"
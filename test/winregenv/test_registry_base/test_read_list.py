@@ -6,6 +6,7 @@ import re # Needed for re.escape in pytest.raises match
 from datetime import datetime, timezone # Needed for head_registry_key timestamp conversion and UTC
 
 import winregenv.registry_errors
+import winregenv.registry_types
 # Import the module containing the functions to test
 from winregenv import registry_base
 
@@ -88,26 +89,84 @@ def test_get_registry_value_value_not_found(mock_winreg):
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
+def test_get_registry_value_key_permission_denied(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software"
+    key_path = r"RestrictedKey"
+    value_name = "MyValue"
+    full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
+
+    # Configure OpenKey to fail with ERROR_ACCESS_DENIED (5)
+    error_code = 5
+    error_message_str = "Access is denied."
+    mock_error = OSError(error_code, error_message_str)
+    mock_error.winerror = error_code
+    mock_winreg.OpenKey.side_effect = mock_error
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError) as excinfo:
+        registry_base.get_registry_value(root, key_path, value_name, root_prefix=root_prefix)
+
+    # The failure is on opening the key, so the message must not name the value
+    assert str(excinfo.value) == f"Registry operation failed on key '{full_path}' (WinError {error_code}: {error_message_str})"
+    mock_winreg.QueryValueEx.assert_not_called()
+    mock_winreg.CloseKey.assert_not_called()
+
+
+def test_get_registry_values_one_open_skips_missing(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software\MyApp"
+    key_path = r"Settings"
+    full_path = r"Software\MyApp\Settings"
+
+    error_value_not_found = OSError(2, "The system cannot find the file specified.")
+    error_value_not_found.winerror = 2
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryValueEx.side_effect = [
+        ("Data1", mock_winreg.REG_SZ),
+        error_value_not_found,
+        (42, mock_winreg.REG_DWORD),
+    ]
+
+    values = registry_base.get_registry_values(root, key_path, ["Value1", "Missing", "Value3"], root_prefix=root_prefix)
+
+    assert values == {
+        "Value1": ("Value1", "Data1", mock_winreg.REG_SZ),
+        "Value3": ("Value3", 42, mock_winreg.REG_DWORD),
+    }
+    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
+    assert mock_winreg.QueryValueEx.call_count == 3
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
+
+def test_get_registry_values_permission_denied(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\MyApp"
+
+    error_access_denied = OSError(5, "Access is denied.")
+    error_access_denied.winerror = 5
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryValueEx.side_effect = error_access_denied
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError, match=re.escape(f"key '{key_path}', value 'Secret'")):
+        registry_base.get_registry_values(root, key_path, ["Secret"])
+
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
 def test_list_registry_values_success(mock_winreg):
     root = mock_winreg.HKEY_CURRENT_USER
     root_prefix = r"Software"
     key_path = r"MyApp\Settings"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Configure mock errors
-    error_code_no_more_items = 259
-    error_message_str_no_more_items = "No more data is available."
-    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
-    mock_error_no_more_items.winerror = error_code_no_more_items
-
     # Mock OpenKey for the RegistryKey context manager
     mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    # QueryInfoKey reports the number of values to enumerate
+    mock_winreg.QueryInfoKey.return_value = (0, 3, 133485408000000000) # num_subkeys, num_values, last_write_time_ft
     # Configure EnumValue for all values (including default)
     mock_winreg.EnumValue.side_effect = [
         ("", "DefaultValue", mock_winreg.REG_SZ), # Default value comes first in enumeration
         ("Value1", "Data1", mock_winreg.REG_SZ),
         ("Value2", 123, mock_winreg.REG_DWORD),
-        mock_error_no_more_items # End of enumeration
     ]
 
     expected_values = [
@@ -124,13 +183,13 @@ def test_list_registry_values_success(mock_winreg):
     mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
     # Verify QueryValueEx was NOT called
     mock_winreg.QueryValueEx.assert_not_called()
-    # Verify EnumValue was called until the end
-    assert mock_winreg.EnumValue.call_count == 4 # Called thrice for values, once to get the end error
+    mock_winreg.QueryInfoKey.assert_called_once_with(mock_winreg.mock_handle_1)
+    # Verify EnumValue was called exactly once per reported value (no end-of-enumeration probe)
+    assert mock_winreg.EnumValue.call_count == 3
     mock_winreg.EnumValue.assert_has_calls([
         call(mock_winreg.mock_handle_1, 0), # Default value
         call(mock_winreg.mock_handle_1, 1), # Value1
         call(mock_winreg.mock_handle_1, 2), # Value2
-        call(mock_winreg.mock_handle_1, 3), # Error trigger
     ])
     # Verify handle was closed
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
@@ -142,18 +201,12 @@ def test_list_registry_values_no_default_value(mock_winreg):
     key_path = r"MyApp\Settings"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Configure mock errors
-    error_code_no_more_items = 259
-    error_message_str_no_more_items = "No more data is available."
-    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
-    mock_error_no_more_items.winerror = error_code_no_more_items
-
     # Mock OpenKey for the RegistryKey context manager
     mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryInfoKey.return_value = (0, 1, 133485408000000000) # num_subkeys, num_values, last_write_time_ft
     # Configure EnumValue for named values (no default value in enumeration)
     mock_winreg.EnumValue.side_effect = [
         ("Value1", "Data1", mock_winreg.REG_SZ),
-        mock_error_no_more_items # End of enumeration
     ]
 
     expected_values = [
@@ -167,7 +220,7 @@ def test_list_registry_values_no_default_value(mock_winreg):
     mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
     # Verify QueryValueEx was NOT called
     mock_winreg.QueryValueEx.assert_not_called()
-    assert mock_winreg.EnumValue.call_count == 2
+    assert mock_winreg.EnumValue.call_count == 1
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
@@ -177,16 +230,10 @@ def test_list_registry_values_empty_key(mock_winreg):
     key_path = r"EmptyKey"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Configure mock error
-    error_code_no_more_items = 259
-    error_message_str_no_more_items = "No more data is available."
-    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
-    mock_error_no_more_items.winerror = error_code_no_more_items
-
     # Mock OpenKey for the RegistryKey context manager
     mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
-    # Configure EnumValue for named values (no named values)
-    mock_winreg.EnumValue.side_effect = mock_error_no_more_items
+    # QueryInfoKey reports no values
+    mock_winreg.QueryInfoKey.return_value = (0, 0, 133485408000000000) # num_subkeys, num_values, last_write_time_ft
 
     expected_values = [] # Should return empty list
 
@@ -197,7 +244,52 @@ def test_list_registry_values_empty_key(mock_winreg):
     mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
     # Verify QueryValueEx was NOT called
     mock_winreg.QueryValueEx.assert_not_called()
-    assert mock_winreg.EnumValue.call_count == 1 # Called once, gets end error immediately
+    mock_winreg.EnumValue.assert_not_called() # Nothing to enumerate
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
+
+def test_list_registry_values_key_shrinks_during_enumeration(mock_winreg):
+    """If values are deleted after QueryInfoKey, ERROR_NO_MORE_ITEMS ends the enumeration early."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\MyApp"
+
+    # Configure mock error
+    error_code_no_more_items = 259
+    error_message_str_no_more_items = "No more data is available."
+    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
+    mock_error_no_more_items.winerror = error_code_no_more_items
+
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryInfoKey.return_value = (0, 3, 133485408000000000) # Reports 3 values...
+    mock_winreg.EnumValue.side_effect = [
+        ("Value1", "Data1", mock_winreg.REG_SZ),
+        mock_error_no_more_items # ...but only 1 is left
+    ]
+
+    values = registry_base.list_registry_values(root, key_path)
+
+    assert values == [("Value1", "Data1", mock_winreg.REG_SZ)]
+    assert mock_winreg.EnumValue.call_count == 2
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
+
+def test_list_registry_values_enumeration_error(mock_winreg):
+    """Errors other than ERROR_NO_MORE_ITEMS during enumeration are translated."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\MyApp"
+
+    # Configure EnumValue to fail with ERROR_ACCESS_DENIED (5)
+    error_code = 5
+    mock_error = OSError(error_code, "Access is denied.")
+    mock_error.winerror = error_code
+
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryInfoKey.return_value = (0, 2, 133485408000000000)
+    mock_winreg.EnumValue.side_effect = mock_error
+
+    with pytest.raises(winregenv.registry_errors.RegistryPermissionError, match=re.escape(f"Registry operation failed on key '{key_path}'")):
+        registry_base.list_registry_values(root, key_path)
+
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
@@ -219,6 +311,7 @@ def test_list_registry_values_key_not_found(mock_winreg):
 
     mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
     mock_winreg.QueryValueEx.assert_not_called()
+    mock_winreg.QueryInfoKey.assert_not_called()
     mock_winreg.EnumValue.assert_not_called()
     mock_winreg.CloseKey.assert_not_called()
 
@@ -229,19 +322,14 @@ def test_list_registry_subkeys_success(mock_winreg):
     key_path = r"MyApp"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Configure mock error
-    error_code_no_more_items = 259
-    error_message_str_no_more_items = "No more data is available."
-    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
-    mock_error_no_more_items.winerror = error_code_no_more_items
-
     # Mock OpenKey for the RegistryKey context manager
     mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    # QueryInfoKey reports the number of subkeys to enumerate
+    mock_winreg.QueryInfoKey.return_value = (2, 0, 133485408000000000) # num_subkeys, num_values, last_write_time_ft
     # Configure EnumKey for subkeys
     mock_winreg.EnumKey.side_effect = [
         "Subkey1",
         "Subkey2",
-        mock_error_no_more_items # End of enumeration
     ]
 
     expected_subkeys = ["Subkey1", "Subkey2"]
@@ -251,34 +339,52 @@ def test_list_registry_subkeys_success(mock_winreg):
     assert subkeys == expected_subkeys
 
     # Verify RegistryKey context manager was used with the full path
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS)
-    # Verify EnumKey was called until the end
-    assert mock_winreg.EnumKey.call_count == 3 # Called twice for names, once to get the end error
+    # KEY_QUERY_VALUE is needed in addition to KEY_ENUMERATE_SUB_KEYS for QueryInfoKey
+    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS | mock_winreg.KEY_QUERY_VALUE)
+    mock_winreg.QueryInfoKey.assert_called_once_with(mock_winreg.mock_handle_1)
+    # Verify EnumKey was called exactly once per reported subkey (no end-of-enumeration probe)
+    assert mock_winreg.EnumKey.call_count == 2
     mock_winreg.EnumKey.assert_has_calls([
         call(mock_winreg.mock_handle_1, 0),
         call(mock_winreg.mock_handle_1, 1),
-        call(mock_winreg.mock_handle_1, 2),
     ])
     # Verify handle was closed
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
+def test_list_registry_subkeys_enumerate_only_access(mock_winreg):
+    """A key that allows enumeration but not query is still listed, probing for the end instead."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    full_path = r"Software\MyApp"
+
+    denied = OSError(5, "Access is denied.")
+    denied.winerror = 5
+    no_more_items = OSError(259, "No more data is available.")
+    no_more_items.winerror = 259
+    mock_winreg.OpenKey.side_effect = [denied, mock_winreg.mock_handle_1]
+    mock_winreg.EnumKey.side_effect = ["Subkey1", "Subkey2", no_more_items]
+
+    subkeys = registry_base.list_registry_subkeys(root, "MyApp", root_prefix="Software")
+
+    assert subkeys == ["Subkey1", "Subkey2"]
+    mock_winreg.OpenKey.assert_has_calls([
+        call(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS | mock_winreg.KEY_QUERY_VALUE),
+        call(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS),
+    ])
+    mock_winreg.QueryInfoKey.assert_not_called()
+    assert mock_winreg.EnumKey.call_count == 3
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
 def test_list_registry_subkeys_empty_key(mock_winreg):
     root = mock_winreg.HKEY_CURRENT_USER
     root_prefix = r"Software"
     key_path = r"EmptyKey"
     full_path = os.path.join(root_prefix, key_path).replace('/', '\\')
 
-    # Configure mock error
-    error_code_no_more_items = 259
-    error_message_str_no_more_items = "No more data is available."
-    mock_error_no_more_items = OSError(error_code_no_more_items, error_message_str_no_more_items)
-    mock_error_no_more_items.winerror = error_code_no_more_items
-
     # Mock OpenKey for the RegistryKey context manager
     mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
-    # Configure EnumKey for subkeys (no subkeys)
-    mock_winreg.EnumKey.side_effect = mock_error_no_more_items
+    # QueryInfoKey reports no subkeys
+    mock_winreg.QueryInfoKey.return_value = (0, 0, 133485408000000000) # num_subkeys, num_values, last_write_time_ft
 
     expected_subkeys = [] # Should return empty list
 
@@ -286,8 +392,8 @@ def test_list_registry_subkeys_empty_key(mock_winreg):
 
     assert subkeys == expected_subkeys
 
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS)
-    assert mock_winreg.EnumKey.call_count == 1 # Called once, gets end error immediately
+    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS | mock_winreg.KEY_QUERY_VALUE)
+    mock_winreg.EnumKey.assert_not_called() # Nothing to enumerate
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
@@ -307,7 +413,8 @@ def test_list_registry_subkeys_key_not_found(mock_winreg):
     with pytest.raises(winregenv.registry_errors.RegistryKeyNotFoundError, match=re.escape(f"Registry operation failed on key '{full_path}'")):
         registry_base.list_registry_subkeys(root, key_path, root_prefix=root_prefix)
 
-    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS)
+    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_ENUMERATE_SUB_KEYS | mock_winreg.KEY_QUERY_VALUE)
+    mock_winreg.QueryInfoKey.assert_not_called()
     mock_winreg.EnumKey.assert_not_called()
     mock_winreg.CloseKey.assert_not_called()
 
@@ -334,6 +441,8 @@ def test_head_registry_key_success(mock_winreg):
     metadata = registry_base.head_registry_key(root, key_path, root_prefix=root_prefix)
 
     assert metadata == expected_metadata
+    assert isinstance(metadata, winregenv.registry_types.RegistryKeyInfo)
+    assert metadata.num_subkeys == 5
 
     # Verify RegistryKey context manager was used with the full path
     mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
@@ -343,6 +452,74 @@ def test_head_registry_key_success(mock_winreg):
     mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
 
 
+def test_head_registry_key_sub_second_precision(mock_winreg):
+    """FILETIME converts exactly to the microsecond; the remaining 100ns digit is truncated."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    # 2024-01-01 00:00:00 UTC plus 0.1234567 seconds
+    mock_winreg.QueryInfoKey.return_value = (0, 0, 133485408000000000 + 1234567)
+
+    metadata = registry_base.head_registry_key(root, r"Software\MyApp")
+
+    assert metadata["last_write_time"] == datetime(2024, 1, 1, 0, 0, 0, 123456, tzinfo=timezone.utc)
+    assert metadata["last_write_time"].tzinfo is timezone.utc
+
+
+def test_walk_registry_key_success(mock_winreg):
+    """Subkeys, values and metadata are all read through one handle and one QueryInfoKey call."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    root_prefix = r"Software"
+    key_path = r"MyApp"
+    full_path = r"Software\MyApp"
+
+    mock_winreg.OpenKey.return_value = mock_winreg.mock_handle_1
+    mock_winreg.QueryInfoKey.return_value = (2, 1, 133485408000000000)
+    mock_winreg.EnumKey.side_effect = ["SubKey1", "SubKey2"]
+    mock_winreg.EnumValue.side_effect = [("Value1", "Data1", mock_winreg.REG_SZ)]
+
+    result = registry_base.walk_registry_key(root, key_path, root_prefix=root_prefix)
+
+    assert isinstance(result, winregenv.registry_types.RegistryKeyWalk)
+    assert result.subkeys == ["SubKey1", "SubKey2"]
+    assert result.values == [("Value1", "Data1", mock_winreg.REG_SZ)]
+    assert result.num_subkeys == 2
+    assert result.num_values == 1
+    assert result.last_write_time == datetime(2024, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+    mock_winreg.OpenKey.assert_called_once_with(root, full_path, 0, mock_winreg.KEY_READ)
+    mock_winreg.QueryInfoKey.assert_called_once_with(mock_winreg.mock_handle_1)
+    assert mock_winreg.EnumKey.call_count == 2
+    assert mock_winreg.EnumValue.call_count == 1
+    mock_winreg.CloseKey.assert_called_once_with(mock_winreg.mock_handle_1)
+
+
+def test_list_registry_subkeys_with_key_handle(mock_winreg):
+    """A caller-supplied handle is used as-is: the key is neither opened nor closed."""
+    root = mock_winreg.HKEY_CURRENT_USER
+    handle = mock_winreg.mock_handle_3
+    mock_winreg.QueryInfoKey.return_value = (1, 0, 133485408000000000)
+    mock_winreg.EnumKey.side_effect = ["SubKey1"]
+
+    subkeys = registry_base.list_registry_subkeys(root, r"Software\MyApp", key_handle=handle)
+
+    assert subkeys == ["SubKey1"]
+    mock_winreg.OpenKey.assert_not_called()
+    mock_winreg.QueryInfoKey.assert_called_once_with(handle)
+    mock_winreg.CloseKey.assert_not_called()
+
+def test_walk_registry_key_key_not_found(mock_winreg):
+    root = mock_winreg.HKEY_CURRENT_USER
+    key_path = r"Software\NonExistentKey"
+
+    mock_error = OSError(2, "The system cannot find the file specified.")
+    mock_error.winerror = 2
+    mock_winreg.OpenKey.side_effect = mock_error
+
+    with pytest.raises(winregenv.registry_errors.RegistryKeyNotFoundError):
+        registry_base.walk_registry_key(root, key_path)
+
+    mock_winreg.QueryInfoKey.assert_not_called()
+    mock_winreg.CloseKey.assert_not_called()
+
 def test_head_registry_key_key_not_found(mock_winreg):
     root = mock_winreg.HKEY_CURRENT_USER
     root_prefix = r"Software"
@@ -85,4 +85,9 @@ def mock_winreg(): # Corrected patch target
         mock.mock_handle_2 = mock_handle_2
         mock.mock_handle_3 = mock_handle_3 # Handle for the key being checked in delete_registry_key
 
-        yield mock
+        # registry_context_managers binds OpenKey/CloseKey at import time; point those
+        # aliases at the same child mocks so tests can configure mock.<Function>.
+        with patch('winregenv.registry_context_managers._OpenKey', new=mock.OpenKey), \
+                patch('winregenv.registry_context_managers._CloseKey', new=mock.CloseKey), \
+                patch('winregenv.registry_context_managers._KEY_WOW64_32KEY', new=mock.KEY_WOW64_32KEY):
+            yield mock
@@ -4,6 +4,8 @@ import time # For sleep in retry
 import sys # Import sys for error logging in cleanup
 import winreg # For constants used in fixtures and setup
 
+from winregenv.registry_types import RegistryKeyWalk
+
 # --- Fixtures for Mocking Dependencies ---
 
 @pytest.fixture
@@ -12,11 +14,14 @@ def patched_registry_base_funcs():
     # Define the functions imported and used by RegistryRoot methods
     functions_to_patch = {
         'put_registry_value': None, # Default return value
+        'put_registry_values': None,
         'put_registry_subkey': None,
         'get_registry_value': ("mock_data", winreg.REG_SZ),
+        'get_registry_values': {},
         'list_registry_values': [],
         'list_registry_subkeys': [],
         'head_registry_key': {"num_subkeys": 0, "num_values": 0, "last_write_time": MagicMock()},
+        'walk_registry_key': RegistryKeyWalk([], [], 0, 0, MagicMock()),
         'delete_registry_value': None,
         'delete_registry_key': None,
         # Note: ensure_registry_key_exists is NOT directly called by RegistryRoot methods,
@@ -46,6 +46,7 @@ def test_init_non_elevation_required_read_only_success(mock_elevation_check):
 
 @pytest.mark.parametrize("method_name, args", [
     ('put_registry_value', ('some\\key', 'some_value', 'data')),
+    ('put_registry_values', ('some\\key', {'some_value': 'data'})),
     ('put_registry_subkey', ('some\\key', 'new_subkey')),
     ('delete_registry_value', ('some\\key', 'value_to_delete')),
     ('delete_registry_key', ('key_to_delete',)),
@@ -75,6 +76,7 @@ def test_write_delete_methods_raise_permission_error_in_read_only(
 
 @pytest.mark.parametrize("method_name, args", [
     ('get_registry_value', ('some\\key', 'some_value')),
+    ('get_registry_values', ('some\\key', ['some_value'])),
     ('list_registry_values', ('some\\key',)),
     ('list_registry_subkeys', ('some\\key',)),
     ('head_registry_key', ('some\\key',)),
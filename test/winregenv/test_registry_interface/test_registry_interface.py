@@ -1,11 +1,12 @@
 import pytest
-from unittest.mock import call
+from unittest.mock import call, patch, MagicMock
 import winreg # For constants
 # Fixtures are now in conftest.py
 
 import re # Import re for regex matching
 # Import the class and exceptions to test
 from winregenv.registry_interface import RegistryRoot
+from winregenv.registry_types import RegistryKeyWalk
 from winregenv.registry_errors import RegistryError, RegistryKeyNotFoundError, RegistryValueNotFoundError, \
     RegistryKeyNotEmptyError, RegistryPermissionError
 
@@ -29,6 +30,10 @@ def test_init_valid_root_keys(mock_elevation_check):
     instance_str_hkcu = RegistryRoot(root_str_hkcu)
     assert instance_str_hkcu.root_key == winreg.HKEY_CURRENT_USER
 
+    # Test string root key lookup is case-insensitive
+    assert RegistryRoot("hkcu").root_key == winreg.HKEY_CURRENT_USER
+    assert RegistryRoot("HkCu").root_key == winreg.HKEY_CURRENT_USER
+
     # Test string root key (full name)
     root_str_hklm = "HKEY_LOCAL_MACHINE"
     # Mock is_elevated is not called during init anymore
@@ -43,6 +48,10 @@ def test_init_invalid_root_keys():
     with pytest.raises(TypeError, match="Root key must be an integer or string"):
         RegistryRoot(123.45)
 
+    # bool is an int subclass but never a valid root key
+    with pytest.raises(TypeError, match="Root key must be an integer or string"):
+        RegistryRoot(True)
+
 
 def test_init_parameters_stored():
     root = winreg.HKEY_CURRENT_USER
@@ -211,6 +220,180 @@ def test_delete_registry_key_delegates_correctly(patched_registry_base_funcs):
         access_32bit_view=view_32bit
     )
 
+def test_put_registry_values_delegates_correctly(patched_registry_base_funcs, patched_registry_translation_funcs):
+    root = winreg.HKEY_CURRENT_USER
+    prefix = r"Software\MyApp"
+    key_path = r"Settings"
+    view_32bit = True
+
+    instance = RegistryRoot(root, root_prefix=prefix, access_32bit_view=view_32bit)
+
+    # Inferred types for "Name"/"Count", explicit type for "Path"
+    patched_registry_translation_funcs['_infer_registry_type_for_new_value'].side_effect = [
+        ("Data", winreg.REG_SZ),
+        (5, winreg.REG_DWORD),
+    ]
+
+    instance.put_registry_values(
+        key_path,
+        {"Name": "Data", "Path": "%TEMP%", "Count": 5},
+        value_types={"Path": winreg.REG_EXPAND_SZ},
+    )
+
+    patched_registry_translation_funcs['_normalize_registry_type_input'].assert_called_once_with(winreg.REG_EXPAND_SZ)
+    patched_registry_translation_funcs['_validate_and_convert_data_for_type'].assert_called_once_with("%TEMP%", winreg.REG_EXPAND_SZ)
+    patched_registry_base_funcs['put_registry_values'].assert_called_once_with(
+        root_key=root,
+        key_path=key_path,
+        values={
+            "Name": ("Data", winreg.REG_SZ),
+            "Path": ("%TEMP%", winreg.REG_EXPAND_SZ),
+            "Count": (5, winreg.REG_DWORD),
+        },
+        root_prefix=prefix,
+        access_32bit_view=view_32bit
+    )
+
+def test_get_registry_values_delegates_correctly(patched_registry_base_funcs):
+    root = winreg.HKEY_CURRENT_USER
+    prefix = r"Software\MyApp"
+    key_path = r"Settings"
+    view_32bit = True
+
+    instance = RegistryRoot(root, root_prefix=prefix, access_32bit_view=view_32bit)
+
+    instance.get_registry_values(key_path, ["Value1", "Value2"])
+
+    patched_registry_base_funcs['get_registry_values'].assert_called_once_with(
+        root_key=root,
+        key_path=key_path,
+        value_names=["Value1", "Value2"],
+        root_prefix=prefix,
+        access_32bit_view=view_32bit
+    )
+
+
+@pytest.fixture
+def patched_handle_cache_ops():
+    """Mocks the key open/close calls RegistryRoot makes when cache_handles=True."""
+    with patch('winregenv.registry_interface._open_registry_key') as mock_open, \
+            patch('winregenv.registry_interface.winreg.CloseKey') as mock_close:
+        mock_open.return_value = MagicMock(name="cached_handle")
+        yield mock_open, mock_close
+
+
+def test_cache_handles_reuses_one_handle_per_key(patched_registry_base_funcs, patched_handle_cache_ops):
+    mock_open, mock_close = patched_handle_cache_ops
+    root = winreg.HKEY_CURRENT_USER
+    prefix = r"Software\MyApp"
+    handle = mock_open.return_value
+
+    with RegistryRoot(root, root_prefix=prefix, cache_handles=True) as instance:
+        instance.get_registry_value("Settings", "Value1")
+        instance.get_registry_value("Settings", "Value2")
+        instance.head_registry_key("Settings")
+
+        # The key is opened once and its handle passed to every read
+        mock_open.assert_called_once_with(root, r"Software\MyApp\Settings", winreg.KEY_READ, False)
+        patched_registry_base_funcs['get_registry_value'].assert_called_with(
+            root_key=root,
+            key_path="Settings",
+            root_prefix=prefix,
+            access_32bit_view=False,
+            key_handle=handle,
+            value_name="Value2",
+        )
+        assert patched_registry_base_funcs['head_registry_key'].call_args.kwargs['key_handle'] is handle
+        mock_close.assert_not_called()
+
+    # Leaving the context closes the cached handle
+    mock_close.assert_called_once_with(handle)
+
+
+def test_cache_handles_drops_handle_after_error(patched_registry_base_funcs, patched_handle_cache_ops):
+    """A read error other than a missing value discards the cached handle so the key is reopened."""
+    mock_open, mock_close = patched_handle_cache_ops
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER, cache_handles=True)
+
+    patched_registry_base_funcs['get_registry_value'].side_effect = RegistryValueNotFoundError("missing")
+    with pytest.raises(RegistryValueNotFoundError):
+        instance.get_registry_value("Settings", "Missing")
+    mock_close.assert_not_called()
+
+    # The cached handle fails, and so does the retry on a freshly opened one
+    patched_registry_base_funcs['list_registry_values'].side_effect = RegistryError("key deleted")
+    with pytest.raises(RegistryError):
+        instance.list_registry_values("Settings")
+    assert mock_open.call_count == 2
+    assert mock_close.call_count == 2
+
+    patched_registry_base_funcs['list_registry_values'].side_effect = None
+    instance.list_registry_values("Settings")
+    assert mock_open.call_count == 3
+
+
+def test_cache_handles_retries_stale_handle(patched_registry_base_funcs, patched_handle_cache_ops):
+    """A key deleted and recreated elsewhere (ERROR_KEY_DELETED on the old handle) is reopened and read again."""
+    mock_open, mock_close = patched_handle_cache_ops
+    stale_handle, fresh_handle = MagicMock(name="stale"), MagicMock(name="fresh")
+    mock_open.side_effect = [stale_handle, fresh_handle]
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER, cache_handles=True)
+    head = patched_registry_base_funcs['head_registry_key']
+
+    instance.head_registry_key("Settings")
+    head.side_effect = [RegistryError("Illegal operation attempted on a registry key that has been marked for deletion.", winerror=1018), "info"]
+
+    assert instance.head_registry_key("Settings") == "info"
+    assert head.call_args_list[1].kwargs['key_handle'] is stale_handle
+    assert head.call_args_list[2].kwargs['key_handle'] is fresh_handle
+    mock_close.assert_called_once_with(stale_handle)
+
+    # The fresh handle replaced the stale one in the cache
+    instance.close()
+    mock_close.assert_called_with(fresh_handle)
+
+
+def test_cache_handles_reads_run_without_the_lock(patched_registry_base_funcs, patched_handle_cache_ops):
+    """Reads don't hold the cache lock, and a handle closed by close() mid-read stays open until the read ends."""
+    mock_open, mock_close = patched_handle_cache_ops
+    handle = mock_open.return_value
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER, cache_handles=True)
+
+    def read_while_closing(**kwargs):
+        assert not instance._handle_cache_lock.locked()
+        instance.close()
+        mock_close.assert_not_called()
+        return []
+
+    patched_registry_base_funcs['list_registry_subkeys'].side_effect = read_while_closing
+    instance.list_registry_subkeys("Settings")
+
+    mock_close.assert_called_once_with(handle)
+    assert not instance._handle_cache
+
+
+def test_cache_handles_eviction_waits_for_readers(patched_registry_base_funcs, patched_handle_cache_ops, monkeypatch):
+    """An entry evicted while in use is closed by its last reader rather than on eviction."""
+    mock_open, mock_close = patched_handle_cache_ops
+    first_handle, second_handle = MagicMock(name="first"), MagicMock(name="second")
+    mock_open.side_effect = [first_handle, second_handle]
+    monkeypatch.setattr('winregenv.registry_interface._HANDLE_CACHE_SIZE', 1)
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER, cache_handles=True)
+
+    def read_first(**kwargs):
+        # Reading another key evicts "First" from the one-entry cache while it is in use
+        patched_registry_base_funcs['head_registry_key'].side_effect = None
+        instance.head_registry_key("Second")
+        mock_close.assert_not_called()
+        return "info"
+
+    patched_registry_base_funcs['head_registry_key'].side_effect = read_first
+    assert instance.head_registry_key("First") == "info"
+
+    mock_close.assert_called_once_with(first_handle)
+    assert list(instance._handle_cache) == ["Second"]
+
+
 # Add similar delegation tests for other methods:
 # put_registry_subkey, list_registry_values, list_registry_subkeys, head_registry_key
 # Example for put_registry_subkey:
@@ -286,3 +469,72 @@ def test_head_registry_key_delegates_correctly(patched_registry_base_funcs):
         root_prefix=prefix,
         access_32bit_view=view_32bit
     )
+
+def test_walk_yields_subtree_breadth_first(patched_registry_base_funcs):
+    tree = {
+        r"Software\MyApp\Settings": ["A", "B"],
+        r"Software\MyApp\Settings\A": ["C"],
+        r"Software\MyApp\Settings\B": [],
+        r"Software\MyApp\Settings\A\C": [],
+    }
+
+    def fake_walk(root_key, key_path, root_prefix, access_32bit_view):
+        # Keys are read by full path, without the prefix being joined again
+        assert root_prefix == ""
+        return RegistryKeyWalk(tree[key_path], [key_path], len(tree[key_path]), 1, None)
+
+    patched_registry_base_funcs['walk_registry_key'].side_effect = fake_walk
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER, root_prefix=r"Software\MyApp")
+
+    result = list(instance.walk(r"Settings", max_workers=2))
+
+    assert result == [
+        (r"Settings", ["A", "B"], [r"Software\MyApp\Settings"]),
+        (r"Settings\A", ["C"], [r"Software\MyApp\Settings\A"]),
+        (r"Settings\B", [], [r"Software\MyApp\Settings\B"]),
+        (r"Settings\A\C", [], [r"Software\MyApp\Settings\A\C"]),
+    ]
+
+def test_walk_keeps_forward_slashes_in_key_names(patched_registry_base_funcs):
+    """Key names such as 'application/json' are legal; '/' must not become a separator."""
+    tree = {
+        r"MIME\Database\Content Type": ["application/json"],
+        r"MIME\Database\Content Type\application/json": [],
+    }
+
+    def fake_walk(root_key, key_path, root_prefix, access_32bit_view):
+        return RegistryKeyWalk(tree[key_path], [], len(tree[key_path]), 0, None)
+
+    patched_registry_base_funcs['walk_registry_key'].side_effect = fake_walk
+    instance = RegistryRoot(winreg.HKEY_CLASSES_ROOT, root_prefix=r"MIME\Database")
+
+    result = list(instance.walk("Content Type"))
+
+    assert [path for path, _subkeys, _values in result] == [
+        "Content Type",
+        r"Content Type\application/json",
+    ]
+
+def test_walk_propagates_read_errors(patched_registry_base_funcs):
+    patched_registry_base_funcs['walk_registry_key'].side_effect = RegistryKeyNotFoundError("missing")
+    instance = RegistryRoot(winreg.HKEY_CURRENT_USER)
+
+    with pytest.raises(RegistryKeyNotFoundError):
+        list(instance.walk(r"Missing"))
+
+def test_walk_registry_key_delegates_correctly(patched_registry_base_funcs):
+    root = winreg.HKEY_CURRENT_USER
+    prefix = r"Software\MyApp"
+    key_path = r"Settings"
+    view_32bit = True
+
+    instance = RegistryRoot(root, root_prefix=prefix, access_32bit_view=view_32bit)
+
+    instance.walk_registry_key(key_path)
+
+    patched_registry_base_funcs['walk_registry_key'].assert_called_once_with(
+        root_key=root,
+        key_path=key_path,
+        root_prefix=prefix,
+        access_32bit_view=view_32bit
+    )
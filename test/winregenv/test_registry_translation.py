@@ -40,6 +40,10 @@ def test_get_reg_type_name(reg_type, expected_name):
     ("REG_MULTI_SZ", rt.REG_MULTI_SZ),
     ("REG_QWORD", rt.REG_QWORD),
     ("REG_NONE", rt.REG_NONE),
+    ("Reg_Multi_Sz", rt.REG_MULTI_SZ), # Mixed-case string
+    ("REG_DWORD_LITTLE_ENDIAN", rt.REG_DWORD), # Alias normalized to base type
+    ("reg_qword_little_endian", rt.REG_QWORD),
+    (rt.REG_DWORD_LITTLE_ENDIAN, rt.REG_DWORD),
 ])
 def test_normalize_registry_type_input_valid(type_input, expected_output):
     """Tests valid integer and string inputs for normalization."""
@@ -59,6 +63,9 @@ def test_normalize_registry_type_input_invalid(invalid_input, expected_exception
 
 # --- Tests for _infer_registry_type_for_new_value ---
 
+class _StrSubclass(str):
+    """A str subclass, to check list-of-strings detection still accepts subclasses."""
+
 @pytest.mark.parametrize("data, expected_data, expected_type", [
     ("test string", "test string", rt.REG_SZ),
     (12345, 12345, rt.REG_DWORD),
@@ -68,6 +75,9 @@ def test_normalize_registry_type_input_invalid(invalid_input, expected_exception
     (b'\x01\x02\x03', b'\x01\x02\x03', rt.REG_BINARY),
     (["a", "b", "c"], ["a", "b", "c"], rt.REG_MULTI_SZ),
     ([], [], rt.REG_MULTI_SZ), # Empty list is valid MULTI_SZ
+    (["a", _StrSubclass("b")], ["a", "b"], rt.REG_MULTI_SZ), # str subclasses are strings too
+    (_StrSubclass("sub"), "sub", rt.REG_SZ), # Subclasses fall back to isinstance dispatch
+    (True, True, rt.REG_DWORD), # bool is an int subclass
 ])
 def test_infer_registry_type_success(data, expected_data, expected_type):
     """Tests successful inference of registry types from Python data."""
@@ -134,6 +144,7 @@ def test_validate_and_convert_data_success(data, target_type, expected_output):
     ("abc", rt.REG_DWORD, TypeError, "Data must be an integer for registry type REG_DWORD"),
     (123, rt.REG_BINARY, TypeError, "Data must be bytes for registry type REG_BINARY"),
     (b"abc", rt.REG_MULTI_SZ, TypeError, "Data must be a list of strings for registry type REG_MULTI_SZ"),
+    (["a", 1], rt.REG_MULTI_SZ, TypeError, "Data must be a list of strings for registry type REG_MULTI_SZ"),
     ([1, 2], rt.REG_MULTI_SZ, TypeError, "Data must be a list of strings for registry type REG_MULTI_SZ"),
     ("abc", rt.REG_RESOURCE_LIST, TypeError, "Data must be bytes for registry type REG_RESOURCE_LIST"),
     # Value range errors
@@ -7,7 +7,8 @@ from winregenv.registry_errors import RegistryExpansionError # Import the specif
 
 # Assuming registry_types is in src.winregenv
 # Corrected imports: removed 'src.' prefix
-from winregenv.registry_types import RegistryValue
+from winregenv.registry_types import RegistryValue, RegistryKeyInfo
+from datetime import datetime, timezone
 from winregenv.registry_translation import REG_EXPAND_SZ, REG_SZ, REG_DWORD, REG_BINARY, REG_MULTI_SZ
 
 # --- Test Data ---
@@ -81,6 +82,13 @@ def test_expanded_data_success(mock_expand, reg_value_expand_sz):
     assert reg_value_expand_sz.expanded_data == EXPANDED_DATA
     mock_expand.assert_called_once_with(TEST_DATA_EXPAND_SZ)
 
+@patch('winregenv.registry_types.expand_environment_strings')
+def test_expanded_data_without_variables_skips_expansion(mock_expand):
+    """Test expanded_data returns REG_EXPAND_SZ data with no '%' as is, without calling the API."""
+    value = RegistryValue("ConstantPath", r"C:\Program Files\App", REG_EXPAND_SZ)
+    assert value.expanded_data == r"C:\Program Files\App"
+    mock_expand.assert_not_called()
+
 # Corrected patch target: removed 'src.' prefix
 @patch('winregenv.registry_types.expand_environment_strings')
 def test_expanded_data_non_expand_sz(mock_expand, reg_value_sz):
@@ -289,3 +297,41 @@ def test_hashing_multi_sz_data(reg_value_multi_sz):
     assert hash(reg_value_multi_sz) == hash(val_multi_sz_copy)
     assert val_multi_sz_copy in value_set # Should be considered the same in the set
     assert value_dict[val_multi_sz_copy] == "multi_sz_value" # Should be considered the same key
+
+
+
+def test_registry_value_has_no_instance_dict(reg_value_sz):
+    """RegistryValue uses __slots__, so instances don't carry a __dict__."""
+    assert not hasattr(reg_value_sz, "__dict__")
+    with pytest.raises(AttributeError):
+        reg_value_sz.extra = "not allowed"
+
+# --- RegistryKeyInfo Tests ---
+
+def test_registry_key_info_access():
+    """Fields are reachable by attribute, position, unpacking and (for dict compatibility) by name."""
+    last_write = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    info = RegistryKeyInfo(2, 3, last_write)
+
+    assert info.num_subkeys == 2
+    assert info.num_values == 3
+    assert info.last_write_time is last_write
+    assert info[0] == 2
+    assert info["num_values"] == 3
+    num_subkeys, num_values, last_write_time = info
+    assert (num_subkeys, num_values, last_write_time) == (2, 3, last_write)
+
+    with pytest.raises(KeyError):
+        info["missing"]
+
+
+def test_registry_key_info_equality():
+    """RegistryKeyInfo compares equal to tuples and to a dict with the same fields."""
+    last_write = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    info = RegistryKeyInfo(2, 3, last_write)
+
+    assert info == (2, 3, last_write)
+    assert info == {"num_subkeys": 2, "num_values": 3, "last_write_time": last_write}
+    assert {"num_subkeys": 2, "num_values": 3, "last_write_time": last_write} == info
+    assert info != {"num_subkeys": 0, "num_values": 3, "last_write_time": last_write}
+    assert hash(info) == hash((2, 3, last_write))
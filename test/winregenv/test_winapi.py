@@ -3,6 +3,8 @@
 Unit tests for winregenv.winapi.broadcast_setting_change.
 """
 import sys
+import asyncio
+import logging
 import pytest
 from unittest.mock import MagicMock, ANY
 
@@ -15,13 +17,21 @@ def patch_ctypes_and_user32(monkeypatch):
     # Create a fake user32 DLL object
     fake_user32 = MagicMock()
     monkeypatch.setattr(winapi, "user32", fake_user32)
-    # Patch ctypes functions used in winapi
-    monkeypatch.setattr(winapi.ctypes, "get_last_error", lambda: 0)
-    monkeypatch.setattr(winapi.ctypes, "set_last_error", lambda code: None)
-    monkeypatch.setattr(winapi.ctypes, "create_unicode_buffer", lambda s: f"BUF<{s}>")
-    monkeypatch.setattr(winapi.ctypes, "byref", lambda x: x)
+    # winapi binds the function pointer and ctypes helpers at import time, so patch its aliases
+    monkeypatch.setattr(winapi, "_SendMessageTimeoutW", fake_user32.SendMessageTimeoutW)
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: 0)
+    monkeypatch.setattr(winapi, "_create_unicode_buffer", lambda s: f"BUF<{s}>")
+    monkeypatch.setattr(winapi, "_byref", lambda x: x)
+    # Start with no prebuilt lParam buffers so every name goes through _create_unicode_buffer
+    monkeypatch.setattr(winapi, "_LPARAM_CACHE", {})
     return fake_user32
 
+def test_prebuilt_arguments_match_constants():
+    assert winapi._HWND_BROADCAST_ARG.value == winapi.HWND_BROADCAST
+    assert winapi._WM_SETTINGCHANGE_ARG.value == winapi.WM_SETTINGCHANGE
+    assert winapi._WPARAM_ZERO_ARG.value == 0
+    assert winapi._SMTO_FLAGS_ARG.value == winapi.SMTO_ABORTIFHUNG
+
 def test_success_default_timeout(patch_ctypes_and_user32):
     user32 = patch_ctypes_and_user32
     user32.SendMessageTimeoutW.return_value = 1
@@ -29,11 +39,11 @@ def test_success_default_timeout(patch_ctypes_and_user32):
     winapi.broadcast_setting_change("Env")
     default_timeout = winapi.broadcast_setting_change.__defaults__[1]
     user32.SendMessageTimeoutW.assert_called_once_with(
-        winapi.HWND_BROADCAST,
-        winapi.WM_SETTINGCHANGE,
-        0,
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
         "BUF<Env>",
-        winapi.SMTO_ABORTIFHUNG,
+        winapi._SMTO_FLAGS_ARG,
         default_timeout,
         ANY
     )
@@ -44,25 +54,40 @@ def test_success_custom_timeout(patch_ctypes_and_user32, timeout_ms):
     user32.SendMessageTimeoutW.return_value = 1
     winapi.broadcast_setting_change("Test", timeout_ms=timeout_ms)
     user32.SendMessageTimeoutW.assert_called_once_with(
-        winapi.HWND_BROADCAST,
-        winapi.WM_SETTINGCHANGE,
-        0,
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
         "BUF<Test>",
-        winapi.SMTO_ABORTIFHUNG,
+        winapi._SMTO_FLAGS_ARG,
         timeout_ms,
         ANY
     )
 
+def test_lparam_uses_prebuilt_buffer(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    monkeypatch.setattr(winapi, "_LPARAM_CACHE", {"Environment": "CACHED<Environment>"})
+    winapi.broadcast_setting_change("Environment", timeout_ms=1234)
+    user32.SendMessageTimeoutW.assert_called_once_with(
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
+        "CACHED<Environment>",
+        winapi._SMTO_FLAGS_ARG,
+        1234,
+        ANY
+    )
+
 def test_lparam_none(patch_ctypes_and_user32):
     user32 = patch_ctypes_and_user32
     user32.SendMessageTimeoutW.return_value = 1
     winapi.broadcast_setting_change(None, timeout_ms=1234)
     user32.SendMessageTimeoutW.assert_called_once_with(
-        winapi.HWND_BROADCAST,
-        winapi.WM_SETTINGCHANGE,
-        0,
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
         None,
-        winapi.SMTO_ABORTIFHUNG,
+        winapi._SMTO_FLAGS_ARG,
         1234,
         ANY
     )
@@ -75,6 +100,107 @@ def test_lparam_none(patch_ctypes_and_user32):
 def test_error_paths(patch_ctypes_and_user32, monkeypatch, errcode, exc):
     user32 = patch_ctypes_and_user32
     user32.SendMessageTimeoutW.return_value = 0
-    monkeypatch.setattr(winapi.ctypes, "get_last_error", lambda: errcode)
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: errcode)
     with pytest.raises(exc):
         winapi.broadcast_setting_change("Name", timeout_ms=777)
+
+def test_no_wait_uses_short_timeout(patch_ctypes_and_user32):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    winapi.broadcast_setting_change("Env", timeout_ms=5000, wait=False)
+    user32.SendMessageTimeoutW.assert_called_once_with(
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
+        "BUF<Env>",
+        winapi._SMTO_FLAGS_ARG,
+        winapi._NO_WAIT_TIMEOUT_MS,
+        ANY
+    )
+
+def test_no_wait_ignores_timeout(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 0
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: winapi.ERROR_TIMEOUT)
+    winapi.broadcast_setting_change("Name", wait=False)
+    user32.SendMessageTimeoutW.assert_called_once()
+
+def test_no_wait_error(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 0
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: 5)
+    with pytest.raises(OSError):
+        winapi.broadcast_setting_change("Name", wait=False)
+
+def test_batch_broadcasts_each_name_once(patch_ctypes_and_user32):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    winapi.broadcast_setting_changes(["Environment", "intl", "Environment"], timeout_ms=100)
+    assert user32.SendMessageTimeoutW.call_count == 2
+    lparams = sorted(c.args[3] for c in user32.SendMessageTimeoutW.call_args_list)
+    assert lparams == ["BUF<Environment>", "BUF<intl>"]
+
+def test_batch_single_failure_keeps_its_type(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.side_effect = lambda *args: 0 if args[3] == "BUF<intl>" else 1
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: winapi.ERROR_TIMEOUT)
+    with pytest.raises(winapi.MessageTimeoutError):
+        winapi.broadcast_setting_changes(["Environment", "intl"])
+
+def test_batch_multiple_failures(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 0
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: winapi.ERROR_TIMEOUT)
+    with pytest.raises(winapi.RegistryError, match="'Environment', 'intl'") as excinfo:
+        winapi.broadcast_setting_changes(["Environment", "intl"])
+    assert isinstance(excinfo.value.__cause__, winapi.MessageTimeoutError)
+
+def test_async_broadcast(patch_ctypes_and_user32):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    asyncio.run(winapi.broadcast_setting_change_async("Env", timeout_ms=250))
+    user32.SendMessageTimeoutW.assert_called_once_with(
+        winapi._HWND_BROADCAST_ARG,
+        winapi._WM_SETTINGCHANGE_ARG,
+        winapi._WPARAM_ZERO_ARG,
+        "BUF<Env>",
+        winapi._SMTO_FLAGS_ARG,
+        250,
+        ANY
+    )
+
+def test_async_broadcast_error(patch_ctypes_and_user32, monkeypatch):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 0
+    monkeypatch.setattr(winapi, "_get_last_error", lambda: winapi.ERROR_TIMEOUT)
+    with pytest.raises(winapi.MessageTimeoutError):
+        asyncio.run(winapi.broadcast_setting_change_async("Name"))
+
+def test_result_buffer_only_when_info_logged(patch_ctypes_and_user32, caplog):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    with caplog.at_level(logging.WARNING, logger=winapi.logger.name):
+        winapi.broadcast_setting_change("Env")
+    assert user32.SendMessageTimeoutW.call_args.args[6] is None
+
+    user32.SendMessageTimeoutW.reset_mock()
+    with caplog.at_level(logging.INFO, logger=winapi.logger.name):
+        winapi.broadcast_setting_change("Env")
+    assert user32.SendMessageTimeoutW.call_args.args[6] is not None
+    assert "Successfully broadcast WM_SETTINGCHANGE for 'Env'" in caplog.text
+
+def test_broadcast_after_runs_action_then_broadcasts_once(patch_ctypes_and_user32):
+    user32 = patch_ctypes_and_user32
+    user32.SendMessageTimeoutW.return_value = 1
+    action = MagicMock(return_value="written")
+    assert winapi.broadcast_after(action, timeout_ms=100) == "written"
+    action.assert_called_once_with()
+    user32.SendMessageTimeoutW.assert_called_once()
+    assert user32.SendMessageTimeoutW.call_args.args[3] == "BUF<Environment>"
+
+def test_broadcast_after_skips_broadcast_when_action_fails(patch_ctypes_and_user32):
+    user32 = patch_ctypes_and_user32
+    action = MagicMock(side_effect=winapi.RegistryError("write failed"))
+    with pytest.raises(winapi.RegistryError, match="write failed"):
+        winapi.broadcast_after(action)
+    user32.SendMessageTimeoutW.assert_not_called()